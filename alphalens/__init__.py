@@ -1,5 +1,6 @@
 from . import performance
 from . import plotting
+from . import profiling
 from . import tears
 from . import utils
 
@@ -9,4 +10,4 @@ from ._version import get_versions
 __version__ = get_versions()['version']
 del get_versions
 
-__all__ = ['performance', 'plotting', 'tears', 'utils']
+__all__ = ['performance', 'plotting', 'profiling', 'tears', 'utils']
@@ -27,6 +27,10 @@ class MarketRegimeAgent(BaseAgent):
 
         market_data = context.get("market_data")
 
+        # Live bars (BarAggregator) stand in for a polled price window
+        if market_data is None and context.get("live_bars") is not None:
+            market_data = context["live_bars"].panel("close")
+
         if market_data is None:
             return {"regime": "unknown", "confidence": 0.0}
 
@@ -52,7 +56,14 @@ class MarketRegimeAgent(BaseAgent):
         # Simple volatility-based regime detection (placeholder)
         # In production, this would use HMM, Claude analysis, etc.
 
-        returns = market_data.pct_change().dropna()
+        # Bars without trades are NaN rows: drop them instead of padding
+        # them into zero returns that would understate volatility
+        returns = market_data.dropna(how="all").pct_change(fill_method=None)
+
+        # Equal-weighted market return of a dates x assets panel
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.mean(axis=1)
+        returns = returns.dropna()
         volatility = returns.std()
         mean_return = returns.mean()
 
@@ -11,6 +11,8 @@ Supports:
 from alphalens.assets.base import BaseAsset, AssetType
 from alphalens.assets.equity import EquityAsset
 from alphalens.assets.option import OptionAsset, OptionType, OptionStyle
+from alphalens.assets.option_chain import OptionChain
+from alphalens.assets.vol_surface import VolatilitySurface
 from alphalens.assets.crypto import CryptoAsset
 from alphalens.assets.future import FutureAsset
 
@@ -21,6 +23,8 @@ __all__ = [
     "OptionAsset",
     "OptionType",
     "OptionStyle",
+    "OptionChain",
+    "VolatilitySurface",
     "CryptoAsset",
     "FutureAsset",
 ]
@@ -6,11 +6,14 @@ from typing import Dict, Any, Optional
 from enum import Enum
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-import numpy as np
-from scipy.stats import norm
 from loguru import logger
 
 from alphalens.assets.base import BaseAsset, AssetType
+from alphalens.assets.option_pricing import (
+    black_scholes_greeks,
+    black_scholes_price,
+    implied_volatility,
+)
 
 
 class OptionType(Enum):
@@ -82,13 +85,7 @@ class OptionAsset(BaseAsset):
             "contract_size": contract_size
         })
 
-        super().__init__(
-            symbol=symbol,
-            asset_type=AssetType.OPTION,
-            exchange=exchange,
-            metadata=metadata
-        )
-
+        # set before the base initializer, which logs get_identifier()
         self.underlying_symbol = underlying_symbol
         self.strike = strike
         self.expiry = expiry
@@ -96,6 +93,13 @@ class OptionAsset(BaseAsset):
         self.style = style
         self.contract_size = contract_size
 
+        super().__init__(
+            symbol=symbol,
+            asset_type=AssetType.OPTION,
+            exchange=exchange,
+            metadata=metadata
+        )
+
         self._greeks: Optional[Greeks] = None
         self._implied_volatility: Optional[float] = None
 
@@ -194,27 +198,16 @@ class OptionAsset(BaseAsset):
         Returns:
             Option theoretical price
         """
-        S = underlying_price
-        K = self.strike
-        T = self.time_to_expiry()
-        r = risk_free_rate
-        q = dividend_yield
-        sigma = volatility
-
-        if T <= 0:
-            # Expired option
-            return self.intrinsic_value(S)
-
-        # Calculate d1 and d2
-        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-
-        if self.option_type == OptionType.CALL:
-            price = S * np.exp(-q * T) * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-        else:  # PUT
-            price = K * np.exp(-r * T) * norm.cdf(-d2) - S * np.exp(-q * T) * norm.cdf(-d1)
-
-        return price
+        price = black_scholes_price(
+            underlying_price,
+            self.strike,
+            self.time_to_expiry(),
+            volatility,
+            self.option_type == OptionType.CALL,
+            risk_free_rate,
+            dividend_yield
+        )
+        return float(price)
 
     def calculate_greeks(
         self,
@@ -235,59 +228,22 @@ class OptionAsset(BaseAsset):
         Returns:
             Greeks object
         """
-        S = underlying_price
-        K = self.strike
-        T = self.time_to_expiry()
-        r = risk_free_rate
-        q = dividend_yield
-        sigma = volatility
-
-        if T <= 0:
-            # Expired option - all Greeks are zero
-            return Greeks(delta=0, gamma=0, theta=0, vega=0, rho=0)
-
-        # Calculate d1 and d2
-        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-
-        # Delta
-        if self.option_type == OptionType.CALL:
-            delta = np.exp(-q * T) * norm.cdf(d1)
-        else:  # PUT
-            delta = -np.exp(-q * T) * norm.cdf(-d1)
-
-        # Gamma (same for calls and puts)
-        gamma = (np.exp(-q * T) * norm.pdf(d1)) / (S * sigma * np.sqrt(T))
-
-        # Vega (same for calls and puts, per 1% change in IV)
-        vega = S * np.exp(-q * T) * norm.pdf(d1) * np.sqrt(T) / 100
-
-        # Theta (per day)
-        if self.option_type == OptionType.CALL:
-            theta = (
-                -S * norm.pdf(d1) * sigma * np.exp(-q * T) / (2 * np.sqrt(T))
-                - r * K * np.exp(-r * T) * norm.cdf(d2)
-                + q * S * np.exp(-q * T) * norm.cdf(d1)
-            ) / 365
-        else:  # PUT
-            theta = (
-                -S * norm.pdf(d1) * sigma * np.exp(-q * T) / (2 * np.sqrt(T))
-                + r * K * np.exp(-r * T) * norm.cdf(-d2)
-                - q * S * np.exp(-q * T) * norm.cdf(-d1)
-            ) / 365
-
-        # Rho (per 1% change in interest rate)
-        if self.option_type == OptionType.CALL:
-            rho = K * T * np.exp(-r * T) * norm.cdf(d2) / 100
-        else:  # PUT
-            rho = -K * T * np.exp(-r * T) * norm.cdf(-d2) / 100
+        values = black_scholes_greeks(
+            underlying_price,
+            self.strike,
+            self.time_to_expiry(),
+            volatility,
+            self.option_type == OptionType.CALL,
+            risk_free_rate,
+            dividend_yield
+        )
 
         greeks = Greeks(
-            delta=delta,
-            gamma=gamma,
-            theta=theta,
-            vega=vega,
-            rho=rho
+            delta=float(values["delta"]),
+            gamma=float(values["gamma"]),
+            theta=float(values["theta"]),
+            vega=float(values["vega"]),
+            rho=float(values["rho"])
         )
 
         self._greeks = greeks
@@ -303,7 +259,7 @@ class OptionAsset(BaseAsset):
         tolerance: float = 1e-5
     ) -> Optional[float]:
         """
-        Calculate implied volatility using Newton-Raphson method.
+        Calculate implied volatility (see option_pricing.implied_volatility).
 
         Args:
             option_price: Observed option price
@@ -316,38 +272,24 @@ class OptionAsset(BaseAsset):
         Returns:
             Implied volatility or None if not found
         """
-        # Initial guess
-        sigma = 0.3
-
-        for i in range(max_iterations):
-            # Calculate price and vega at current sigma
-            price = self.black_scholes_price(
-                underlying_price, sigma, risk_free_rate, dividend_yield
-            )
-
-            greeks = self.calculate_greeks(
-                underlying_price, sigma, risk_free_rate, dividend_yield
-            )
-
-            # Calculate difference
-            diff = price - option_price
-
-            # Check convergence
-            if abs(diff) < tolerance:
-                self._implied_volatility = sigma
-                return sigma
-
-            # Newton-Raphson update
-            if greeks.vega > 0:
-                sigma = sigma - diff / (greeks.vega * 100)  # vega is per 1% change
-
-                # Keep sigma positive and reasonable
-                sigma = max(0.01, min(sigma, 5.0))
-            else:
-                break
-
-        logger.warning(f"Implied volatility did not converge for {self.symbol}")
-        return None
+        sigma, converged = implied_volatility(
+            option_price,
+            underlying_price,
+            self.strike,
+            self.time_to_expiry(),
+            self.option_type == OptionType.CALL,
+            risk_free_rate,
+            dividend_yield,
+            max_iterations=max_iterations,
+            tolerance=tolerance
+        )
+
+        if not converged:
+            logger.warning(f"Implied volatility did not converge for {self.symbol}")
+            return None
+
+        self._implied_volatility = float(sigma)
+        return self._implied_volatility
 
     def get_greeks(self) -> Optional[Greeks]:
         """Get cached Greeks."""
@@ -0,0 +1,403 @@
+"""
+Columnar options chain.
+
+Holds a whole chain as arrays (strikes, expiries, types, quotes, IVs), one
+entry per contract, loaded straight from the chain frames returned by
+get_options_chain / get_options_snapshot. Chain-wide work (filtering,
+pricing, Greeks) runs on the arrays; OptionAsset objects are only created
+for the contracts actually asked for.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from alphalens.assets.option import OptionAsset, OptionType, OptionStyle
+from alphalens.assets.option_pricing import (
+    black_scholes_greeks,
+    black_scholes_price,
+    implied_volatility,
+)
+
+# Quote and analytics columns kept as float arrays (NaN where missing)
+QUOTE_COLUMNS = ("bid", "ask", "last", "volume", "open_interest", "implied_volatility")
+
+
+class OptionChain:
+    """
+    Options chain stored as arrays.
+
+    Usage:
+        chain = OptionChain.from_frame(data_manager.get_options_chain("SPX"))
+        calls = chain.filter(option_type="call", min_strike=4000)
+        asset = calls.contract(0)  # OptionAsset, created on demand
+    """
+
+    def __init__(
+        self,
+        underlying: str,
+        symbols: Sequence[str],
+        strikes: Sequence[float],
+        expiries: Sequence[Any],
+        option_types: Sequence[str],
+        underlying_price: float = np.nan,
+        contract_sizes: Optional[Sequence[float]] = None,
+        **quotes: Optional[Sequence[float]]
+    ):
+        """
+        Initialize chain.
+
+        Args:
+            underlying: Underlying symbol
+            symbols: Contract symbols
+            strikes: Strike prices
+            expiries: Expiration dates
+            option_types: 'call' or 'put' per contract
+            underlying_price: Underlying price (NaN if unknown)
+            contract_sizes: Shares per contract (100 if None)
+            **quotes: Optional arrays named as QUOTE_COLUMNS
+        """
+        unknown = set(quotes) - set(QUOTE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown chain columns {sorted(unknown)}, expected {QUOTE_COLUMNS}")
+
+        self.underlying = underlying
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.strikes = np.asarray(strikes, dtype=np.float64)
+        self.expiries = pd.DatetimeIndex(expiries).tz_localize(None).values
+        self.is_call = np.char.lower(np.asarray(option_types, dtype=str)) == "call"
+        self.underlying_price = float(underlying_price)
+
+        n = len(self.symbols)
+        self.contract_sizes = (np.full(n, 100.0) if contract_sizes is None
+                               else np.asarray(contract_sizes, dtype=np.float64))
+
+        for column in QUOTE_COLUMNS:
+            values = quotes.get(column)
+            setattr(self, column, np.full(n, np.nan) if values is None
+                    else np.asarray(values, dtype=np.float64))
+
+        self._rows: Optional[Dict[str, int]] = None
+        self._contracts: Dict[int, OptionAsset] = {}
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, underlying: Optional[str] = None) -> "OptionChain":
+        """
+        Load a chain frame (get_options_chain / get_options_snapshot output).
+
+        Args:
+            frame: Frame with ticker, underlying, strike, expiry, type and
+                optionally shares_per_contract, quote and IV columns
+            underlying: Underlying symbol (default: from the frame)
+
+        Returns:
+            OptionChain
+        """
+        if frame.empty:
+            return cls(underlying or "", [], [], [], [])
+
+        if underlying is None:
+            underlying = str(frame["underlying"].iloc[0]) if "underlying" in frame else ""
+
+        underlying_price = np.nan
+        if "underlying_price" in frame:
+            prices = frame["underlying_price"].to_numpy(dtype=np.float64)
+            known = prices[~np.isnan(prices)]
+            if len(known):
+                underlying_price = known[0]
+
+        return cls(
+            underlying,
+            frame["ticker"].to_numpy(),
+            frame["strike"].to_numpy(dtype=np.float64),
+            frame["expiry"],
+            frame["type"].to_numpy(),
+            underlying_price=underlying_price,
+            contract_sizes=frame["shares_per_contract"].to_numpy(dtype=np.float64)
+            if "shares_per_contract" in frame else None,
+            **{column: frame[column].to_numpy(dtype=np.float64)
+               for column in QUOTE_COLUMNS if column in frame}
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return (f"OptionChain({self.underlying}, {len(self)} contracts, "
+                f"{len(self.expirations())} expirations)")
+
+    # Columns
+
+    @property
+    def option_types(self) -> np.ndarray:
+        """'call' or 'put' per contract."""
+        return np.where(self.is_call, "call", "put")
+
+    @property
+    def mid(self) -> np.ndarray:
+        """Bid/ask midpoint, the last trade where not quoted on both sides."""
+        quoted = (self.bid > 0) & (self.ask > 0)
+        return np.where(quoted, (self.bid + self.ask) / 2, self.last)
+
+    def time_to_expiry(self, now: Optional[datetime] = None) -> np.ndarray:
+        """
+        Time to expiry of every contract in years (0 once expired).
+
+        Args:
+            now: Valuation time (default: now, as OptionAsset.time_to_expiry)
+
+        Returns:
+            Array of year fractions
+        """
+        now = np.datetime64(now or datetime.now(), "ns")
+        seconds = (self.expiries - now) / np.timedelta64(1, "s")
+        return np.maximum(seconds, 0.0) / (365.0 * 24 * 3600)
+
+    def expirations(self) -> pd.DatetimeIndex:
+        """Sorted distinct expiration dates."""
+        return pd.DatetimeIndex(np.unique(self.expiries))
+
+    # Pricing
+
+    def _pricing_inputs(self, underlying_price, volatility, now):
+        spot = self.underlying_price if underlying_price is None else underlying_price
+        if np.isnan(spot):
+            raise ValueError("Underlying price unknown: pass underlying_price")
+        vol = self.implied_volatility if volatility is None else volatility
+        return spot, self.strikes, self.time_to_expiry(now), vol, self.is_call
+
+    def price(
+        self,
+        underlying_price: Optional[float] = None,
+        volatility: Optional[Union[float, np.ndarray]] = None,
+        risk_free_rate: float = 0.02,
+        dividend_yield: float = 0.0,
+        now: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Black-Scholes prices of every contract.
+
+        Args:
+            underlying_price: Underlying price (default: the chain's)
+            volatility: Volatility or per-contract array (default: the
+                chain's implied volatilities)
+            risk_free_rate: Risk-free rate
+            dividend_yield: Dividend yield
+            now: Valuation time (default: now)
+
+        Returns:
+            Array of prices
+        """
+        return black_scholes_price(*self._pricing_inputs(underlying_price, volatility, now),
+                                   risk_free_rate, dividend_yield)
+
+    def greeks(
+        self,
+        underlying_price: Optional[float] = None,
+        volatility: Optional[Union[float, np.ndarray]] = None,
+        risk_free_rate: float = 0.02,
+        dividend_yield: float = 0.0,
+        now: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Black-Scholes prices and Greeks of every contract in one pass.
+
+        Args:
+            underlying_price: Underlying price (default: the chain's)
+            volatility: Volatility or per-contract array (default: the
+                chain's implied volatilities)
+            risk_free_rate: Risk-free rate
+            dividend_yield: Dividend yield
+            now: Valuation time (default: now)
+
+        Returns:
+            Dictionary of arrays: price, delta, gamma, theta, vega, rho
+            (OptionAsset.calculate_greeks units)
+        """
+        return black_scholes_greeks(*self._pricing_inputs(underlying_price, volatility, now),
+                                    risk_free_rate, dividend_yield)
+
+    def solve_implied_volatility(
+        self,
+        prices: Optional[np.ndarray] = None,
+        underlying_price: Optional[float] = None,
+        risk_free_rate: float = 0.02,
+        dividend_yield: float = 0.0,
+        now: Optional[datetime] = None,
+        update: bool = False,
+        **kwargs: Any
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Implied volatilities of every contract, solved together.
+
+        Args:
+            prices: Option prices (default: mid)
+            underlying_price: Underlying price (default: the chain's)
+            risk_free_rate: Risk-free rate
+            dividend_yield: Dividend yield
+            now: Valuation time (default: now)
+            update: Store the converged values in implied_volatility
+            **kwargs: Solver options (max_iterations, tolerance,
+                max_volatility)
+
+        Returns:
+            volatility: Array of implied volatilities (NaN where unsolvable)
+            converged: Boolean array of per-contract convergence flags
+        """
+        spot, strikes, expiry, _, is_call = self._pricing_inputs(underlying_price, 0.0, now)
+        volatility, converged = implied_volatility(
+            self.mid if prices is None else prices, spot, strikes, expiry, is_call,
+            risk_free_rate, dividend_yield, **kwargs
+        )
+        if update:
+            self.implied_volatility = np.where(converged, volatility, np.nan)
+        return volatility, converged
+
+    # Selection
+
+    def take(self, rows: Union[np.ndarray, Sequence[int]]) -> "OptionChain":
+        """
+        Subset of the chain.
+
+        Args:
+            rows: Boolean mask or row positions
+
+        Returns:
+            OptionChain of the selected contracts
+        """
+        rows = np.asarray(rows)
+        if rows.dtype != bool:
+            rows = rows.astype(np.intp)
+        return OptionChain(
+            self.underlying,
+            self.symbols[rows],
+            self.strikes[rows],
+            self.expiries[rows],
+            self.option_types[rows],
+            underlying_price=self.underlying_price,
+            contract_sizes=self.contract_sizes[rows],
+            **{column: getattr(self, column)[rows] for column in QUOTE_COLUMNS}
+        )
+
+    def filter(
+        self,
+        expiry: Optional[Any] = None,
+        option_type: Optional[str] = None,
+        min_strike: Optional[float] = None,
+        max_strike: Optional[float] = None
+    ) -> "OptionChain":
+        """
+        Contracts matching all given conditions.
+
+        Args:
+            expiry: Expiration date
+            option_type: 'call' or 'put'
+            min_strike: Lowest strike (inclusive)
+            max_strike: Highest strike (inclusive)
+
+        Returns:
+            Filtered OptionChain
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if expiry is not None:
+            mask &= self.expiries == np.datetime64(pd.Timestamp(expiry).tz_localize(None), "ns")
+        if option_type is not None:
+            mask &= self.is_call == (option_type.lower() == "call")
+        if min_strike is not None:
+            mask &= self.strikes >= min_strike
+        if max_strike is not None:
+            mask &= self.strikes <= max_strike
+        return self.take(mask)
+
+    def row(self, symbol: str) -> int:
+        """
+        Position of a contract.
+
+        Args:
+            symbol: Contract symbol
+
+        Returns:
+            Row position
+
+        Raises:
+            KeyError: If the contract is not in the chain
+        """
+        if self._rows is None:
+            self._rows = {symbol: i for i, symbol in enumerate(self.symbols)}
+        return self._rows[symbol]
+
+    # Contract objects
+
+    def contract(self, key: Union[int, str]) -> OptionAsset:
+        """
+        OptionAsset of one contract, created on first access.
+
+        Args:
+            key: Row position or contract symbol
+
+        Returns:
+            OptionAsset with its mid price as current price and the quote
+            and IV in its metadata
+        """
+        i = self.row(key) if isinstance(key, str) else int(key)
+        if i < 0:
+            i += len(self)
+
+        asset = self._contracts.get(i)
+        if asset is None:
+            metadata = {column: float(getattr(self, column)[i]) for column in QUOTE_COLUMNS
+                        if not np.isnan(getattr(self, column)[i])}
+            asset = OptionAsset(
+                symbol=self.symbols[i],
+                underlying_symbol=self.underlying,
+                strike=float(self.strikes[i]),
+                expiry=pd.Timestamp(self.expiries[i]).to_pydatetime(),
+                option_type=OptionType.CALL if self.is_call[i] else OptionType.PUT,
+                style=OptionStyle.AMERICAN,
+                contract_size=int(self.contract_sizes[i]),
+                metadata=metadata
+            )
+            bid, ask = self.bid[i], self.ask[i]
+            mid = (bid + ask) / 2 if bid > 0 and ask > 0 else self.last[i]
+            if not np.isnan(mid):
+                asset.set_current_price(float(mid))
+            self._contracts[i] = asset
+
+        return asset
+
+    def contracts(self, rows: Optional[Union[np.ndarray, Sequence[int]]] = None) -> List[OptionAsset]:
+        """
+        OptionAssets of several contracts.
+
+        Args:
+            rows: Boolean mask or row positions (None = all)
+
+        Returns:
+            List of OptionAsset
+        """
+        positions = np.arange(len(self)) if rows is None else np.asarray(rows)
+        if positions.dtype == bool:
+            positions = np.flatnonzero(positions)
+        return [self.contract(int(i)) for i in positions]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Chain as a DataFrame (one row per contract).
+
+        Returns:
+            DataFrame with ticker, underlying, strike, expiry, type,
+            shares_per_contract and the quote columns
+        """
+        frame = pd.DataFrame({
+            "ticker": self.symbols,
+            "underlying": self.underlying,
+            "strike": self.strikes,
+            "expiry": self.expiries,
+            "type": self.option_types,
+            "shares_per_contract": self.contract_sizes,
+        })
+        for column in QUOTE_COLUMNS:
+            frame[column] = getattr(self, column)
+        return frame
@@ -0,0 +1,261 @@
+"""
+Vectorized Black-Scholes pricing and Greeks.
+
+Prices and Greeks of many contracts in one NumPy pass: every input may be
+a scalar or an array (broadcast together), so a whole chain is priced at
+once. d1/d2, the discount factors and the normal CDF/PDF terms are
+computed once and shared by the price and all Greeks.
+
+Units follow OptionAsset: theta per day, vega and rho per 1% change.
+Expired contracts (T <= 0) are worth their intrinsic value and have zero
+Greeks.
+
+implied_volatility inverts the price for all contracts at once: Newton
+steps from a closed-form initial guess, kept inside a per-contract
+bracket and replaced by bisection wherever Newton would leave it.
+"""
+
+from typing import Dict, Tuple, Union
+
+import numpy as np
+from scipy.special import ndtr
+
+ArrayLike = Union[float, np.ndarray]
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def _inputs(underlying_price, strike, time_to_expiry, volatility, is_call):
+    S, K, T, sigma, call = np.broadcast_arrays(
+        np.asarray(underlying_price, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(time_to_expiry, dtype=np.float64),
+        np.asarray(volatility, dtype=np.float64),
+        np.asarray(is_call, dtype=bool),
+    )
+    return S, K, T, sigma, np.where(call, 1.0, -1.0)
+
+
+def _terms(S, K, T, sigma, sign, r, q) -> Dict[str, np.ndarray]:
+    """Shared terms: d1/d2, discount factors and N(sign*d1), N(sign*d2), n(d1)."""
+    # NaN volatilities stay live so missing IVs give NaN, not a price
+    live = (T > 0) & ~(sigma <= 0)
+    T_live = np.where(live, T, 1.0)
+    sigma_live = np.where(live, sigma, 1.0)
+
+    sqrt_t = np.sqrt(T_live)
+    vol_sqrt_t = sigma_live * sqrt_t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma_live ** 2) * T_live) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+
+    T_disc = np.maximum(T, 0.0)
+    return {
+        "live": live,
+        "T": T_live,
+        "sigma": sigma_live,
+        "sqrt_t": sqrt_t,
+        "d1": d1,
+        "d2": d2,
+        "disc_q": np.exp(-q * T_disc),
+        "disc_r": np.exp(-r * T_disc),
+        "cdf1": ndtr(sign * d1),
+        "cdf2": ndtr(sign * d2),
+        "pdf1": np.exp(-0.5 * d1 ** 2) / _SQRT_2PI,
+    }
+
+
+def _price(S, K, T, sign, terms) -> np.ndarray:
+    price = sign * (S * terms["disc_q"] * terms["cdf1"] - K * terms["disc_r"] * terms["cdf2"])
+    # expired: intrinsic value; no volatility: discounted forward intrinsic
+    floor = np.where(T > 0,
+                     np.maximum(sign * (S * terms["disc_q"] - K * terms["disc_r"]), 0.0),
+                     np.maximum(sign * (S - K), 0.0))
+    return np.where(terms["live"], price, floor)
+
+
+def black_scholes_price(
+    underlying_price: ArrayLike,
+    strike: ArrayLike,
+    time_to_expiry: ArrayLike,
+    volatility: ArrayLike,
+    is_call: Union[bool, np.ndarray],
+    risk_free_rate: float = 0.02,
+    dividend_yield: float = 0.0
+) -> np.ndarray:
+    """
+    Black-Scholes prices of many contracts.
+
+    Args:
+        underlying_price: Underlying price(s)
+        strike: Strike price(s)
+        time_to_expiry: Time(s) to expiry in years
+        volatility: Volatility(ies), annualized
+        is_call: True for calls, False for puts
+        risk_free_rate: Risk-free rate (annualized)
+        dividend_yield: Dividend yield (annualized)
+
+    Returns:
+        Array of option prices (broadcast shape of the inputs)
+    """
+    S, K, T, sigma, sign = _inputs(underlying_price, strike, time_to_expiry, volatility, is_call)
+    terms = _terms(S, K, T, sigma, sign, risk_free_rate, dividend_yield)
+    return _price(S, K, T, sign, terms)
+
+
+def black_scholes_greeks(
+    underlying_price: ArrayLike,
+    strike: ArrayLike,
+    time_to_expiry: ArrayLike,
+    volatility: ArrayLike,
+    is_call: Union[bool, np.ndarray],
+    risk_free_rate: float = 0.02,
+    dividend_yield: float = 0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Black-Scholes prices and Greeks of many contracts.
+
+    Args:
+        underlying_price: Underlying price(s)
+        strike: Strike price(s)
+        time_to_expiry: Time(s) to expiry in years
+        volatility: Volatility(ies), annualized
+        is_call: True for calls, False for puts
+        risk_free_rate: Risk-free rate (annualized)
+        dividend_yield: Dividend yield (annualized)
+
+    Returns:
+        Dictionary of arrays: price, delta, gamma, theta (per day), vega
+        (per 1% vol) and rho (per 1% rate)
+    """
+    r, q = risk_free_rate, dividend_yield
+    S, K, T, sigma, sign = _inputs(underlying_price, strike, time_to_expiry, volatility, is_call)
+    t = _terms(S, K, T, sigma, sign, r, q)
+    live = t["live"]
+
+    spot_term = S * t["disc_q"]
+    strike_term = K * t["disc_r"]
+    density = spot_term * t["pdf1"]
+
+    delta = sign * t["disc_q"] * t["cdf1"]
+    gamma = density / (S * S * t["sigma"] * t["sqrt_t"])
+    vega = density * t["sqrt_t"] / 100
+    theta = (
+        -density * t["sigma"] / (2 * t["sqrt_t"])
+        - sign * r * strike_term * t["cdf2"]
+        + sign * q * spot_term * t["cdf1"]
+    ) / 365
+    rho = sign * strike_term * t["T"] * t["cdf2"] / 100
+
+    greeks = {"price": _price(S, K, T, sign, t)}
+    for name, values in (("delta", delta), ("gamma", gamma), ("theta", theta),
+                         ("vega", vega), ("rho", rho)):
+        greeks[name] = np.where(live, values, 0.0)
+    return greeks
+
+
+def _initial_volatility(price, S, K, T, sign, r, q) -> np.ndarray:
+    """Corrado-Miller closed-form estimate (0.3 where it is undefined)."""
+    spot = S * np.exp(-q * T)
+    strike = K * np.exp(-r * T)
+    # puts via put-call parity
+    call = np.where(sign > 0, price, price + spot - strike)
+    half = call - (spot - strike) / 2
+    root = np.sqrt(np.maximum(half ** 2 - (spot - strike) ** 2 / np.pi, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = np.sqrt(2 * np.pi / T) / (spot + strike) * (half + root)
+    return np.where(np.isfinite(guess) & (guess > 0), guess, 0.3)
+
+
+def implied_volatility(
+    option_price: ArrayLike,
+    underlying_price: ArrayLike,
+    strike: ArrayLike,
+    time_to_expiry: ArrayLike,
+    is_call: Union[bool, np.ndarray],
+    risk_free_rate: float = 0.02,
+    dividend_yield: float = 0.0,
+    max_iterations: int = 100,
+    tolerance: float = 1e-8,
+    max_volatility: float = 10.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Implied volatilities of many contracts.
+
+    Each contract keeps a bracket [low, high] around its root; a Newton
+    step that is not finite or falls outside the bracket is replaced by
+    bisection, so tiny vegas (deep ITM/OTM, short expiries) still
+    converge. Only unconverged contracts are re-priced each iteration.
+
+    Args:
+        option_price: Observed option price(s)
+        underlying_price: Underlying price(s)
+        strike: Strike price(s)
+        time_to_expiry: Time(s) to expiry in years
+        is_call: True for calls, False for puts
+        risk_free_rate: Risk-free rate (annualized)
+        dividend_yield: Dividend yield (annualized)
+        max_iterations: Maximum iterations
+        tolerance: Convergence tolerance on the price
+        max_volatility: Upper end of the search bracket
+
+    Returns:
+        volatility: Array of implied volatilities (NaN where the price is
+            outside the no-arbitrage bounds, the contract is expired or
+            the root is above max_volatility; the last iterate where the
+            solver ran out of iterations)
+        converged: Boolean array, True where the price was matched
+    """
+    r, q = risk_free_rate, dividend_yield
+    S, K, T, _, sign = _inputs(underlying_price, strike, time_to_expiry, 0.0, is_call)
+    target, S, K, T, sign = np.broadcast_arrays(np.asarray(option_price, dtype=np.float64), S, K, T, sign)
+    shape = target.shape
+    target, S, K, T, sign = (a.ravel() for a in (target, S, K, T, sign))
+
+    volatility = np.full(S.shape, np.nan)
+    converged = np.zeros(S.shape, dtype=bool)
+
+    # solvable: live contract priced strictly between the price at zero
+    # volatility and the price at max_volatility
+    live = T > 0
+    T_live = np.where(live, T, 1.0)
+    lower = np.maximum(sign * (S * np.exp(-q * T_live) - K * np.exp(-r * T_live)), 0.0)
+    with np.errstate(invalid="ignore"):
+        upper = black_scholes_price(S, K, T_live, max_volatility, sign > 0, r, q)
+        solvable = live & (target > lower) & (target < upper)
+
+    rows = np.flatnonzero(solvable)
+    S, K, T, sign, target = S[rows], K[rows], T[rows], sign[rows], target[rows]
+    low = np.zeros(len(rows))
+    high = np.full(len(rows), max_volatility)
+    sigma = np.clip(_initial_volatility(target, S, K, T, sign, r, q), 1e-4, max_volatility)
+
+    active = np.arange(len(rows))
+    for _ in range(max_iterations):
+        if not len(active):
+            break
+
+        s, k, t, sg = S[active], K[active], T[active], sign[active]
+        sig = sigma[active]
+        terms = _terms(s, k, t, sig, sg, r, q)
+        diff = _price(s, k, t, sg, terms) - target[active]
+        vega = s * terms["disc_q"] * terms["pdf1"] * terms["sqrt_t"]
+
+        done = np.abs(diff) < tolerance
+        converged[rows[active[done]]] = True
+
+        # price increases with volatility: tighten the bracket
+        above = diff > 0
+        high[active] = np.where(above, sig, high[active])
+        low[active] = np.where(above, low[active], sig)
+        lo, hi = low[active], high[active]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = sig - diff / vega
+        newton = np.isfinite(step) & (step > lo) & (step < hi)
+        sigma[active] = np.where(done, sig, np.where(newton, step, (lo + hi) / 2))
+
+        active = active[~done]
+
+    volatility[rows] = sigma
+    return volatility.reshape(shape), converged.reshape(shape)
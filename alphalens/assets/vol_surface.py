@@ -0,0 +1,300 @@
+"""
+Implied volatility surface.
+
+Fitted from one batched IV solve over an OptionChain. Each expiry's
+smile is a vega-weighted polynomial in total variance (sigma^2 * T)
+against forward log-moneyness log(K / F). Between expiries, total
+variance is interpolated linearly in time. The fitted coefficients are
+cached, so lookups over any strike/expiry grid are a few array
+operations. When some quotes change, only their contracts are re-solved
+and only their expiries refitted.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from alphalens.assets.option_chain import OptionChain
+from alphalens.assets.option_pricing import black_scholes_greeks, implied_volatility
+
+ArrayLike = Union[float, np.ndarray]
+
+# Floor on fitted total variance, keeps wings of the polynomial positive
+_MIN_TOTAL_VARIANCE = 1e-8
+
+
+class VolatilitySurface:
+    """
+    Smile-consistent volatilities from an options chain.
+
+    Usage:
+        surface = VolatilitySurface(data_manager.get_option_chain("SPX"))
+        vols = surface.volatility(strikes[None, :], times[:, None])  # grid
+        surface.update({"O:SPX...": 12.4})  # refits that expiry only
+    """
+
+    def __init__(
+        self,
+        chain: OptionChain,
+        prices: Optional[np.ndarray] = None,
+        underlying_price: Optional[float] = None,
+        risk_free_rate: float = 0.02,
+        dividend_yield: float = 0.0,
+        now: Optional[datetime] = None,
+        degree: int = 2
+    ):
+        """
+        Solve the chain's implied volatilities and fit the surface.
+
+        Args:
+            chain: Options chain
+            prices: Option prices (default: the chain's mid)
+            underlying_price: Underlying price (default: the chain's)
+            risk_free_rate: Risk-free rate
+            dividend_yield: Dividend yield
+            now: Valuation time (default: now)
+            degree: Polynomial degree of each expiry's smile
+        """
+        self.chain = chain
+        self.prices = np.array(chain.mid if prices is None else prices, dtype=np.float64)
+        self.underlying_price = chain.underlying_price if underlying_price is None else float(underlying_price)
+        self.risk_free_rate = risk_free_rate
+        self.dividend_yield = dividend_yield
+        self.now = now or datetime.now()
+        self.degree = degree
+
+        # one slice per expiration date
+        self._expiries, self._slice_of = np.unique(chain.expiries, return_inverse=True)
+
+        self.volatilities = np.full(len(chain), np.nan)
+        self.converged = np.zeros(len(chain), dtype=bool)
+        self._vega = np.zeros(len(chain))
+
+        n_slices = len(self._expiries)
+        self._coefficients = np.zeros((n_slices, degree + 1))
+        self._k_range = np.zeros((n_slices, 2))
+        self._fitted = np.zeros(n_slices, dtype=bool)
+
+        self._refit_all()
+
+    def __repr__(self) -> str:
+        return (f"VolatilitySurface({self.chain.underlying}, "
+                f"{int(self._fitted.sum())}/{len(self._expiries)} expirations fitted)")
+
+    # Fitting
+
+    def _refit_all(self) -> None:
+        if np.isnan(self.underlying_price):
+            raise ValueError("Underlying price unknown: pass underlying_price")
+        self._times = self._years(self._expiries)
+        self._solve(np.arange(len(self.chain)))
+        self._fit(np.arange(len(self._expiries)))
+
+    def _years(self, expiries: np.ndarray) -> np.ndarray:
+        now = np.datetime64(self.now, "ns")
+        return (expiries - now) / np.timedelta64(1, "s") / (365.0 * 24 * 3600)
+
+    def _log_moneyness(self, strike: ArrayLike, time_to_expiry: ArrayLike) -> np.ndarray:
+        """log(K / F) with F the forward price at time_to_expiry."""
+        carry = (self.risk_free_rate - self.dividend_yield) * time_to_expiry
+        return np.log(strike / self.underlying_price) - carry
+
+    def _solve(self, rows: np.ndarray) -> None:
+        """Implied volatilities (and their vegas, the fit weights) of some contracts."""
+        S, r, q = self.underlying_price, self.risk_free_rate, self.dividend_yield
+        strikes = self.chain.strikes[rows]
+        expiry = np.maximum(self._times[self._slice_of[rows]], 0.0)
+        is_call = self.chain.is_call[rows]
+
+        volatility, converged = implied_volatility(self.prices[rows], S, strikes, expiry, is_call, r, q)
+        vega = black_scholes_greeks(S, strikes, expiry, np.where(converged, volatility, 0.0),
+                                    is_call, r, q)["vega"] * 100
+
+        self.volatilities[rows] = np.where(converged, volatility, np.nan)
+        self.converged[rows] = converged
+        self._vega[rows] = np.where(converged, vega, 0.0)
+
+    def _fit(self, slices: np.ndarray) -> None:
+        """Fit the smile of each given expiry."""
+        for i in slices:
+            t = self._times[i]
+            rows = np.flatnonzero((self._slice_of == i) & self.converged & (self._vega > 0))
+            if t <= 0 or not len(rows):
+                self._fitted[i] = False
+                continue
+
+            k = self._log_moneyness(self.chain.strikes[rows], t)
+            total_variance = self.volatilities[rows] ** 2 * t
+            # weighting residuals by vega approximates a fit to prices
+            degree = min(self.degree, len(np.unique(k)) - 1)
+            coefficients = np.polyfit(k, total_variance, degree, w=self._vega[rows])
+
+            self._coefficients[i] = 0.0
+            self._coefficients[i, self.degree - degree:] = coefficients
+            self._k_range[i] = k.min(), k.max()
+            self._fitted[i] = True
+
+    def update(
+        self,
+        prices: Optional[Mapping[str, float]] = None,
+        underlying_price: Optional[float] = None,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Refit after quotes change.
+
+        A new underlying price or valuation time moves every contract and
+        refits the whole surface; new option prices alone only re-solve
+        those contracts and refit their expiries.
+
+        Args:
+            prices: Contract symbol -> new option price
+            underlying_price: New underlying price
+            now: New valuation time
+
+        Returns:
+            Number of expiries refitted
+
+        Raises:
+            KeyError: If a symbol is not in the chain
+        """
+        if prices:
+            rows = np.array([self.chain.row(symbol) for symbol in prices], dtype=np.intp)
+            self.prices[rows] = np.fromiter(prices.values(), dtype=np.float64, count=len(rows))
+
+        if underlying_price is not None or now is not None:
+            if underlying_price is not None:
+                self.underlying_price = float(underlying_price)
+            if now is not None:
+                self.now = now
+            self._refit_all()
+            return len(self._expiries)
+
+        if not prices:
+            return 0
+
+        self._solve(rows)
+        slices = np.unique(self._slice_of[rows])
+        self._fit(slices)
+        logger.debug(f"Volatility surface refit {len(slices)} expiries for {len(rows)} quotes")
+        return len(slices)
+
+    # Lookups
+
+    def _total_variance(self, slices: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """Fitted total variance of the given slices, flat beyond the quoted strikes."""
+        k = np.clip(k, self._k_range[slices, 0], self._k_range[slices, 1])
+        coefficients = self._coefficients[slices]
+        total_variance = np.zeros(k.shape)
+        for power in range(self.degree + 1):
+            total_variance = total_variance * k + coefficients[..., power]
+        return np.maximum(total_variance, _MIN_TOTAL_VARIANCE)
+
+    def volatility(self, strike: ArrayLike, time_to_expiry: ArrayLike) -> np.ndarray:
+        """
+        Surface volatilities (arrays broadcast, e.g. a strike x expiry grid).
+
+        Expiries between fitted ones interpolate total variance linearly
+        in time; before the first or after the last the nearest smile's
+        volatility is kept. Strikes beyond a smile's quotes are flat.
+
+        Args:
+            strike: Strike(s)
+            time_to_expiry: Time(s) to expiry in years from the surface's
+                valuation time
+
+        Returns:
+            Array of volatilities (NaN where time_to_expiry <= 0)
+
+        Raises:
+            ValueError: If no expiry could be fitted
+        """
+        fitted = np.flatnonzero(self._fitted)
+        if not len(fitted):
+            raise ValueError(f"No fitted expirations in the {self.chain.underlying} surface")
+
+        K, T = np.broadcast_arrays(np.asarray(strike, dtype=np.float64),
+                                   np.asarray(time_to_expiry, dtype=np.float64))
+        times = self._times[fitted]
+        T_live = np.where(T > 0, T, np.nan)
+        k = self._log_moneyness(K, T_live)
+
+        right = np.searchsorted(times, T_live)
+        lo = np.clip(right - 1, 0, len(fitted) - 1)
+        hi = np.clip(right, 0, len(fitted) - 1)
+        t_lo, t_hi = times[lo], times[hi]
+
+        variance_lo = self._total_variance(fitted[lo], k)
+        variance_hi = self._total_variance(fitted[hi], k)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(hi == lo, 0.0, (T_live - t_lo) / (t_hi - t_lo))
+            total_variance = (1 - weight) * variance_lo + weight * variance_hi
+            # outside the fitted expiries: keep the nearest smile's variance rate
+            total_variance = np.where(hi == lo, variance_lo / t_lo * T_live, total_variance)
+            return np.sqrt(total_variance / T_live)
+
+    def volatility_at(self, strike: ArrayLike, expiry: Union[Any, Sequence[Any]]) -> np.ndarray:
+        """
+        Surface volatilities by expiration date.
+
+        Args:
+            strike: Strike(s)
+            expiry: Expiration date(s)
+
+        Returns:
+            Array of volatilities
+        """
+        return self.volatility(strike, self.time_to_expiry(expiry))
+
+    def time_to_expiry(self, expiry: Union[Any, Sequence[Any]]) -> np.ndarray:
+        """
+        Years from the surface's valuation time to expiration date(s).
+
+        Args:
+            expiry: Expiration date(s)
+
+        Returns:
+            Array of times to expiry (negative once expired)
+        """
+        expiries = pd.DatetimeIndex(np.atleast_1d(expiry)).tz_localize(None).values
+        return self._years(expiries).reshape(np.shape(expiry))
+
+    def smiles(self) -> pd.DataFrame:
+        """
+        Fitted smile per expiration.
+
+        Returns:
+            DataFrame indexed by expiry with time_to_expiry, contracts used,
+            fitted, atm_volatility and the polynomial coefficients c0..cN
+            (highest power first, in log-moneyness)
+        """
+        counts = np.bincount(self._slice_of[self.converged & (self._vega > 0)],
+                             minlength=len(self._expiries))
+        frame = pd.DataFrame({
+            "time_to_expiry": self._times,
+            "contracts": counts,
+            "fitted": self._fitted,
+        }, index=pd.DatetimeIndex(self._expiries, name="expiry"))
+        with np.errstate(invalid="ignore"):
+            frame["atm_volatility"] = np.where(
+                self._fitted,
+                np.sqrt(self._total_variance(np.arange(len(self._expiries)), np.zeros(len(self._expiries)))
+                        / np.where(self._times > 0, self._times, np.nan)),
+                np.nan
+            )
+        for power in range(self.degree + 1):
+            frame[f"c{power}"] = self._coefficients[:, power]
+        return frame
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Surface parameters."""
+        return {
+            "underlying": self.chain.underlying,
+            "underlying_price": self.underlying_price,
+            "now": self.now.isoformat(),
+            "degree": self.degree,
+            "expirations": [str(pd.Timestamp(e).date()) for e in self._expiries[self._fitted]],
+        }
@@ -8,7 +8,8 @@ Supports:
 """
 
 from alphalens.data.base import BaseDataFeed
+from alphalens.data.async_base import AsyncBaseDataFeed
 from alphalens.data.alpaca_feed import AlpacaDataFeed
 from alphalens.data.yahoo_feed import YahooDataFeed
 
-__all__ = ["BaseDataFeed", "AlpacaDataFeed", "YahooDataFeed"]
+__all__ = ["BaseDataFeed", "AsyncBaseDataFeed", "AlpacaDataFeed", "YahooDataFeed"]
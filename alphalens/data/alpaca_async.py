@@ -0,0 +1,339 @@
+"""
+Async Alpaca data feed.
+
+Talks to the Alpaca market data REST API directly (the alpaca-py SDK is
+synchronous) through a pooled aiohttp session, sharing the rate limiter of
+the API key with AlpacaDataFeed.
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from alphalens.data.async_base import AsyncBaseDataFeed
+from alphalens.data.rate_limit import get_rate_limiter, key_id
+
+
+# OCC option symbol: root, expiry (YYMMDD), type, strike x 1000
+OCC_PATTERN = r"^(?P<underlying>[A-Z.]+?)(?P<expiry>\d{6})(?P<type>[CP])(?P<strike>\d{8})$"
+
+
+def _rfc3339(value: datetime) -> str:
+    """Format a datetime for the Alpaca API (naive datetimes are UTC)."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.isoformat()
+
+
+class AsyncAlpacaDataFeed(AsyncBaseDataFeed):
+    """
+    Async Alpaca market data feed.
+
+    Example:
+        async with AsyncAlpacaDataFeed(key, secret) as feed:
+            prices = await feed.get_latest_prices(["AAPL", "MSFT"])
+    """
+
+    TIMEFRAMES = {
+        "1Min": "1Min",
+        "5Min": "5Min",
+        "15Min": "15Min",
+        "1Hour": "1Hour",
+        "1Day": "1Day"
+    }
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str = "https://data.alpaca.markets",
+        feed: Optional[str] = None,
+        calls_per_minute: int = 200,
+        symbols_per_request: int = 100,
+        max_connections: int = 20,
+        rate_limit_path: Optional[str] = None
+    ):
+        """
+        Initialize async Alpaca data feed.
+
+        Args:
+            api_key: Alpaca API key
+            api_secret: Alpaca API secret
+            base_url: Market data API base URL
+            feed: Stock data feed ('iex', 'sip', None = account default)
+            calls_per_minute: Data API rate limit of the account
+            symbols_per_request: Symbols per multi-symbol request; batches
+                are fetched concurrently
+            max_connections: Size of the keep-alive connection pool
+            rate_limit_path: State file shared by every process using this
+                API key (None = limit this process only)
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url
+        self.feed = feed
+        self.symbols_per_request = max(1, symbols_per_request)
+
+        super().__init__(
+            {"api_key": api_key, "api_secret": api_secret, "base_url": base_url},
+            rate_limiter=get_rate_limiter(
+                f"alpaca:{key_id(api_key)}",
+                calls_per_minute,
+                path=rate_limit_path
+            ),
+            max_connections=max_connections
+        )
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {
+            "APCA-API-KEY-ID": self.api_key,
+            "APCA-API-SECRET-KEY": self.api_secret
+        }
+
+    def _batches(self, symbols: List[str]) -> List[List[str]]:
+        n = self.symbols_per_request
+        return [symbols[i:i + n] for i in range(0, len(symbols), n)]
+
+    async def _get_paged(
+        self,
+        url: str,
+        params: Dict[str, str],
+        key: str,
+        raise_on_error: bool = False
+    ) -> List[Any]:
+        """
+        Fetch every page of a next_page_token paginated endpoint.
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+            key: Payload key of each page ('bars', 'snapshots', ...)
+            raise_on_error: Raise if a page fails (after retries) instead of
+                returning the pages fetched so far
+
+        Returns:
+            List of page payloads
+
+        Raises:
+            RuntimeError: If a page fails and raise_on_error is set
+        """
+        pages = []
+        params = dict(params)
+        while True:
+            response = await self._get_json(url, params=params)
+            if not response:
+                if raise_on_error:
+                    raise RuntimeError(f"Page {len(pages) + 1} of {url} failed")
+                break
+
+            if response.get(key):
+                pages.append(response[key])
+
+            token = response.get("next_page_token")
+            if not token:
+                break
+            params["page_token"] = token
+
+        return pages
+
+    # Stock Data
+
+    async def get_historical_data(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str = "1Day"
+    ) -> pd.DataFrame:
+        """
+        Get historical bars, fetching symbol batches concurrently.
+
+        Args:
+            symbols: List of symbols
+            start: Start datetime
+            end: End datetime
+            timeframe: Timeframe (1Min, 5Min, 15Min, 1Hour, 1Day)
+
+        Returns:
+            DataFrame with OHLCV data, MultiIndex (timestamp, symbol). Symbols
+            of batches that could not be fetched are listed in
+            attrs["failed_windows"] as (symbol, start, end)
+        """
+        params = {
+            "timeframe": self.TIMEFRAMES.get(timeframe, "1Day"),
+            "start": _rfc3339(start),
+            "end": _rfc3339(end),
+            "limit": "10000",
+            "adjustment": "raw"
+        }
+        if self.feed:
+            params["feed"] = self.feed
+
+        url = f"{self.base_url}/v2/stocks/bars"
+        results = await asyncio.gather(*(
+            self._get_paged(url, dict(params, symbols=",".join(batch)), "bars", raise_on_error=True)
+            for batch in self._batches(symbols)
+        ), return_exceptions=True)
+
+        columns = {key: [] for key in ("t", "o", "h", "l", "c", "v", "n", "vw")}
+        symbol_arrays = []
+        failed = []
+
+        for batch, pages in zip(self._batches(symbols), results):
+            if isinstance(pages, Exception):
+                logger.error(f"Failed to fetch {batch}: {pages}")
+                failed.extend((symbol, start, end) for symbol in batch)
+                continue
+            for page in pages:
+                for symbol, bars in page.items():
+                    for key in columns:
+                        columns[key].extend(bar.get(key, np.nan) for bar in bars)
+                    symbol_arrays.append(np.full(len(bars), symbol, dtype=object))
+
+        if not symbol_arrays:
+            logger.warning("No data retrieved")
+            return pd.DataFrame()
+
+        index = pd.MultiIndex.from_arrays(
+            [pd.to_datetime(columns["t"], utc=True), np.concatenate(symbol_arrays)],
+            names=["timestamp", "symbol"]
+        )
+        df = pd.DataFrame({
+            "open": np.asarray(columns["o"], dtype=np.float64),
+            "high": np.asarray(columns["h"], dtype=np.float64),
+            "low": np.asarray(columns["l"], dtype=np.float64),
+            "close": np.asarray(columns["c"], dtype=np.float64),
+            "volume": np.asarray(columns["v"], dtype=np.float64),
+            "trade_count": np.asarray(columns["n"], dtype=np.float64),
+            "vwap": np.asarray(columns["vw"], dtype=np.float64),
+        }, index=index).sort_index()
+        df.attrs["failed_windows"] = failed
+        return df
+
+    async def get_latest_prices(self, symbols: List[str]) -> pd.Series:
+        """
+        Get latest mid prices (from the latest quotes).
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            Series with symbol -> mid price
+        """
+        params = {"feed": self.feed} if self.feed else {}
+        responses = await asyncio.gather(*(
+            self._get_json(f"{self.base_url}/v2/stocks/quotes/latest",
+                           params=dict(params, symbols=",".join(batch)))
+            for batch in self._batches(symbols)
+        ))
+
+        prices = {}
+        for response in responses:
+            if not response:
+                continue
+            for symbol, quote in response.get("quotes", {}).items():
+                prices[symbol] = (quote["bp"] + quote["ap"]) / 2
+
+        return pd.Series(prices)
+
+    # Options Data
+
+    async def get_options_chain(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get options chain snapshots for underlying.
+
+        Args:
+            underlying_symbol: Underlying stock symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type ('call' or 'put')
+
+        Returns:
+            DataFrame with options contracts, quotes and implied volatility
+        """
+        params = {"limit": "1000"}
+        if expiration_date:
+            params["expiration_date"] = expiration_date.strftime("%Y-%m-%d")
+        if strike_price:
+            params["strike_price_gte"] = str(strike_price)
+            params["strike_price_lte"] = str(strike_price)
+        if option_type:
+            params["type"] = option_type
+
+        pages = await self._get_paged(
+            f"{self.base_url}/v1beta1/options/snapshots/{underlying_symbol}",
+            params, "snapshots")
+
+        snapshots = {ticker: snap for page in pages for ticker, snap in page.items()}
+        if not snapshots:
+            return pd.DataFrame()
+
+        tickers = pd.Series(list(snapshots.keys()))
+        parts = tickers.str.extract(OCC_PATTERN)
+        quotes = [snap.get("latestQuote") or {} for snap in snapshots.values()]
+
+        return pd.DataFrame({
+            "ticker": tickers,
+            "underlying": parts["underlying"],
+            "strike": parts["strike"].astype(float) / 1000,
+            "expiry": pd.to_datetime(parts["expiry"], format="%y%m%d"),
+            "type": parts["type"].map({"C": "call", "P": "put"}),
+            "bid": [q.get("bp", np.nan) for q in quotes],
+            "ask": [q.get("ap", np.nan) for q in quotes],
+            "implied_volatility": [snap.get("impliedVolatility", np.nan)
+                                   for snap in snapshots.values()],
+        })
+
+    # News
+
+    async def get_news(
+        self,
+        symbol: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Get latest news (same article format as the Polygon feeds).
+
+        Args:
+            symbol: Filter by symbol (None = all news)
+            limit: Number of articles
+
+        Returns:
+            List of news articles
+        """
+        params = {"limit": str(limit), "sort": "desc"}
+        if symbol:
+            params["symbols"] = symbol
+
+        response = await self._get_json(f"{self.base_url}/v1beta1/news", params)
+
+        if not response or "news" not in response:
+            return []
+
+        articles = []
+        for article in response["news"]:
+            images = article.get("images") or []
+            articles.append({
+                "id": article["id"],
+                "title": article["headline"],
+                "author": article.get("author"),
+                "published_utc": pd.to_datetime(article["created_at"]),
+                "article_url": article.get("url"),
+                "tickers": article.get("symbols", []),
+                "amp_url": None,
+                "image_url": images[0].get("url") if images else None,
+                "description": article.get("summary", ""),
+                "keywords": []
+            })
+
+        return articles
@@ -2,12 +2,17 @@
 Alpaca data feed integration.
 """
 
-from typing import List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable
 from datetime import datetime
+from threading import Lock, Thread
+import asyncio
+import time
 import pandas as pd
 from loguru import logger
 
 from alphalens.data.base import BaseDataFeed
+from alphalens.data.rate_limit import get_rate_limiter, key_id
+from alphalens.data.stream_pipeline import MessagePipeline
 
 try:
     from alpaca.data.historical import StockHistoricalDataClient
@@ -20,15 +25,40 @@ except ImportError:
 
 
 class AlpacaDataFeed(BaseDataFeed):
-    """Alpaca data feed."""
+    """
+    Alpaca data feed.
 
-    def __init__(self, api_key: str, api_secret: str):
+    Real-time bars stream on a background thread running the SDK's event
+    loop; bars go through a MessagePipeline (bounded queue, worker pool,
+    per-symbol ordering) to the callbacks, so subscribe_realtime returns
+    immediately and symbols can be added or removed while streaming.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        calls_per_minute: int = 200,
+        rate_limit_path: Optional[str] = None,
+        stream_workers: int = 2,
+        stream_buffer_size: int = 10000,
+        stream_backpressure: str = "drop_oldest",
+        lag_threshold: float = 5.0
+    ):
         """
         Initialize Alpaca data feed.
 
         Args:
             api_key: Alpaca API key
             api_secret: Alpaca API secret
+            calls_per_minute: Data API rate limit of the account
+            rate_limit_path: State file shared by every process using this
+                API key (None = limit this process only)
+            stream_workers: Worker threads running real-time callbacks
+            stream_buffer_size: Real-time queue capacity
+            stream_backpressure: Queue policy ("drop_oldest", "conflate", "block")
+            lag_threshold: Seconds after a bar closes beyond which its
+                delivery counts as lagging
         """
         if not ALPACA_AVAILABLE:
             raise ImportError("Alpaca SDK not installed. Run: pip install alpaca-py")
@@ -39,6 +69,29 @@ class AlpacaDataFeed(BaseDataFeed):
         self.historical_client = None
         self.stream_client = None
 
+        # Real-time streaming
+        self.stream_pipeline = MessagePipeline(
+            self._dispatch_bar,
+            buffer_size=stream_buffer_size,
+            workers=stream_workers,
+            policy=stream_backpressure
+        )
+        self.lag_threshold = lag_threshold
+        self._stream_thread: Optional[Thread] = None
+        self._stream_lock = Lock()
+        self._bar_callbacks: Dict[str, List[Callable[[dict], None]]] = {}
+        self.bars_received = 0
+        # lag metrics are updated by every pipeline worker
+        self._lag_lock = Lock()
+        self.bars_lagging = 0
+        self.max_lag = 0.0
+
+        self.rate_limiter = get_rate_limiter(
+            f"alpaca:{key_id(api_key)}",
+            calls_per_minute,
+            path=rate_limit_path
+        )
+
     def connect(self) -> bool:
         """Connect to Alpaca data API."""
         try:
@@ -47,10 +100,7 @@ class AlpacaDataFeed(BaseDataFeed):
                 secret_key=self.config["api_secret"]
             )
 
-            self.stream_client = StockDataStream(
-                api_key=self.config["api_key"],
-                secret_key=self.config["api_secret"]
-            )
+            self.stream_client = self._create_stream_client()
 
             self.connected = True
             logger.info("Connected to Alpaca data feed")
@@ -62,9 +112,8 @@ class AlpacaDataFeed(BaseDataFeed):
 
     def disconnect(self) -> None:
         """Disconnect from Alpaca."""
-        if self.stream_client:
-            self.stream_client.stop()
         self.connected = False
+        self.unsubscribe_realtime()
         logger.info("Disconnected from Alpaca data feed")
 
     def get_historical_data(
@@ -94,6 +143,7 @@ class AlpacaDataFeed(BaseDataFeed):
             end=end
         )
 
+        self.rate_limiter.acquire()
         bars = self.historical_client.get_stock_bars(request)
         df = bars.df
 
@@ -105,6 +155,7 @@ class AlpacaDataFeed(BaseDataFeed):
             raise RuntimeError("Not connected to data feed")
 
         request = StockLatestQuoteRequest(symbol_or_symbols=symbols)
+        self.rate_limiter.acquire()
         quotes = self.historical_client.get_stock_latest_quote(request)
 
         prices = {}
@@ -114,30 +165,139 @@ class AlpacaDataFeed(BaseDataFeed):
 
         return pd.Series(prices)
 
+    def _create_stream_client(self) -> "StockDataStream":
+        return StockDataStream(
+            api_key=self.config["api_key"],
+            secret_key=self.config["api_secret"]
+        )
+
     def subscribe_realtime(
         self,
         symbols: List[str],
         callback: Callable[[dict], None]
     ) -> None:
-        """Subscribe to real-time updates."""
+        """
+        Subscribe to real-time bars without blocking.
+
+        The first call starts the stream on a background thread; later
+        calls add symbols to the running stream.
+
+        Args:
+            symbols: List of symbols
+            callback: Called on a worker thread with each bar dict (symbol,
+                timestamp, open, high, low, close, volume)
+        """
         if not self.connected:
             raise RuntimeError("Not connected to data feed")
 
-        async def handle_bar(bar):
-            callback({
-                "symbol": bar.symbol,
-                "timestamp": bar.timestamp,
-                "open": bar.open,
-                "high": bar.high,
-                "low": bar.low,
-                "close": bar.close,
-                "volume": bar.volume
-            })
+        with self._stream_lock:
+            for symbol in symbols:
+                self._bar_callbacks.setdefault(symbol, []).append(callback)
+
+            self.stream_pipeline.start()
+            # thread-safe: sends the subscription if the stream is running
+            self.stream_client.subscribe_bars(self._handle_bar, *symbols)
+
+            if self._stream_thread is None or not self._stream_thread.is_alive():
+                self._stream_thread = Thread(target=self._run_stream, name="alpaca-stream", daemon=True)
+                self._stream_thread.start()
 
-        self.stream_client.subscribe_bars(handle_bar, *symbols)
-        self.stream_client.run()
+        logger.info(f"Subscribed to real-time bars for {len(symbols)} symbols")
+
+    def _run_stream(self) -> None:
+        """Run the SDK stream (and its event loop) until stopped."""
+        try:
+            self.stream_client.run()
+        except Exception as e:
+            logger.error(f"Alpaca stream error: {e}")
+
+    async def _handle_bar(self, bar) -> None:
+        """Queue a bar from the stream's event loop."""
+        self.bars_received += 1
+        messages = [{
+            "ev": "bar",
+            "sym": bar.symbol,
+            "symbol": bar.symbol,
+            "timestamp": bar.timestamp,
+            "open": bar.open,
+            "high": bar.high,
+            "low": bar.low,
+            "close": bar.close,
+            "volume": bar.volume
+        }]
+        if self.stream_pipeline.policy == "block":
+            # waiting for queue space here would stall the SDK's event loop
+            # (and its keep-alives); wait on an executor thread instead
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.stream_pipeline.put_messages, messages)
+        else:
+            self.stream_pipeline.put_messages(messages)
+
+    def _dispatch_bar(self, msg: Dict[str, Any]) -> None:
+        """Deliver a bar to its callbacks (pipeline worker thread)."""
+        # minute bars are stamped with their start
+        lag = time.time() - pd.Timestamp(msg["timestamp"]).timestamp() - 60
+        with self._lag_lock:
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.lag_threshold:
+                self.bars_lagging += 1
+
+        for callback in list(self._bar_callbacks.get(msg["symbol"], ())):
+            try:
+                callback({k: v for k, v in msg.items() if k not in ("ev", "sym")})
+            except Exception as e:
+                logger.error(f"Callback error: {e}")
 
     def unsubscribe_realtime(self, symbols: Optional[List[str]] = None) -> None:
-        """Unsubscribe from real-time data."""
-        if self.stream_client:
-            self.stream_client.stop()
+        """
+        Unsubscribe from real-time bars.
+
+        Args:
+            symbols: Symbols to drop (None = all, stopping the stream)
+        """
+        with self._stream_lock:
+            if symbols is not None:
+                symbols = [symbol for symbol in symbols if symbol in self._bar_callbacks]
+                for symbol in symbols:
+                    del self._bar_callbacks[symbol]
+                if symbols and self._bar_callbacks and self.stream_client:
+                    self.stream_client.unsubscribe_bars(*symbols)
+                    return
+                if self._bar_callbacks:
+                    return
+
+            self._bar_callbacks.clear()
+            thread, self._stream_thread = self._stream_thread, None
+
+            if self.stream_client:
+                if thread is not None and thread.is_alive():
+                    self.stream_client.stop()
+                    thread.join(timeout=10)
+                # a stopped SDK stream is not restarted: the next
+                # subscription gets a fresh one
+                self.stream_client = self._create_stream_client() if self.connected else None
+
+            self.stream_pipeline.stop()
+
+    def get_stream_stats(self) -> Dict[str, Any]:
+        """
+        Get real-time streaming statistics.
+
+        Returns:
+            Dictionary with received, delivered, dropped and lagging bar
+            counts and the pipeline queue depths
+        """
+        pipeline = self.stream_pipeline.get_stats()
+        with self._lag_lock:
+            lagging, max_lag = self.bars_lagging, self.max_lag
+        return {
+            "streaming": self._stream_thread is not None and self._stream_thread.is_alive(),
+            "symbols": len(self._bar_callbacks),
+            "received": self.bars_received,
+            "delivered": pipeline["messages_processed"],
+            "dropped": pipeline["messages_dropped"],
+            "lagging": lagging,
+            "max_lag_seconds": max_lag,
+            "queue_depth": pipeline["queue_depth"],
+            "pipeline": pipeline,
+        }
@@ -0,0 +1,238 @@
+"""
+Async data feed interface.
+
+Async counterpart of BaseDataFeed for event-loop based consumers (the
+FastAPI dashboard, concurrent research jobs). Feeds share one pooled
+keep-alive HTTP session per instance and draw from the same rate limiters
+as their synchronous versions, waiting for tokens with asyncio.sleep
+instead of blocking a thread.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Mapping, Optional
+from datetime import datetime
+import asyncio
+import pandas as pd
+from loguru import logger
+
+from alphalens.data.json_codec import loads
+from alphalens.data.rate_limit import TokenBucket, backoff_delay
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class AsyncBaseDataFeed(ABC):
+    """
+    Abstract base class for async data feeds.
+
+    Usage:
+        async with AsyncPolygonDataFeed(api_key) as feed:
+            bars, news = await asyncio.gather(
+                feed.get_historical_data(["AAPL", "MSFT"], start, end),
+                feed.get_news("AAPL"),
+            )
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_connections: int = 20,
+        timeout: float = 10.0
+    ):
+        """
+        Initialize async data feed.
+
+        Args:
+            config: Data feed configuration
+            rate_limiter: Limiter shared with other users of the API key
+            max_connections: Size of the keep-alive connection pool
+            timeout: Total timeout of one request, seconds
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required. Run: pip install aiohttp")
+
+        self.config = config
+        self.rate_limiter = rate_limiter
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self.connected = False
+        logger.info(f"{self.__class__.__name__} initialized")
+
+    def _default_headers(self) -> Dict[str, str]:
+        """Headers sent with every request (authentication)."""
+        return {}
+
+    async def connect(self) -> bool:
+        """Open the pooled HTTP session."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=30
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._default_headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        self.connected = True
+        return True
+
+    async def disconnect(self) -> None:
+        """Close the HTTP session and its connections."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.connected = False
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.disconnect()
+
+    async def _throttle(self) -> None:
+        """Wait for a rate limit token without blocking the event loop."""
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def _get_json(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        retries: int = 3
+    ) -> Optional[Dict]:
+        """
+        GET a JSON document with rate limiting and retries.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            retries: Number of attempts
+
+        Returns:
+            Response JSON or None
+        """
+        if self.session is None:
+            await self.connect()
+
+        for attempt in range(retries):
+            await self._throttle()
+
+            try:
+                async with self.session.get(url, params=params) as response:
+                    if response.status == 200:
+                        if self.rate_limiter is not None:
+                            self.rate_limiter.update_from_headers(response.headers)
+                        return loads(await response.read())
+
+                    elif response.status == 429:
+                        delay = backoff_delay(attempt, response.headers)
+                        logger.warning(f"Rate limit exceeded, backing off {delay:.1f}s")
+                        if self.rate_limiter is not None:
+                            self.rate_limiter.penalize(delay)
+                        else:
+                            await asyncio.sleep(delay)
+                        continue
+
+                    elif response.status >= 500:
+                        logger.warning(f"Server error {response.status}, retrying...")
+                        await asyncio.sleep(backoff_delay(attempt))
+                        continue
+
+                    else:
+                        text = await response.text()
+                        logger.error(f"API error {response.status}: {text}")
+                        return None
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Request failed: {e}")
+                if attempt < retries - 1:
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+                return None
+
+        return None
+
+    @abstractmethod
+    async def get_historical_data(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str = "1Day"
+    ) -> pd.DataFrame:
+        """
+        Get historical data.
+
+        Args:
+            symbols: List of symbols
+            start: Start datetime
+            end: End datetime
+            timeframe: Data timeframe
+
+        Returns:
+            DataFrame with MultiIndex (timestamp, symbol)
+        """
+        pass
+
+    @abstractmethod
+    async def get_latest_prices(self, symbols: List[str]) -> pd.Series:
+        """
+        Get latest prices for symbols.
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            Series with symbol as index, price as value
+        """
+        pass
+
+    @abstractmethod
+    async def get_options_chain(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get options chain for underlying.
+
+        Args:
+            underlying_symbol: Underlying stock symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type ('call' or 'put')
+
+        Returns:
+            DataFrame with options contracts
+        """
+        pass
+
+    @abstractmethod
+    async def get_news(
+        self,
+        symbol: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Get latest news.
+
+        Args:
+            symbol: Filter by symbol (None = all news)
+            limit: Number of articles
+
+        Returns:
+            List of news articles
+        """
+        pass
@@ -0,0 +1,318 @@
+"""
+Streaming bar aggregator.
+
+Builds OHLCV/VWAP bars of a fixed interval for a set of symbols from
+WebSocket trades (T) and aggregates (A, AM), and keeps the most recent
+'capacity' bars in preallocated ring buffers shaped (bars, symbols).
+
+Every bar is written twice, at its ring slot and 'capacity' rows further,
+so any window of recent bars is one contiguous slice: window() returns a
+dates x assets view without copying, ready for live factor computation
+(or MarketRegimeAgent via panel()).
+
+Bars with no data for a symbol hold NaN prices and zero volume.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+import threading
+
+import numpy as np
+import pandas as pd
+
+from alphalens.data.stream_pipeline import message_symbol
+
+
+class BarAggregator:
+    """
+    Ring-buffer OHLCV/VWAP bars per symbol.
+
+    Usage:
+        bars = BarAggregator(["AAPL", "MSFT"], interval=60, capacity=390)
+        client.register_handler("T", bars.on_message)
+        ...
+        closes = bars.window("close", 30)  # (30, 2) view, oldest bar first
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume", "vwap", "trades")
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        interval: int = 60,
+        capacity: int = 390
+    ):
+        """
+        Initialize aggregator.
+
+        Args:
+            symbols: Symbols to aggregate (others are ignored until added)
+            interval: Bar length in seconds
+            capacity: Number of most recent bars kept
+        """
+        self.interval_ms = int(interval * 1000)
+        self.capacity = max(1, capacity)
+        self.symbols: List[str] = []
+        self._column: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._times = np.zeros(2 * self.capacity, dtype=np.int64)
+        self._data: Dict[str, np.ndarray] = {}
+        self._notional = np.zeros((2 * self.capacity, 0))  # price x volume, for the VWAP
+        self._last_trade = np.zeros((2 * self.capacity, 0), dtype=np.int64)
+        for field in self.FIELDS:
+            self._data[field] = np.zeros((2 * self.capacity, 0))
+
+        self._bucket: Optional[int] = None  # bucket of the latest bar
+        self._count = 0  # bars started so far
+
+        self.messages = 0
+        self.ignored = 0
+        self.late = 0
+
+        self.add_symbols(symbols)
+
+    def add_symbols(self, symbols: Iterable[str]) -> None:
+        """
+        Add symbols (reallocates the buffers; earlier views go stale).
+
+        Args:
+            symbols: Symbols to add
+        """
+        with self._lock:
+            new = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self._column]
+            if not new:
+                return
+
+            for symbol in new:
+                self._column[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+
+            rows = 2 * self.capacity
+            for field in self.FIELDS:
+                fill = 0.0 if field in ("volume", "trades") else np.nan
+                self._data[field] = np.hstack([self._data[field], np.full((rows, len(new)), fill)])
+            self._notional = np.hstack([self._notional, np.zeros((rows, len(new)))])
+            self._last_trade = np.hstack(
+                [self._last_trade, np.zeros((rows, len(new)), dtype=np.int64)])
+
+    # Writers
+
+    def on_message(self, msg: Dict[str, Any]) -> None:
+        """
+        Update bars from a stream message (T, A or AM events).
+
+        Args:
+            msg: Polygon WebSocket message
+        """
+        event = msg.get("ev")
+        symbol = message_symbol(msg)
+
+        if event in ("T", "XT"):
+            self.update_trade(symbol, msg["p"], msg.get("s", 0), msg["t"])
+        elif event in ("A", "AM", "XA"):
+            self.update_bar(symbol, msg["o"], msg["h"], msg["l"], msg["c"],
+                            msg.get("v", 0), msg.get("vw"), msg["s"])
+
+    def update_trade(self, symbol: str, price: float, size: float, timestamp: int) -> None:
+        """
+        Add a trade.
+
+        Args:
+            symbol: Symbol
+            price: Trade price
+            size: Trade size
+            timestamp: Trade time (epoch ms)
+        """
+        with self._lock:
+            cell = self._locate(symbol, timestamp)
+            if cell is None:
+                return
+            self._merge(cell, price, price, price, price, size, price * size, timestamp, 1)
+
+    def update_bar(
+        self,
+        symbol: str,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        vwap: Optional[float],
+        start: int
+    ) -> None:
+        """
+        Merge a bar no longer than the interval (e.g. a minute aggregate).
+
+        Args:
+            symbol: Symbol
+            open, high, low, close: Bar prices
+            volume: Bar volume
+            vwap: Bar VWAP (None = typical price)
+            start: Bar start (epoch ms)
+        """
+        if vwap is None:
+            vwap = (high + low + close) / 3
+
+        with self._lock:
+            cell = self._locate(symbol, start)
+            if cell is None:
+                return
+            self._merge(cell, open, high, low, close, volume, vwap * volume, start, 0)
+
+    def _merge(
+        self,
+        cell: tuple,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        notional: float,
+        timestamp: int,
+        trades: int
+    ) -> None:
+        """Merge prices and volume into one bar, slot and mirror alike."""
+        (r, m), j = cell
+        data = self._data
+
+        first = data["open"][r, j]
+        if np.isnan(first):
+            data["open"][r, j] = data["open"][m, j] = open
+        else:
+            high = max(data["high"][r, j], high)
+            low = min(data["low"][r, j], low)
+        data["high"][r, j] = data["high"][m, j] = high
+        data["low"][r, j] = data["low"][m, j] = low
+
+        # out-of-order updates do not move the close back
+        if timestamp >= self._last_trade[r, j]:
+            data["close"][r, j] = data["close"][m, j] = close
+            self._last_trade[r, j] = self._last_trade[m, j] = timestamp
+
+        volume += data["volume"][r, j]
+        notional += self._notional[r, j]
+        data["volume"][r, j] = data["volume"][m, j] = volume
+        self._notional[r, j] = self._notional[m, j] = notional
+        if trades:
+            data["trades"][r, j] = data["trades"][m, j] = data["trades"][r, j] + trades
+        if volume > 0:
+            data["vwap"][r, j] = data["vwap"][m, j] = notional / volume
+
+    def _locate(self, symbol: Optional[str], timestamp: int) -> Optional[tuple]:
+        """Rows (slot and mirror) and column of a symbol's bar at 'timestamp'."""
+        self.messages += 1
+
+        j = self._column.get(symbol)
+        if j is None:
+            self.ignored += 1
+            return None
+
+        bucket = int(timestamp) // self.interval_ms
+        if self._bucket is None or bucket > self._bucket:
+            self._advance(bucket)
+        elif bucket <= self._bucket - min(self._count, self.capacity):
+            # older than the buffer
+            self.late += 1
+            return None
+
+        slot = (self._count - 1 - (self._bucket - bucket)) % self.capacity
+        return (slot, slot + self.capacity), j
+
+    def _advance(self, bucket: int) -> None:
+        """Start the bars up to 'bucket', clearing their slots."""
+        steps = 1 if self._bucket is None else bucket - self._bucket
+        started = min(steps, self.capacity)
+
+        # bars that would be overwritten right away are only counted, so
+        # slots stay aligned to time
+        self._count += steps - started
+
+        for b in range(bucket - started + 1, bucket + 1):
+            slot = self._count % self.capacity
+            rows = [slot, slot + self.capacity]
+            self._times[rows] = b * self.interval_ms
+            for field in self.FIELDS:
+                self._data[field][rows] = 0.0 if field in ("volume", "trades") else np.nan
+            self._notional[rows] = 0.0
+            self._last_trade[rows] = 0
+            self._count += 1
+
+        self._bucket = bucket
+
+    # Readers
+
+    def __len__(self) -> int:
+        """Number of bars held."""
+        return min(self._count, self.capacity)
+
+    def _rows(self, n: Optional[int]) -> slice:
+        n = len(self) if n is None else min(max(n, 0), len(self))
+        end = (self._count - 1) % self.capacity + 1 if self._count else 0
+        start = end - n
+        if start < 0:
+            start += self.capacity
+        return slice(start, start + n)
+
+    def window(self, field: str = "close", n: Optional[int] = None) -> np.ndarray:
+        """
+        Most recent bars of one field, without copying.
+
+        The view is read-only and keeps changing while bars are written
+        (the latest row is the bar in progress); copy it to keep a snapshot.
+
+        Args:
+            field: One of FIELDS
+            n: Number of bars (None = all held)
+
+        Returns:
+            Array (bars, symbols), oldest bar first, columns in self.symbols order
+        """
+        if field not in self._data:
+            raise ValueError(f"Unknown field {field!r}, expected one of {self.FIELDS}")
+
+        view = self._data[field][self._rows(n)]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, n: Optional[int] = None) -> pd.DatetimeIndex:
+        """
+        Start times of the most recent bars.
+
+        Args:
+            n: Number of bars (None = all held)
+
+        Returns:
+            DatetimeIndex (UTC), oldest bar first
+        """
+        return pd.to_datetime(self._times[self._rows(n)], unit="ms", utc=True)
+
+    def panel(self, field: str = "close", n: Optional[int] = None) -> pd.DataFrame:
+        """
+        Most recent bars of one field as a dates x assets frame.
+
+        Args:
+            field: One of FIELDS
+            n: Number of bars (None = all held)
+
+        Returns:
+            DataFrame indexed by bar start, one column per symbol (sharing
+            memory with the buffer)
+        """
+        with self._lock:
+            values = self.window(field, n)
+            index = self.timestamps(len(values))
+        return pd.DataFrame(values, index=index, columns=list(self.symbols), copy=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregator statistics."""
+        return {
+            "symbols": len(self.symbols),
+            "bars": len(self),
+            "capacity": self.capacity,
+            "interval_seconds": self.interval_ms / 1000,
+            "messages": self.messages,
+            "ignored": self.ignored,
+            "late": self.late,
+            "memory_bytes": int(sum(a.nbytes for a in self._data.values())
+                                + self._notional.nbytes + self._last_trade.nbytes),
+        }
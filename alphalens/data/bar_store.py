@@ -0,0 +1,455 @@
+"""
+Local columnar store of historical bars.
+
+Bars are partitioned by timeframe, symbol and period (year for daily and
+hourly bars, month for minute bars). Each partition is a NumPy .npz file
+holding one array per column, so a read loads only the partitions of the
+requested range and no per-row Python objects are created.
+
+Next to the partitions, a coverage index records which date ranges were
+already requested upstream for each (symbol, timeframe). Ranges without
+bars (weekends, holidays) are covered too, so they are not requested again.
+Only the ranges missing from the index need to be fetched.
+
+Layout:
+    root/
+      1Day/
+        AAPL/
+          2023.npz
+          2024.npz
+          _coverage.json
+      1Min/
+        AAPL/
+          2024-01.npz
+          ...
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from urllib.parse import quote, unquote
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+Interval = Tuple[date, date]  # inclusive date range
+
+
+def _to_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """
+    Merge overlapping or adjacent date intervals.
+
+    Args:
+        intervals: Inclusive (start, end) date ranges
+
+    Returns:
+        Sorted, disjoint intervals
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(start: date, end: date, covered: List[Interval]) -> List[Interval]:
+    """
+    Parts of [start, end] not contained in 'covered'.
+
+    Args:
+        start: Range start
+        end: Range end (inclusive)
+        covered: Sorted, disjoint intervals
+
+    Returns:
+        Missing intervals, sorted
+    """
+    missing = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            missing.append((cursor, min(end, cov_start - timedelta(days=1))))
+        cursor = max(cursor, cov_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def normalize_bars(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bring feed output into the (timestamp, symbol) MultiIndex layout.
+
+    Feeds differ in level order (Alpaca returns (symbol, timestamp)) and
+    level names; this puts 'timestamp' first and 'symbol' second.
+    """
+    if data.empty or not isinstance(data.index, pd.MultiIndex):
+        return data
+
+    names = list(data.index.names)
+    if "symbol" in names and names.index("symbol") == 0:
+        data = data.swaplevel(0, 1)
+    data.index = data.index.set_names(["timestamp", "symbol"])
+    return data
+
+
+class BarStore:
+    """
+    Partitioned columnar bar store with a range-coverage index.
+
+    Thread-safe within a process.
+    """
+
+    # Partition period of each timeframe (pandas period frequency)
+    PARTITIONS = {
+        "1Min": "M",
+        "5Min": "M",
+        "15Min": "M",
+        "1Hour": "Y",
+        "1Day": "Y",
+    }
+
+    def __init__(self, root: str):
+        """
+        Initialize bar store.
+
+        Args:
+            root: Directory holding the partitions (created if missing)
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.RLock()
+        self._coverage: Dict[Tuple[str, str], List[Interval]] = {}
+
+    # Paths
+
+    def _symbol_dir(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, timeframe, quote(symbol, safe=""))
+
+    def _period_freq(self, timeframe: str) -> str:
+        return self.PARTITIONS.get(timeframe, "M")
+
+    def _partition_path(self, symbol: str, timeframe: str, period: pd.Period) -> str:
+        return os.path.join(self._symbol_dir(symbol, timeframe), f"{period}.npz")
+
+    # Coverage index
+
+    def coverage(self, symbol: str, timeframe: str) -> List[Interval]:
+        """
+        Date ranges already stored for a symbol.
+
+        Args:
+            symbol: Symbol
+            timeframe: Timeframe
+
+        Returns:
+            Sorted, disjoint inclusive date intervals
+        """
+        key = (symbol, timeframe)
+        with self._lock:
+            if key not in self._coverage:
+                path = os.path.join(self._symbol_dir(symbol, timeframe), "_coverage.json")
+                intervals = []
+                if os.path.exists(path):
+                    try:
+                        with open(path) as f:
+                            intervals = [(date.fromisoformat(s), date.fromisoformat(e))
+                                         for s, e in json.load(f)]
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Ignoring corrupt coverage index {path}: {e}")
+                self._coverage[key] = merge_intervals(intervals)
+            return list(self._coverage[key])
+
+    def _save_coverage(self, symbol: str, timeframe: str, intervals: List[Interval]) -> None:
+        directory = self._symbol_dir(symbol, timeframe)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "_coverage.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump([[s.isoformat(), e.isoformat()] for s, e in intervals], f)
+        os.replace(tmp, path)
+        self._coverage[(symbol, timeframe)] = intervals
+
+    def mark_covered(self, symbol: str, timeframe: str, start: Any, end: Any) -> None:
+        """
+        Record [start, end] as stored for a symbol.
+
+        Args:
+            symbol: Symbol
+            timeframe: Timeframe
+            start: Range start
+            end: Range end (inclusive)
+        """
+        start, end = _to_date(start), _to_date(end)
+        if end < start:
+            return
+        with self._lock:
+            intervals = merge_intervals(self.coverage(symbol, timeframe) + [(start, end)])
+            self._save_coverage(symbol, timeframe, intervals)
+
+    def missing(self, symbol: str, start: Any, end: Any, timeframe: str) -> List[Interval]:
+        """
+        Parts of [start, end] not stored for a symbol.
+
+        Args:
+            symbol: Symbol
+            start: Range start
+            end: Range end (inclusive)
+            timeframe: Timeframe
+
+        Returns:
+            Missing inclusive date intervals
+        """
+        return subtract_intervals(_to_date(start), _to_date(end),
+                                  self.coverage(symbol, timeframe))
+
+    # Partitions
+
+    @staticmethod
+    def _load_partition(path: str) -> Optional[Dict[str, np.ndarray]]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                return {key: z[key] for key in z.files}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable partition {path}: {e}")
+            return None
+
+    @staticmethod
+    def _save_partition(path: str, columns: Dict[str, np.ndarray]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **columns)
+        os.replace(tmp, path)
+
+    def write(
+        self,
+        data: pd.DataFrame,
+        timeframe: str,
+        start: Any,
+        end: Any,
+        symbols: Optional[List[str]] = None,
+        failed: Optional[Iterable[Tuple[str, Any, Any]]] = None
+    ) -> None:
+        """
+        Merge bars into the store and mark [start, end] covered.
+
+        Coverage is only recorded for the symbols present in 'data' (a
+        symbol without any bar may be a failed fetch and is retried next
+        time), and not for the windows listed in 'failed'. Bars already
+        stored at the same timestamps are replaced.
+
+        Args:
+            data: Bars with MultiIndex (timestamp, symbol)
+            timeframe: Timeframe
+            start: Requested range start
+            end: Requested range end (inclusive)
+            symbols: Symbols that were requested (None = those in data)
+            failed: (symbol, start, end) windows that could not be fetched
+                (e.g. the feed's attrs["failed_windows"])
+        """
+        data = normalize_bars(data)
+        if data.empty:
+            return
+
+        start, end = _to_date(start), _to_date(end)
+        gaps: Dict[str, List[Interval]] = {}
+        for symbol, gap_start, gap_end in failed or ():
+            gaps.setdefault(symbol, []).append((_to_date(gap_start), _to_date(gap_end)))
+
+        timestamps = pd.DatetimeIndex(data.index.get_level_values("timestamp"))
+        tz = str(timestamps.tz) if timestamps.tz is not None else ""
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_convert("UTC").tz_localize(None)
+
+        numeric = [col for col in data.columns
+                   if np.issubdtype(data[col].dtype, np.number)]
+        values = {col: data[col].to_numpy(dtype=np.float64) for col in numeric}
+        stamps = timestamps.asi8
+        periods = timestamps.to_period(self._period_freq(timeframe))
+        codes, uniques = pd.factorize(data.index.get_level_values("symbol"))
+
+        with self._lock:
+            for code, symbol in enumerate(uniques):
+                if symbols is not None and symbol not in symbols:
+                    continue
+                mask = codes == code
+                for period in pd.unique(periods[mask]):
+                    rows = mask & (periods == period)
+                    self._merge_partition(
+                        self._partition_path(symbol, timeframe, period),
+                        stamps[rows], {col: arr[rows] for col, arr in values.items()}, tz)
+                covered = subtract_intervals(start, end, merge_intervals(gaps.get(symbol, ())))
+                for cov_start, cov_end in covered:
+                    self.mark_covered(symbol, timeframe, cov_start, cov_end)
+                if symbol in gaps:
+                    logger.warning(f"{symbol} {timeframe}: {len(gaps[symbol])} failed windows "
+                                   f"left uncovered")
+
+    def _merge_partition(
+        self,
+        path: str,
+        stamps: np.ndarray,
+        values: Dict[str, np.ndarray],
+        tz: str
+    ) -> None:
+        existing = self._load_partition(path)
+        if existing is not None:
+            old_stamps = existing.pop("timestamp")
+            existing.pop("__tz__", None)
+            keep = ~np.isin(old_stamps, stamps)
+            columns = set(existing) | set(values)
+            n_old, n_new = keep.sum(), len(stamps)
+            stamps = np.concatenate([old_stamps[keep], stamps])
+            values = {
+                col: np.concatenate([
+                    existing[col][keep] if col in existing else np.full(n_old, np.nan),
+                    values[col] if col in values else np.full(n_new, np.nan),
+                ])
+                for col in columns
+            }
+
+        order = np.argsort(stamps, kind="mergesort")
+        columns = {col: arr[order] for col, arr in values.items()}
+        columns["timestamp"] = stamps[order]
+        columns["__tz__"] = np.array(tz)
+        self._save_partition(path, columns)
+
+    def read(
+        self,
+        symbols: List[str],
+        start: Any,
+        end: Any,
+        timeframe: str
+    ) -> pd.DataFrame:
+        """
+        Read stored bars.
+
+        Args:
+            symbols: Symbols
+            start: Range start
+            end: Range end (inclusive, whole day)
+            timeframe: Timeframe
+
+        Returns:
+            DataFrame with MultiIndex (timestamp, symbol), empty if nothing
+            is stored
+        """
+        start_date, end_date = _to_date(start), _to_date(end)
+        lo = pd.Timestamp(start_date).value
+        hi = pd.Timestamp(end_date + timedelta(days=1)).value
+        periods = pd.period_range(start_date, end_date, freq=self._period_freq(timeframe))
+
+        parts: Dict[str, List[np.ndarray]] = {}
+        symbol_parts = []
+        known = 0
+        tz = None
+
+        for symbol in symbols:
+            for period in periods:
+                part = self._load_partition(self._partition_path(symbol, timeframe, period))
+                if part is None:
+                    continue
+                stamps = part.pop("timestamp")
+                part_tz = str(part.pop("__tz__", ""))
+                tz = part_tz if tz is None else tz
+
+                rows = (stamps >= lo) & (stamps < hi)
+                n = int(rows.sum())
+                if n == 0:
+                    continue
+
+                for col in set(parts) | set(part):
+                    if col == "timestamp":
+                        continue
+                    if col not in parts:
+                        parts[col] = [np.full(known, np.nan)]
+                    parts[col].append(part[col][rows] if col in part else np.full(n, np.nan))
+                parts.setdefault("timestamp", []).append(stamps[rows])
+                symbol_parts.append(np.full(n, symbol, dtype=object))
+                known += n
+
+        if not symbol_parts:
+            return pd.DataFrame()
+
+        timestamps = pd.DatetimeIndex(np.concatenate(parts.pop("timestamp")))
+        if tz:
+            timestamps = timestamps.tz_localize("UTC").tz_convert(tz)
+
+        index = pd.MultiIndex.from_arrays(
+            [timestamps, np.concatenate(symbol_parts)],
+            names=["timestamp", "symbol"]
+        )
+        df = pd.DataFrame({col: np.concatenate(arrs) for col, arrs in parts.items()},
+                          index=index)
+        return df.sort_index()
+
+    # Maintenance
+
+    def clear(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> None:
+        """
+        Delete stored bars and their coverage.
+
+        Args:
+            symbol: Only this symbol (None = all)
+            timeframe: Only this timeframe (None = all)
+        """
+        with self._lock:
+            timeframes = [timeframe] if timeframe else (
+                os.listdir(self.root) if os.path.exists(self.root) else [])
+            for tf in timeframes:
+                if symbol is None:
+                    path = os.path.join(self.root, tf)
+                else:
+                    path = self._symbol_dir(symbol, tf)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+            self._coverage = {
+                key: value for key, value in self._coverage.items()
+                if not ((symbol is None or key[0] == symbol)
+                        and (timeframe is None or key[1] == timeframe))
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with symbol, partition and size counts
+        """
+        symbols = set()
+        partitions = 0
+        size = 0
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".npz"):
+                    partitions += 1
+                    size += os.path.getsize(os.path.join(dirpath, name))
+                    symbols.add(unquote(os.path.basename(dirpath)))
+        return {
+            "symbols": len(symbols),
+            "partitions": partitions,
+            "bytes": size,
+        }
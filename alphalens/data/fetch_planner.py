@@ -0,0 +1,136 @@
+"""
+Fetch planner for historical bars.
+
+Turns the missing (symbol, date range) intervals of a request into as few
+upstream requests as the source allows:
+
+1. The gaps of each symbol are coalesced into spans that fit in one
+   request window (refetching a covered stretch in between costs bytes,
+   not requests).
+2. Symbols with the same span share a request, up to the number of
+   symbols the source accepts per request.
+3. For daily bars from a source with a grouped endpoint (all symbols of
+   one day in one request), symbols whose gaps are cheaper to fill day by
+   day, counting each grouped request as shared by the symbols missing
+   that day, are moved to grouped requests. A one-day extension of a
+   500-symbol universe then takes one request instead of 500.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import date
+import math
+
+import numpy as np
+
+from alphalens.data.bar_store import Interval
+
+
+@dataclass
+class FetchRequest:
+    """One planned upstream request."""
+    symbols: List[str]
+    start: date
+    end: date  # inclusive
+    grouped: bool = False  # grouped daily request of the single day 'start'
+
+
+def coalesce_gaps(intervals: List[Interval], window_days: Optional[int] = None) -> List[Interval]:
+    """
+    Merge the gaps of one symbol into spans of at most window_days.
+
+    Args:
+        intervals: Sorted, disjoint missing intervals
+        window_days: Longest span one request can return (None = unlimited)
+
+    Returns:
+        Sorted spans covering every gap
+    """
+    spans: List[Interval] = []
+    for start, end in intervals:
+        if spans and (window_days is None
+                      or (end - spans[-1][0]).days + 1 <= window_days):
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def _business_days(intervals: List[Interval]) -> np.ndarray:
+    days = np.concatenate([
+        np.arange(np.datetime64(start), np.datetime64(end) + 1, dtype="datetime64[D]")
+        for start, end in intervals
+    ])
+    return days[np.is_busday(days)]
+
+
+def plan_fetches(
+    gaps: Dict[str, List[Interval]],
+    window_days: Optional[int] = None,
+    symbols_per_request: Optional[int] = None,
+    grouped_daily: bool = False
+) -> List[FetchRequest]:
+    """
+    Plan the upstream requests filling 'gaps'.
+
+    Args:
+        gaps: symbol -> sorted, disjoint missing intervals
+        window_days: Longest span one request can return (None = unlimited)
+        symbols_per_request: Symbols one request can carry (None = any
+            number, 1 = one request per symbol)
+        grouped_daily: The source has a grouped daily endpoint
+
+    Returns:
+        Requests, each filling its [start, end] range for its symbols
+    """
+    spans = {symbol: coalesce_gaps(intervals, window_days)
+             for symbol, intervals in gaps.items() if intervals}
+
+    plan: List[FetchRequest] = []
+
+    if grouped_daily:
+        # A grouped request is shared by every symbol missing that day, so a
+        # symbol's share of it is 1 / (symbols sharing it). Symbols whose
+        # shares add up to more than their own requests are dropped until
+        # the remaining set is stable.
+        per_request = symbols_per_request or math.inf
+        days_of = {symbol: _business_days(gaps[symbol]) for symbol in spans}
+        candidates = {symbol for symbol in spans if len(days_of[symbol])}
+
+        while candidates:
+            days, sharing = np.unique(
+                np.concatenate([days_of[symbol] for symbol in candidates]), return_counts=True)
+            share = 1.0 / sharing
+            drop = {
+                symbol for symbol in candidates
+                if share[np.searchsorted(days, days_of[symbol])].sum()
+                > len(spans[symbol]) / per_request
+            }
+            if not drop:
+                break
+            candidates -= drop
+
+        grouped_days: Dict[date, List[str]] = {}
+        for symbol in sorted(candidates):
+            for day in days_of[symbol].tolist():
+                grouped_days.setdefault(day, []).append(symbol)
+            del spans[symbol]
+
+        plan.extend(
+            FetchRequest(symbols, day, day, grouped=True)
+            for day, symbols in sorted(grouped_days.items())
+        )
+
+    by_span: Dict[Tuple[date, date], List[str]] = {}
+    for symbol, symbol_spans in spans.items():
+        for span in symbol_spans:
+            by_span.setdefault(span, []).append(symbol)
+
+    for (start, end), symbols in sorted(by_span.items()):
+        step = symbols_per_request or len(symbols)
+        plan.extend(
+            FetchRequest(symbols[i:i + step], start, end)
+            for i in range(0, len(symbols), step)
+        )
+
+    return plan
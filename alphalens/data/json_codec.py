@@ -0,0 +1,45 @@
+"""
+JSON encoding and decoding for data feed responses and recordings.
+
+Uses orjson when installed (several times faster on large aggregate
+responses), the standard library otherwise.
+"""
+
+from typing import Any, Union
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data: Raw response body
+
+    Returns:
+        Decoded document
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode a JSON document compactly.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
@@ -0,0 +1,183 @@
+"""
+In-process memory cache tier.
+
+A size-bounded LRU of recently used results (DataFrames, Series, ...) in
+front of the disk cache. Sizes are accounted in bytes (pandas deep memory
+usage), entries expire after their own TTL, and the least recently used
+entries are evicted when the byte budget is exceeded.
+
+Pandas and NumPy values are stored and returned as copies, so a caller
+mutating its value does not change what later callers get.
+"""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import pickle
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def sizeof(value: Any) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes.
+
+    Args:
+        value: Cached value
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def copy_value(value: Any) -> Any:
+    """
+    Copy of a mutable result (DataFrame, Series, ndarray); other values as is.
+
+    Args:
+        value: Cached or shared value
+
+    Returns:
+        Copy safe to hand to one caller
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    return value
+
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache with byte-size accounting and per-entry TTLs.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2 ** 20):
+        """
+        Initialize memory cache.
+
+        Args:
+            max_bytes: Byte budget; least recently used entries are evicted
+                beyond it (0 disables the cache)
+        """
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Value (a copy for pandas and NumPy values), or None if absent
+            or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires = entry
+            if time.monotonic() >= expires:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_value(value)
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> bool:
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache (pandas and NumPy values are copied)
+            ttl: Time to live in seconds
+
+        Returns:
+            True if cached (values larger than the budget are not)
+        """
+        if ttl <= 0 or value is None:
+            return False
+
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (copy_value(value), size, time.monotonic() + ttl)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every cached value and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss, eviction and size counters
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,396 @@
+"""
+Async Polygon.io data feed.
+
+Same endpoints and output formats as PolygonDataFeed, served through a
+pooled aiohttp session. All requests of a call are issued concurrently and
+share the rate limiter of the API key with the synchronous feed.
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+import asyncio
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from alphalens.data.async_base import AsyncBaseDataFeed
+from alphalens.data.polygon_feed import PolygonDataFeed
+from alphalens.data.rate_limit import get_rate_limiter, key_id
+
+
+class AsyncPolygonDataFeed(AsyncBaseDataFeed):
+    """
+    Async Polygon.io data feed.
+
+    Example:
+        async with AsyncPolygonDataFeed(api_key, tier="developer") as feed:
+            bars = await feed.get_historical_data(symbols, start, end)
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.polygon.io",
+        tier: str = "free",
+        max_connections: int = 20,
+        rate_limit_path: Optional[str] = None
+    ):
+        """
+        Initialize async Polygon data feed.
+
+        Args:
+            api_key: Polygon API key
+            base_url: API base URL
+            tier: Account tier (affects rate limits)
+            max_connections: Size of the keep-alive connection pool
+            rate_limit_path: State file shared by every process using this
+                API key (None = limit this process only)
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.tier = tier
+        self.calls_per_minute = PolygonDataFeed.RATE_LIMITS.get(tier, 5)
+
+        super().__init__(
+            {"api_key": api_key, "base_url": base_url, "tier": tier},
+            rate_limiter=get_rate_limiter(
+                f"polygon:{key_id(api_key)}",
+                self.calls_per_minute,
+                path=rate_limit_path
+            ),
+            max_connections=max_connections
+        )
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    async def _get_pages(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        max_pages: Optional[int] = None,
+        raise_on_error: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch the 'results' of every page of a paginated endpoint.
+
+        Args:
+            url: First page URL
+            params: Query parameters of the first page
+            max_pages: Stop after this many pages
+            raise_on_error: Raise if a page fails (after retries) instead of
+                returning the pages fetched so far
+
+        Returns:
+            List of 'results' lists, one per page
+
+        Raises:
+            RuntimeError: If a page fails and raise_on_error is set
+        """
+        pages = []
+        while url and (max_pages is None or len(pages) < max_pages):
+            response = await self._get_json(url, params=params)
+            if not response:
+                if raise_on_error:
+                    raise RuntimeError(f"Page {len(pages) + 1} of {url.split('?')[0]} failed")
+                break
+
+            if response.get("results"):
+                pages.append(response["results"])
+
+            # next_url carries the cursor and the original query
+            url = response.get("next_url")
+            params = None
+
+        return pages
+
+    # Stock Data
+
+    async def get_historical_data(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str = "1Day"
+    ) -> pd.DataFrame:
+        """
+        Get historical stock data, fetching all symbols concurrently.
+
+        Args:
+            symbols: List of stock symbols
+            start: Start date
+            end: End date
+            timeframe: Timeframe (1Min, 5Min, 15Min, 1Hour, 1Day)
+
+        Returns:
+            DataFrame with OHLCV data, MultiIndex (timestamp, symbol). Windows
+            that could not be fetched are listed in attrs["failed_windows"]
+            as (symbol, start, end)
+        """
+        multiplier, timespan = PolygonDataFeed.TIMEFRAMES.get(timeframe, (1, "day"))
+
+        tasks = [
+            (symbol, window_start, window_end)
+            for symbol in symbols
+            for window_start, window_end in PolygonDataFeed._split_range(
+                start, end, multiplier, timespan)
+        ]
+
+        results = await asyncio.gather(
+            *(self._fetch_aggregates(*task, multiplier, timespan) for task in tasks),
+            return_exceptions=True
+        )
+
+        chunks: Dict[str, List[Dict[str, np.ndarray]]] = {}
+        failed = []
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch {task[0]}: {result}")
+                failed.append(task)
+                continue
+            chunks.setdefault(task[0], []).append(result)
+
+        data = PolygonDataFeed._assemble_bars(chunks)
+        data.attrs["failed_windows"] = failed
+        return data
+
+    async def _fetch_aggregates(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        multiplier: int,
+        timespan: str
+    ) -> Dict[str, np.ndarray]:
+        """Fetch the aggregate bars of one symbol and window as column arrays."""
+        url = (f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/"
+               f"{timespan}/{start.strftime('%Y-%m-%d')}/{end.strftime('%Y-%m-%d')}")
+        params = {"adjusted": "true", "sort": "asc",
+                  "limit": str(PolygonDataFeed.AGGS_LIMIT)}
+
+        # a failed page must fail the window, not truncate it
+        pages = [PolygonDataFeed._parse_aggregates(results)
+                 for results in await self._get_pages(url, params, raise_on_error=True)]
+
+        if not pages:
+            return PolygonDataFeed._parse_aggregates([])
+
+        return {
+            key: np.concatenate([page[key] for page in pages])
+            for key in pages[0]
+        }
+
+    async def get_grouped_daily(
+        self,
+        days: List[date],
+        symbols: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Get the daily bars of every stock for whole days, one concurrent
+        request per day.
+
+        Args:
+            days: Trading days
+            symbols: Keep only these symbols (None = all tickers)
+
+        Returns:
+            DataFrame with OHLCV data, MultiIndex (timestamp, symbol). Days
+            whose request failed are listed in attrs["failed_days"]
+        """
+        responses = await asyncio.gather(*(
+            self._get_json(
+                f"{self.base_url}/v2/aggs/grouped/locale/us/market/stocks/{day:%Y-%m-%d}",
+                params={"adjusted": "true"})
+            for day in days
+        ), return_exceptions=True)
+
+        chunks: Dict[str, List[Dict[str, np.ndarray]]] = {}
+        failed = []
+        for day, response in zip(days, responses):
+            if isinstance(response, Exception) or response is None:
+                logger.error(f"Failed to fetch grouped bars of {day}: {response or 'request failed'}")
+                failed.append(day)
+                continue
+            parsed = PolygonDataFeed._parse_grouped_daily(
+                response.get("results") or [], day, symbols)
+            for symbol, columns in parsed.items():
+                chunks.setdefault(symbol, []).append(columns)
+
+        data = PolygonDataFeed._assemble_bars(chunks)
+        data.attrs["failed_days"] = failed
+        return data
+
+    async def get_latest_prices(self, symbols: List[str]) -> pd.Series:
+        """
+        Get latest prices from bulk snapshots; symbols the snapshots lack
+        fall back to concurrent last-trade requests.
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            Series with symbol -> price
+        """
+        snapshots = await self.get_snapshots(symbols)
+        prices = snapshots["price"].dropna().to_dict() if not snapshots.empty else {}
+
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        responses = await asyncio.gather(*(
+            self._get_json(f"{self.base_url}/v2/last/trade/{symbol}")
+            for symbol in missing
+        ))
+
+        for symbol, response in zip(missing, responses):
+            if response and "results" in response:
+                prices[symbol] = response["results"]["p"]
+
+        return pd.Series({symbol: prices[symbol] for symbol in symbols if symbol in prices})
+
+    async def get_snapshots(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        Get stock snapshots in bulk, one concurrent request per batch of
+        SNAPSHOT_TICKERS symbols.
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            DataFrame indexed by symbol (see PolygonDataFeed.get_snapshots)
+        """
+        size = PolygonDataFeed.SNAPSHOT_TICKERS
+        responses = await asyncio.gather(*(
+            self._get_json(
+                f"{self.base_url}/v2/snapshot/locale/us/markets/stocks/tickers",
+                params={"tickers": ",".join(symbols[i:i + size])})
+            for i in range(0, len(symbols), size)
+        ))
+
+        return PolygonDataFeed._parse_ticker_snapshots(
+            [item for response in responses for item in (response or {}).get("tickers") or []])
+
+    # Options Data
+
+    async def get_options_chain(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get options chain for underlying, following all result pages.
+
+        Args:
+            underlying_symbol: Underlying stock symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type ('call' or 'put')
+
+        Returns:
+            DataFrame with options contracts
+        """
+        params = {"underlying_ticker": underlying_symbol, "limit": "1000"}
+
+        if expiration_date:
+            params["expiration_date"] = expiration_date.strftime("%Y-%m-%d")
+
+        if strike_price:
+            params["strike_price"] = str(strike_price)
+
+        if option_type:
+            params["contract_type"] = option_type
+
+        pages = await self._get_pages(
+            f"{self.base_url}/v3/reference/options/contracts", params)
+
+        if not pages:
+            return pd.DataFrame()
+
+        return PolygonDataFeed._parse_options_contracts(
+            [contract for page in pages for contract in page])
+
+    async def get_options_snapshot(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get the options chain with quotes, greeks and IV in bulk.
+
+        Args:
+            underlying_symbol: Underlying stock symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type ('call' or 'put')
+
+        Returns:
+            DataFrame as returned by PolygonDataFeed.get_options_snapshot
+        """
+        params = {"limit": str(PolygonDataFeed.SNAPSHOT_LIMIT)}
+
+        if expiration_date:
+            params["expiration_date"] = expiration_date.strftime("%Y-%m-%d")
+
+        if strike_price:
+            params["strike_price"] = str(strike_price)
+
+        if option_type:
+            params["contract_type"] = option_type
+
+        pages = await self._get_pages(
+            f"{self.base_url}/v3/snapshot/options/{underlying_symbol}", params)
+
+        return PolygonDataFeed._parse_option_snapshots(
+            [item for page in pages for item in page])
+
+    async def get_option_quotes(self, option_symbols: List[str]) -> pd.DataFrame:
+        """
+        Get snapshots of many option contracts, one concurrent request per
+        batch of SNAPSHOT_LIMIT contracts.
+
+        Args:
+            option_symbols: Option symbols (e.g., "O:AAPL240315C00150000")
+
+        Returns:
+            DataFrame as returned by PolygonDataFeed.get_options_snapshot
+        """
+        size = PolygonDataFeed.SNAPSHOT_LIMIT
+        batches = await asyncio.gather(*(
+            self._get_pages(f"{self.base_url}/v3/snapshot", {
+                "ticker.any_of": ",".join(option_symbols[i:i + size]),
+                "limit": str(size)})
+            for i in range(0, len(option_symbols), size)
+        ))
+
+        return PolygonDataFeed._parse_option_snapshots(
+            [item for pages in batches for page in pages for item in page])
+
+    # News and Sentiment
+
+    async def get_news(
+        self,
+        symbol: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Get latest news.
+
+        Args:
+            symbol: Filter by symbol (None = all news)
+            limit: Number of articles
+
+        Returns:
+            List of news articles
+        """
+        params = {"limit": str(limit), "order": "desc"}
+        if symbol:
+            params["ticker"] = symbol
+
+        response = await self._get_json(f"{self.base_url}/v2/reference/news", params)
+
+        if not response or "results" not in response:
+            return []
+
+        return PolygonDataFeed._parse_news(response["results"])
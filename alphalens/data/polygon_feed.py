@@ -10,7 +10,8 @@ Provides comprehensive market data:
 """
 
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 import pandas as pd
 import numpy as np
 from loguru import logger
@@ -18,16 +19,38 @@ import time
 from functools import lru_cache
 
 from alphalens.data.base import BaseDataFeed
+from alphalens.data.json_codec import loads
+from alphalens.data.rate_limit import get_rate_limiter, backoff_delay, key_id
 from alphalens.assets.option import OptionAsset, OptionType, OptionStyle
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
     logger.warning("Requests not installed")
 
 
+def _lookup(item: Any, path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(item, dict):
+            return None
+        item = item.get(key)
+    return item
+
+
+def _column(items: List[Dict[str, Any]], *path: str) -> np.ndarray:
+    """Numeric field at 'path' of every item (NaN where missing)."""
+    values = [_lookup(item, path) for item in items]
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _text_column(items: List[Dict[str, Any]], *path: str) -> np.ndarray:
+    """Text field at 'path' of every item (None where missing)."""
+    return np.array([_lookup(item, path) for item in items], dtype=object)
+
+
 class PolygonDataFeed(BaseDataFeed):
     """
     Polygon.io data feed - comprehensive market data provider.
@@ -49,12 +72,42 @@ class PolygonDataFeed(BaseDataFeed):
     - Advanced: Unlimited
     """
 
+    # Calls per minute of each account tier
+    RATE_LIMITS = {
+        "free": 5,      # 5 calls per minute
+        "starter": 100,
+        "developer": 1000,
+        "advanced": 10000
+    }
+
+    # Timeframe -> (multiplier, timespan) of the aggregates endpoint
+    TIMEFRAMES = {
+        "1Min": (1, "minute"),
+        "5Min": (5, "minute"),
+        "15Min": (15, "minute"),
+        "1Hour": (1, "hour"),
+        "1Day": (1, "day")
+    }
+
+    # Maximum bars returned by one aggregates request
+    AGGS_LIMIT = 50000
+
+    # Tickers per stock snapshot request, results per options snapshot page
+    SNAPSHOT_TICKERS = 250
+    SNAPSHOT_LIMIT = 250
+
+    # Upper bound of bars per calendar day for each timespan (extended hours
+    # included), used to split long ranges into requests under AGGS_LIMIT
+    BARS_PER_DAY = {"minute": 960, "hour": 16, "day": 1}
+
     def __init__(
         self,
         api_key: str,
         base_url: str = "https://api.polygon.io",
         tier: str = "free",  # free, starter, developer, advanced
-        enable_caching: bool = True
+        enable_caching: bool = True,
+        max_workers: int = 8,
+        rate_limit_path: Optional[str] = None
     ):
         """
         Initialize Polygon data feed.
@@ -64,6 +117,9 @@ class PolygonDataFeed(BaseDataFeed):
             base_url: API base URL
             tier: Account tier (affects rate limits)
             enable_caching: Enable response caching
+            max_workers: Concurrent requests in multi-symbol fetches
+            rate_limit_path: State file shared by every process using this
+                API key (None = limit this process only)
         """
         if not REQUESTS_AVAILABLE:
             raise ImportError("Requests is required. Run: pip install requests")
@@ -79,20 +135,25 @@ class PolygonDataFeed(BaseDataFeed):
         self.base_url = base_url
         self.tier = tier
         self.enable_caching = enable_caching
+        self.max_workers = max(1, max_workers)
 
         # Rate limiting
-        self.rate_limits = {
-            "free": 5,      # 5 calls per minute
-            "starter": 100,
-            "developer": 1000,
-            "advanced": 10000
-        }
+        self.rate_limits = dict(self.RATE_LIMITS)
         self.calls_per_minute = self.rate_limits.get(tier, 5)
-        self.call_timestamps: List[float] = []
-
-        # Session for connection pooling
+        # Shared by all feeds (and, with rate_limit_path, processes) using
+        # the same API key
+        self.rate_limiter = get_rate_limiter(
+            f"polygon:{key_id(api_key)}",
+            self.calls_per_minute,
+            path=rate_limit_path
+        )
+
+        # Session for connection pooling, one connection per worker
         self.session = requests.Session()
         self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         logger.info(f"Polygon feed initialized (tier: {tier}, {self.calls_per_minute} calls/min)")
 
@@ -137,33 +198,32 @@ class PolygonDataFeed(BaseDataFeed):
         Returns:
             Response JSON or None
         """
-        # Rate limiting
-        self._enforce_rate_limit()
-
         # Add API key to params
-        params = params or {}
+        params = dict(params or {})
         params["apiKey"] = self.api_key
 
         for attempt in range(retries):
+            # Rate limiting (retries consume calls too)
+            self._enforce_rate_limit()
+
             try:
                 response = self.session.get(url, params=params, timeout=10)
 
-                # Track call timestamp
-                self.call_timestamps.append(time.time())
-
                 if response.status_code == 200:
-                    return response.json()
+                    self.rate_limiter.update_from_headers(response.headers)
+                    return loads(response.content)
 
                 elif response.status_code == 429:
-                    # Rate limit exceeded
-                    logger.warning("Rate limit exceeded, waiting...")
-                    time.sleep(60)  # Wait 1 minute
+                    # Rate limit exceeded: hold every user of the limiter
+                    delay = backoff_delay(attempt, response.headers)
+                    logger.warning(f"Rate limit exceeded, backing off {delay:.1f}s")
+                    self.rate_limiter.penalize(delay)
                     continue
 
                 elif response.status_code >= 500:
                     # Server error, retry
                     logger.warning(f"Server error {response.status_code}, retrying...")
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    time.sleep(backoff_delay(attempt))
                     continue
 
                 else:
@@ -173,31 +233,20 @@ class PolygonDataFeed(BaseDataFeed):
             except Exception as e:
                 logger.error(f"Request failed: {e}")
                 if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(backoff_delay(attempt))
                     continue
                 return None
 
         return None
 
     def _enforce_rate_limit(self) -> None:
-        """Enforce rate limiting."""
-        now = time.time()
+        """Enforce rate limiting (shared by all threads using this API key)."""
+        wait_time = self.rate_limiter.reserve()
 
-        # Remove timestamps older than 1 minute
-        self.call_timestamps = [
-            ts for ts in self.call_timestamps
-            if now - ts < 60
-        ]
-
-        # Check if we've exceeded limit
-        if len(self.call_timestamps) >= self.calls_per_minute:
-            # Calculate wait time
-            oldest_call = min(self.call_timestamps)
-            wait_time = 60 - (now - oldest_call)
-
-            if wait_time > 0:
+        if wait_time > 0:
+            if wait_time >= 1:
                 logger.info(f"Rate limit reached, waiting {wait_time:.1f}s")
-                time.sleep(wait_time + 0.1)
+            time.sleep(wait_time)
 
     # Stock Data
 
@@ -206,83 +255,440 @@ class PolygonDataFeed(BaseDataFeed):
         symbols: List[str],
         start: datetime,
         end: datetime,
-        timeframe: str = "1Day"
+        timeframe: str = "1Day",
+        max_workers: Optional[int] = None
     ) -> pd.DataFrame:
         """
         Get historical stock data.
 
+        Symbols (and, for long intraday ranges, date windows) are fetched
+        concurrently by a bounded thread pool. All workers draw from the
+        feed's token bucket, so the tier's calls_per_minute is respected.
+        Responses are paginated through 'next_url'.
+
         Args:
             symbols: List of stock symbols
             start: Start date
             end: End date
             timeframe: Timeframe (1Min, 5Min, 1Hour, 1Day)
+            max_workers: Concurrent requests (defaults to the feed setting,
+                1 fetches sequentially)
 
         Returns:
-            DataFrame with OHLCV data
+            DataFrame with OHLCV data. Windows that could not be fetched are
+            listed in attrs["failed_windows"] as (symbol, start, end)
         """
         if not self.connected:
             raise RuntimeError("Not connected to Polygon")
 
         # Map timeframe to Polygon format
-        timeframe_map = {
-            "1Min": (1, "minute"),
-            "5Min": (5, "minute"),
-            "15Min": (15, "minute"),
-            "1Hour": (1, "hour"),
-            "1Day": (1, "day")
+        multiplier, timespan = self.TIMEFRAMES.get(timeframe, (1, "day"))
+
+        tasks = [
+            (symbol, window_start, window_end)
+            for symbol in symbols
+            for window_start, window_end in self._split_range(
+                start, end, multiplier, timespan)
+        ]
+
+        # symbol -> list of column dicts, one per request window
+        chunks: Dict[str, List[Dict[str, np.ndarray]]] = {}
+        failed = []
+
+        workers = min(max_workers or self.max_workers, len(tasks))
+        if workers <= 1:
+            for task in tasks:
+                try:
+                    chunks.setdefault(task[0], []).append(
+                        self._fetch_aggregates(*task, multiplier, timespan))
+                except Exception as e:
+                    logger.error(f"Failed to fetch {task[0]}: {e}")
+                    failed.append(task)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._fetch_aggregates, *task,
+                                    multiplier, timespan): task
+                    for task in tasks
+                }
+                for future in as_completed(futures):
+                    symbol = futures[future][0]
+                    try:
+                        chunks.setdefault(symbol, []).append(future.result())
+                    except Exception as e:
+                        logger.error(f"Failed to fetch {symbol}: {e}")
+                        failed.append(futures[future])
+
+        data = self._assemble_bars(chunks)
+        data.attrs["failed_windows"] = failed
+        return data
+
+    @classmethod
+    def _window_days(cls, multiplier: int, timespan: str) -> int:
+        """Calendar days one aggregates request can return in full."""
+        bars_per_day = cls.BARS_PER_DAY.get(timespan, 1) / multiplier
+        return max(1, int(cls.AGGS_LIMIT // max(bars_per_day, 1)))
+
+    @classmethod
+    def window_days(cls, timeframe: str) -> int:
+        """
+        Longest date range one aggregates request can return in full.
+
+        Args:
+            timeframe: Timeframe (1Min, 5Min, 15Min, 1Hour, 1Day)
+
+        Returns:
+            Number of calendar days
+        """
+        return cls._window_days(*cls.TIMEFRAMES.get(timeframe, (1, "day")))
+
+    @classmethod
+    def _split_range(
+        cls,
+        start: datetime,
+        end: datetime,
+        multiplier: int,
+        timespan: str
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Split a date range into windows small enough for one request each.
+
+        Args:
+            start: Start date
+            end: End date
+            multiplier: Bar size multiplier
+            timespan: Bar timespan (minute, hour, day)
+
+        Returns:
+            List of (start, end) windows, both inclusive
+        """
+        window_days = cls._window_days(multiplier, timespan)
+
+        windows = []
+        window_start = start
+        while window_start.date() <= end.date():
+            window_end = min(window_start + timedelta(days=window_days - 1), end)
+            windows.append((window_start, window_end))
+            window_start = window_start + timedelta(days=window_days)
+
+        return windows
+
+    def _fetch_aggregates(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        multiplier: int,
+        timespan: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Fetch the aggregate bars of one symbol and window, following pages.
+
+        Args:
+            symbol: Stock symbol
+            start: Window start
+            end: Window end
+            multiplier: Bar size multiplier
+            timespan: Bar timespan
+
+        Returns:
+            Dict of column arrays (t, o, h, l, c, v)
+        """
+        url = (f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/"
+               f"{timespan}/{start.strftime('%Y-%m-%d')}/{end.strftime('%Y-%m-%d')}")
+        params = {"adjusted": "true", "sort": "asc", "limit": self.AGGS_LIMIT}
+
+        # a failed page must fail the window, not truncate it
+        pages = [self._parse_aggregates(results)
+                 for results in self._get_pages(url, params, raise_on_error=True)]
+
+        if not pages:
+            return self._parse_aggregates([])
+
+        return {
+            key: np.concatenate([page[key] for page in pages])
+            for key in pages[0]
         }
 
-        multiplier, timespan = timeframe_map.get(timeframe, (1, "day"))
+    def _get_pages(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        raise_on_error: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch the 'results' of every page of a paginated endpoint.
+
+        Args:
+            url: First page URL
+            params: Query parameters of the first page
+            raise_on_error: Raise if a page fails (after retries) instead of
+                returning the pages fetched so far
 
-        all_data = []
+        Returns:
+            List of 'results' lists, one per page
 
-        for symbol in symbols:
-            url = f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start.strftime('%Y-%m-%d')}/{end.strftime('%Y-%m-%d')}"
+        Raises:
+            RuntimeError: If a page fails and raise_on_error is set
+        """
+        pages = []
+        while url:
+            response = self._make_request(url, params=params)
+            if not response:
+                if raise_on_error:
+                    raise RuntimeError(f"Page {len(pages) + 1} of {url.split('?')[0]} failed")
+                break
 
-            response = self._make_request(url, params={"adjusted": "true", "sort": "asc"})
+            if response.get("results"):
+                pages.append(response["results"])
 
-            if response and "results" in response:
-                for bar in response["results"]:
-                    all_data.append({
-                        "timestamp": pd.to_datetime(bar["t"], unit="ms"),
-                        "symbol": symbol,
-                        "open": bar["o"],
-                        "high": bar["h"],
-                        "low": bar["l"],
-                        "close": bar["c"],
-                        "volume": bar["v"]
-                    })
-
-        if not all_data:
+            # next_url carries the cursor and the original query
+            url = response.get("next_url")
+            params = None
+
+        return pages
+
+    @staticmethod
+    def _parse_aggregates(results: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Convert aggregate bars into column arrays.
+
+        Args:
+            results: 'results' list of an aggregates response
+
+        Returns:
+            Dict of column arrays: t (epoch ms), o, h, l, c, v
+        """
+        n = len(results)
+        columns = {"t": np.fromiter((bar["t"] for bar in results),
+                                    dtype=np.int64, count=n)}
+        for key in ("o", "h", "l", "c", "v"):
+            columns[key] = np.fromiter((bar[key] for bar in results),
+                                       dtype=np.float64, count=n)
+        return columns
+
+    @staticmethod
+    def _assemble_bars(chunks: Dict[str, List[Dict[str, np.ndarray]]]) -> pd.DataFrame:
+        """
+        Build the (timestamp, symbol) indexed OHLCV frame from column arrays.
+
+        Args:
+            chunks: symbol -> list of column dicts
+
+        Returns:
+            DataFrame with OHLCV data
+        """
+        columns = {key: [] for key in ("t", "o", "h", "l", "c", "v")}
+        symbols = []
+
+        for symbol, parts in chunks.items():
+            for part in parts:
+                n = len(part["t"])
+                if n == 0:
+                    continue
+                for key in columns:
+                    columns[key].append(part[key])
+                symbols.append(np.full(n, symbol, dtype=object))
+
+        if not symbols:
             logger.warning("No data retrieved")
             return pd.DataFrame()
 
-        df = pd.DataFrame(all_data)
-        df = df.set_index(["timestamp", "symbol"])
+        # one vectorized timestamp conversion for all bars
+        index = pd.MultiIndex.from_arrays(
+            [pd.to_datetime(np.concatenate(columns["t"]), unit="ms"),
+             np.concatenate(symbols)],
+            names=["timestamp", "symbol"]
+        )
+
+        df = pd.DataFrame({
+            "open": np.concatenate(columns["o"]),
+            "high": np.concatenate(columns["h"]),
+            "low": np.concatenate(columns["l"]),
+            "close": np.concatenate(columns["c"]),
+            "volume": np.concatenate(columns["v"]),
+        }, index=index)
+        df = df[~df.index.duplicated(keep="first")]
         df = df.sort_index()
 
         return df
 
+    def get_grouped_daily(
+        self,
+        days: List[date],
+        symbols: Optional[List[str]] = None,
+        max_workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Get the daily bars of every stock for whole days.
+
+        One request per day returns all tickers, which is far cheaper than
+        per-ticker aggregates when many symbols miss the same few days.
+        Days are fetched concurrently.
+
+        Args:
+            days: Trading days
+            symbols: Keep only these symbols (None = all tickers)
+            max_workers: Concurrent requests (defaults to the feed setting)
+
+        Returns:
+            DataFrame with OHLCV data, timestamps as in get_historical_data.
+            Days whose request failed are listed in attrs["failed_days"]
+            (an empty day that did not fail is a market holiday)
+        """
+        if not self.connected:
+            raise RuntimeError("Not connected to Polygon")
+
+        def fetch(day: date) -> Dict[str, Dict[str, np.ndarray]]:
+            response = self._make_request(
+                f"{self.base_url}/v2/aggs/grouped/locale/us/market/stocks/{day:%Y-%m-%d}",
+                params={"adjusted": "true"}
+            )
+            if response is None:
+                raise RuntimeError("request failed")
+            return self._parse_grouped_daily(response.get("results") or [], day, symbols)
+
+        chunks: Dict[str, List[Dict[str, np.ndarray]]] = {}
+        failed = []
+        workers = max(1, min(max_workers or self.max_workers, len(days)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch, day): day for day in days}
+            for future in as_completed(futures):
+                try:
+                    for symbol, columns in future.result().items():
+                        chunks.setdefault(symbol, []).append(columns)
+                except Exception as e:
+                    logger.error(f"Failed to fetch grouped bars of {futures[future]}: {e}")
+                    failed.append(futures[future])
+
+        data = self._assemble_bars(chunks)
+        data.attrs["failed_days"] = sorted(failed)
+        return data
+
+    @staticmethod
+    def _parse_grouped_daily(
+        results: List[Dict[str, Any]],
+        day: date,
+        symbols: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Convert a grouped daily response into per-symbol column arrays.
+
+        The grouped endpoint stamps bars at the session close while the
+        aggregates endpoint uses midnight New York time; bars are restamped
+        to the latter so both sources give the same index.
+
+        Args:
+            results: 'results' list of a grouped daily response
+            day: Day of the response
+            symbols: Keep only these symbols (None = all)
+
+        Returns:
+            symbol -> dict of column arrays (t, o, h, l, c, v)
+        """
+        if symbols is not None:
+            wanted = set(symbols)
+            results = [bar for bar in results if bar.get("T") in wanted]
+
+        columns = PolygonDataFeed._parse_aggregates(results)
+        columns["t"][:] = pd.Timestamp(day).tz_localize("America/New_York").value // 1_000_000
+        return {
+            bar["T"]: {key: values[i:i + 1] for key, values in columns.items()}
+            for i, bar in enumerate(results)
+        }
+
     def get_latest_prices(self, symbols: List[str]) -> pd.Series:
         """
         Get latest prices for symbols.
 
+        Uses the bulk snapshot endpoint (SNAPSHOT_TICKERS symbols per
+        request); symbols missing from the snapshots (e.g. on plans without
+        snapshot access) fall back to one last-trade request each.
+
         Args:
             symbols: List of symbols
 
         Returns:
             Series with symbol -> price
         """
-        prices = {}
+        snapshots = self.get_snapshots(symbols)
+        prices = snapshots["price"].dropna().to_dict() if not snapshots.empty else {}
 
         for symbol in symbols:
+            if symbol in prices:
+                continue
             url = f"{self.base_url}/v2/last/trade/{symbol}"
             response = self._make_request(url)
 
             if response and "results" in response:
                 prices[symbol] = response["results"]["p"]
 
-        return pd.Series(prices)
+        return pd.Series({symbol: prices[symbol] for symbol in symbols if symbol in prices})
+
+    def get_snapshots(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        Get stock snapshots (last trade, quote, day bar) in bulk.
+
+        Batches of SNAPSHOT_TICKERS symbols are fetched concurrently.
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            DataFrame indexed by symbol with price, bid, ask, bid_size,
+            ask_size, open, high, low, close, volume, prev_close, updated
+        """
+        batches = [symbols[i:i + self.SNAPSHOT_TICKERS]
+                   for i in range(0, len(symbols), self.SNAPSHOT_TICKERS)]
+        if not batches:
+            return pd.DataFrame()
+
+        def fetch(batch: List[str]) -> List[Dict[str, Any]]:
+            response = self._make_request(
+                f"{self.base_url}/v2/snapshot/locale/us/markets/stocks/tickers",
+                params={"tickers": ",".join(batch)}
+            )
+            return (response or {}).get("tickers") or []
+
+        workers = max(1, min(self.max_workers, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tickers = [item for result in executor.map(fetch, batches) for item in result]
+
+        return self._parse_ticker_snapshots(tickers)
+
+    @staticmethod
+    def _parse_ticker_snapshots(tickers: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Convert stock snapshot results into a columnar frame.
+
+        Args:
+            tickers: 'tickers' list of a snapshot response
+
+        Returns:
+            DataFrame indexed by symbol
+        """
+        if not tickers:
+            return pd.DataFrame()
+
+        # last trade, else the latest minute bar, else the day bar
+        price = _column(tickers, "lastTrade", "p")
+        for path in (("min", "c"), ("day", "c")):
+            price = np.where(np.isnan(price), _column(tickers, *path), price)
+
+        return pd.DataFrame({
+            "price": price,
+            "bid": _column(tickers, "lastQuote", "p"),
+            "ask": _column(tickers, "lastQuote", "P"),
+            "bid_size": _column(tickers, "lastQuote", "s"),
+            "ask_size": _column(tickers, "lastQuote", "S"),
+            "open": _column(tickers, "day", "o"),
+            "high": _column(tickers, "day", "h"),
+            "low": _column(tickers, "day", "l"),
+            "close": _column(tickers, "day", "c"),
+            "volume": _column(tickers, "day", "v"),
+            "prev_close": _column(tickers, "prevDay", "c"),
+            "updated": pd.to_datetime(_column(tickers, "updated"), unit="ns"),
+        }, index=pd.Index(_text_column(tickers, "ticker"), name="symbol"))
 
     def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -347,23 +753,155 @@ class PolygonDataFeed(BaseDataFeed):
         if option_type:
             params["contract_type"] = option_type
 
-        response = self._make_request(url, params=params)
+        pages = self._get_pages(url, params=params)
 
-        if not response or "results" not in response:
+        if not pages:
             return pd.DataFrame()
 
-        options = []
-        for contract in response["results"]:
-            options.append({
-                "ticker": contract["ticker"],
-                "underlying": contract["underlying_ticker"],
-                "strike": contract["strike_price"],
-                "expiry": pd.to_datetime(contract["expiration_date"]),
-                "type": contract["contract_type"],
-                "shares_per_contract": contract.get("shares_per_contract", 100)
-            })
+        return self._parse_options_contracts(
+            [contract for page in pages for contract in page])
+
+    @staticmethod
+    def _parse_options_contracts(results: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Convert options contracts reference results into a columnar frame.
+
+        Args:
+            results: 'results' list of a contracts response
+
+        Returns:
+            DataFrame with options contracts
+        """
+        if not results:
+            return pd.DataFrame()
+
+        shares = _column(results, "shares_per_contract")
+
+        return pd.DataFrame({
+            "ticker": _text_column(results, "ticker"),
+            "underlying": _text_column(results, "underlying_ticker"),
+            "strike": _column(results, "strike_price"),
+            "expiry": pd.to_datetime(_text_column(results, "expiration_date")),
+            "type": _text_column(results, "contract_type"),
+            "shares_per_contract": np.where(np.isnan(shares), 100, shares),
+        })
+
+    def get_options_snapshot(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get the options chain with quotes, greeks and IV in bulk.
+
+        The chain snapshot returns SNAPSHOT_LIMIT contracts per page, so a
+        1,000-contract chain takes 4 requests instead of one per contract.
+
+        Args:
+            underlying_symbol: Underlying stock symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type ('call' or 'put')
+
+        Returns:
+            DataFrame with the get_options_chain columns plus quotes,
+            greeks and implied volatility
+        """
+        params = {"limit": self.SNAPSHOT_LIMIT}
+
+        if expiration_date:
+            params["expiration_date"] = expiration_date.strftime("%Y-%m-%d")
+
+        if strike_price:
+            params["strike_price"] = strike_price
+
+        if option_type:
+            params["contract_type"] = option_type
+
+        pages = self._get_pages(
+            f"{self.base_url}/v3/snapshot/options/{underlying_symbol}", params)
+
+        return self._parse_option_snapshots([item for page in pages for item in page])
+
+    def get_option_quotes(self, option_symbols: List[str]) -> pd.DataFrame:
+        """
+        Get snapshots of many option contracts in bulk.
 
-        return pd.DataFrame(options)
+        Uses the universal snapshot endpoint, SNAPSHOT_LIMIT contracts per
+        request, batches fetched concurrently.
+
+        Args:
+            option_symbols: Option symbols (e.g., "O:AAPL240315C00150000")
+
+        Returns:
+            DataFrame as returned by get_options_snapshot
+        """
+        batches = [option_symbols[i:i + self.SNAPSHOT_LIMIT]
+                   for i in range(0, len(option_symbols), self.SNAPSHOT_LIMIT)]
+        if not batches:
+            return pd.DataFrame()
+
+        def fetch(batch: List[str]) -> List[Dict[str, Any]]:
+            pages = self._get_pages(
+                f"{self.base_url}/v3/snapshot",
+                params={"ticker.any_of": ",".join(batch), "limit": self.SNAPSHOT_LIMIT}
+            )
+            return [item for page in pages for item in page]
+
+        workers = max(1, min(self.max_workers, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            items = [item for result in executor.map(fetch, batches) for item in result]
+
+        return self._parse_option_snapshots(items)
+
+    @staticmethod
+    def _parse_option_snapshots(items: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Convert option snapshot results into a columnar frame.
+
+        Handles both the chain snapshot and the universal snapshot (which
+        reports the session instead of the day and the ticker at top level).
+
+        Args:
+            items: 'results' of option snapshot responses
+
+        Returns:
+            DataFrame with one row per contract
+        """
+        if not items:
+            return pd.DataFrame()
+
+        ticker = _text_column(items, "details", "ticker")
+        top_ticker = _text_column(items, "ticker")
+        ticker = np.where(pd.isnull(ticker), top_ticker, ticker)
+
+        volume = _column(items, "day", "volume")
+        volume = np.where(np.isnan(volume), _column(items, "session", "volume"), volume)
+
+        shares = _column(items, "details", "shares_per_contract")
+
+        return pd.DataFrame({
+            "ticker": ticker,
+            "underlying": _text_column(items, "underlying_asset", "ticker"),
+            "strike": _column(items, "details", "strike_price"),
+            "expiry": pd.to_datetime(_text_column(items, "details", "expiration_date")),
+            "type": _text_column(items, "details", "contract_type"),
+            "shares_per_contract": np.where(np.isnan(shares), 100, shares),
+            "bid": _column(items, "last_quote", "bid"),
+            "ask": _column(items, "last_quote", "ask"),
+            "mid": _column(items, "last_quote", "midpoint"),
+            "last": _column(items, "last_trade", "price"),
+            "volume": volume,
+            "open_interest": _column(items, "open_interest"),
+            "implied_volatility": _column(items, "implied_volatility"),
+            "delta": _column(items, "greeks", "delta"),
+            "gamma": _column(items, "greeks", "gamma"),
+            "theta": _column(items, "greeks", "theta"),
+            "vega": _column(items, "greeks", "vega"),
+            "underlying_price": _column(items, "underlying_asset", "price"),
+        })
 
     def get_option_quote(self, option_symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -422,37 +960,32 @@ class PolygonDataFeed(BaseDataFeed):
         Returns:
             DataFrame with OHLCV data
         """
-        timeframe_map = {
-            "1Min": (1, "minute"),
-            "5Min": (5, "minute"),
-            "1Hour": (1, "hour"),
-            "1Day": (1, "day")
-        }
+        multiplier, timespan = self.TIMEFRAMES.get(timeframe, (1, "day"))
+        ticker = f"X:{from_currency}{to_currency}"
 
-        multiplier, timespan = timeframe_map.get(timeframe, (1, "day"))
-
-        url = f"{self.base_url}/v2/aggs/ticker/X:{from_currency}{to_currency}/range/{multiplier}/{timespan}/{start.strftime('%Y-%m-%d')}/{end.strftime('%Y-%m-%d')}"
-
-        response = self._make_request(url, params={"adjusted": "true", "sort": "asc"})
+        parts = []
+        for window_start, window_end in self._split_range(start, end, multiplier, timespan):
+            try:
+                parts.append(self._fetch_aggregates(ticker, window_start, window_end,
+                                                    multiplier, timespan))
+            except Exception as e:
+                logger.error(f"Failed to fetch {ticker}: {e}")
 
-        if not response or "results" not in response:
+        parts = [part for part in parts if len(part["t"])]
+        if not parts:
             return pd.DataFrame()
 
-        data = []
-        for bar in response["results"]:
-            data.append({
-                "timestamp": pd.to_datetime(bar["t"], unit="ms"),
-                "open": bar["o"],
-                "high": bar["h"],
-                "low": bar["l"],
-                "close": bar["c"],
-                "volume": bar["v"]
-            })
+        columns = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
 
-        df = pd.DataFrame(data)
-        df = df.set_index("timestamp")
+        df = pd.DataFrame({
+            "open": columns["o"],
+            "high": columns["h"],
+            "low": columns["l"],
+            "close": columns["c"],
+            "volume": columns["v"],
+        }, index=pd.DatetimeIndex(pd.to_datetime(columns["t"], unit="ms"), name="timestamp"))
 
-        return df
+        return df[~df.index.duplicated(keep="first")]
 
     # Technical Indicators
 
@@ -528,8 +1061,21 @@ class PolygonDataFeed(BaseDataFeed):
         if not response or "results" not in response:
             return []
 
+        return self._parse_news(response["results"])
+
+    @staticmethod
+    def _parse_news(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert news results into article dictionaries.
+
+        Args:
+            results: 'results' list of a news response
+
+        Returns:
+            List of news articles
+        """
         articles = []
-        for article in response["results"]:
+        for article in results:
             articles.append({
                 "id": article["id"],
                 "title": article["title"],
@@ -12,9 +12,13 @@ Supports streaming:
 from typing import Dict, Any, List, Callable, Optional
 import json
 import time
-from threading import Thread
+from threading import Event, Thread
+import pandas as pd
 from loguru import logger
 
+from alphalens.data.rate_limit import backoff_delay
+from alphalens.data.stream_pipeline import MessagePipeline
+
 try:
     import websocket
     WEBSOCKET_AVAILABLE = True
@@ -32,12 +36,32 @@ class PolygonWebSocketClient:
     - Q.*: Quotes (bid/ask)
     - A.*: Aggregates (minute bars)
     - AM.*: Aggregates (minute bars)
+
+    By default callbacks run on the socket thread. With pipeline=True raw
+    frames are queued to a MessagePipeline instead (batch decoding, worker
+    pool, per-symbol ordering), so slow callbacks no longer stall the socket.
+
+    When the connection drops (anything but disconnect()), the client
+    reconnects with exponential backoff, re-authenticates and resubscribes
+    every channel in 'subscriptions'. With a rest_feed, the whole minutes
+    missed meanwhile are fetched as REST aggregates and delivered as AM
+    messages (marked "backfill": True) to the AM handlers and subscribers,
+    so streaming bar state (e.g. a BarAggregator) stays continuous.
     """
 
     def __init__(
         self,
         api_key: str,
-        cluster: str = "stocks"  # stocks, options, forex, crypto
+        cluster: str = "stocks",  # stocks, options, forex, crypto
+        pipeline: bool = False,
+        buffer_size: int = 10000,
+        workers: int = 4,
+        backpressure: str = "drop_oldest",
+        reconnect: bool = True,
+        max_backoff: float = 30.0,
+        rest_feed: Optional[Any] = None,
+        url: Optional[str] = None,
+        ping_interval: float = 20.0
     ):
         """
         Initialize WebSocket client.
@@ -45,13 +69,22 @@ class PolygonWebSocketClient:
         Args:
             api_key: Polygon API key
             cluster: Data cluster (stocks, options, forex, crypto)
+            pipeline: Handle messages through a MessagePipeline
+            buffer_size: Pipeline queue capacity
+            workers: Pipeline worker threads
+            backpressure: Pipeline policy ("drop_oldest", "conflate", "block")
+            reconnect: Reconnect and resubscribe when the connection drops
+            max_backoff: Longest delay between reconnect attempts, seconds
+            rest_feed: PolygonDataFeed used to backfill missed minute bars
+            url: WebSocket URL (defaults to the Polygon cluster)
+            ping_interval: Seconds between keep-alive pings (0 = none)
         """
         if not WEBSOCKET_AVAILABLE:
             raise ImportError("websocket-client required. Run: pip install websocket-client")
 
         self.api_key = api_key
         self.cluster = cluster
-        self.ws_url = f"wss://socket.polygon.io/{cluster}"
+        self.ws_url = url or f"wss://socket.polygon.io/{cluster}"
 
         self.ws: Optional[websocket.WebSocketApp] = None
         self.connected = False
@@ -61,10 +94,30 @@ class PolygonWebSocketClient:
         # Subscriptions and callbacks
         self.subscriptions: Dict[str, List[Callable]] = {}
         self.message_handlers: Dict[str, List[Callable]] = {}
+        self.frame_listeners: List[Callable[[str], None]] = []
+
+        self.pipeline: Optional[MessagePipeline] = None
+        if pipeline:
+            self.pipeline = MessagePipeline(
+                self._process_message,
+                buffer_size=buffer_size,
+                workers=workers,
+                policy=backpressure
+            )
+
+        # Session management
+        self.reconnect = reconnect
+        self.max_backoff = max_backoff
+        self.rest_feed = rest_feed
+        self.ping_interval = ping_interval
+        self._closing = Event()
+        self._outage_start: Optional[float] = None
 
         # Statistics
         self.messages_received = 0
         self.last_message_time = None
+        self.reconnects = 0
+        self.backfilled_bars = 0
 
     def connect(self) -> bool:
         """
@@ -74,13 +127,11 @@ class PolygonWebSocketClient:
             True if connected successfully
         """
         try:
-            self.ws = websocket.WebSocketApp(
-                self.ws_url,
-                on_open=self._on_open,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close
-            )
+            if self.pipeline:
+                self.pipeline.start()
+
+            self._closing.clear()
+            self.ws = self._create_app()
 
             # Run in background thread
             self.thread = Thread(target=self._run_forever, daemon=True)
@@ -104,20 +155,58 @@ class PolygonWebSocketClient:
             return False
 
     def disconnect(self) -> None:
-        """Disconnect from WebSocket."""
+        """Disconnect from WebSocket (no reconnect)."""
+        self._closing.set()
         if self.ws:
             self.ws.close()
             self.connected = False
             self.authenticated = False
             logger.info("Disconnected from Polygon WebSocket")
 
+        if self.pipeline:
+            self.pipeline.stop()
+
+    def _create_app(self) -> "websocket.WebSocketApp":
+        return websocket.WebSocketApp(
+            self.ws_url,
+            on_open=self._on_open,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close
+        )
+
     def _run_forever(self) -> None:
-        """Run WebSocket in background thread."""
-        try:
-            self.ws.run_forever()
-        except Exception as e:
-            logger.error(f"WebSocket error: {e}")
+        """Run WebSocket in background thread, reconnecting when it drops."""
+        attempt = 0
+        while True:
+            try:
+                if self.ping_interval:
+                    self.ws.run_forever(ping_interval=self.ping_interval,
+                                        ping_timeout=min(10.0, self.ping_interval / 2))
+                else:
+                    self.ws.run_forever()
+            except Exception as e:
+                logger.error(f"WebSocket error: {e}")
+
+            was_authenticated = self.authenticated
             self.connected = False
+            self.authenticated = False
+
+            if self._closing.is_set() or not self.reconnect:
+                return
+
+            if self._outage_start is None:
+                self._outage_start = self.last_message_time or time.time()
+
+            # a session that got as far as authenticating resets the backoff
+            attempt = 0 if was_authenticated else attempt + 1
+            delay = backoff_delay(attempt, base=0.5, cap=self.max_backoff)
+            logger.warning(f"WebSocket connection lost, reconnecting in {delay:.1f}s")
+            if self._closing.wait(delay):
+                return
+
+            self.reconnects += 1
+            self.ws = self._create_app()
 
     def _on_open(self, ws) -> None:
         """Handle connection opened."""
@@ -136,6 +225,13 @@ class PolygonWebSocketClient:
         self.messages_received += 1
         self.last_message_time = time.time()
 
+        for listener in self.frame_listeners:
+            listener(message)
+
+        if self.pipeline:
+            self.pipeline.put(message)
+            return
+
         try:
             data = json.loads(message)
 
@@ -158,6 +254,8 @@ class PolygonWebSocketClient:
             if msg.get("status") == "auth_success":
                 self.authenticated = True
                 logger.info("WebSocket authenticated")
+                if self._outage_start is not None:
+                    self._resume()
             elif msg.get("status") == "auth_failed":
                 logger.error("WebSocket authentication failed")
                 self.disconnect()
@@ -184,6 +282,66 @@ class PolygonWebSocketClient:
                         except Exception as e:
                             logger.error(f"Callback error: {e}")
 
+    def _resume(self) -> None:
+        """Resubscribe after a reconnect and backfill the outage."""
+        outage_start, self._outage_start = self._outage_start, None
+
+        if self.subscriptions:
+            params = ",".join(key.replace(":", ".", 1) for key in self.subscriptions)
+            self.ws.send(json.dumps({"action": "subscribe", "params": params}))
+            logger.info(f"Resubscribed {len(self.subscriptions)} channels")
+
+        if self.rest_feed is not None:
+            Thread(target=self._backfill, args=(outage_start, time.time()), daemon=True).start()
+
+    def _backfill(self, start: float, end: float) -> None:
+        """
+        Deliver the whole minutes between 'start' and 'end' from REST.
+
+        The minutes holding 'start' and 'end' were partly streamed, so only
+        the minutes strictly between them are delivered.
+
+        Args:
+            start: Last message time before the outage (epoch seconds)
+            end: Reconnect time (epoch seconds)
+        """
+        symbols = sorted({key.split(":", 1)[1] for key in self.subscriptions})
+        first = (int(start) // 60 + 1) * 60 * 1000
+        last = (int(end) // 60) * 60 * 1000
+        if not symbols or first >= last:
+            return
+
+        try:
+            bars = self.rest_feed.get_historical_data(
+                symbols, pd.Timestamp(first, unit="ms").to_pydatetime(),
+                pd.Timestamp(last, unit="ms").to_pydatetime(), timeframe="1Min")
+        except Exception as e:
+            logger.error(f"Backfill failed: {e}")
+            return
+
+        if bars is None or bars.empty:
+            return
+
+        starts = bars.index.get_level_values("timestamp").values.astype("datetime64[ms]").astype("int64")
+        keep = (starts >= first) & (starts < last)
+        bars = bars[keep]
+        messages = [
+            {"ev": "AM", "sym": symbol, "o": o, "h": h, "l": lo, "c": c, "v": v,
+             "s": int(t), "e": int(t) + 60000, "backfill": True}
+            for (_, symbol), t, o, h, lo, c, v in zip(
+                bars.index, starts[keep], bars["open"], bars["high"], bars["low"],
+                bars["close"], bars["volume"])
+        ]
+
+        if self.pipeline:
+            self.pipeline.put_messages(messages)
+        else:
+            for msg in messages:
+                self._process_message(msg)
+
+        self.backfilled_bars += len(messages)
+        logger.info(f"Backfilled {len(messages)} bars for {len(symbols)} symbols")
+
     def _on_error(self, ws, error) -> None:
         """Handle WebSocket error."""
         logger.error(f"WebSocket error: {error}")
@@ -345,16 +503,45 @@ class PolygonWebSocketClient:
             self.message_handlers[event_type] = []
         self.message_handlers[event_type].append(handler)
 
+    def add_frame_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a listener for raw frames (e.g. StreamRecorder.put).
+
+        Listeners run on the socket thread before decoding, so they must
+        only queue the frame.
+
+        Args:
+            listener: Called with each raw frame
+        """
+        self.frame_listeners.append(listener)
+
+    def remove_frame_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Remove a raw frame listener.
+
+        Args:
+            listener: Listener passed to add_frame_listener
+        """
+        if listener in self.frame_listeners:
+            self.frame_listeners.remove(listener)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get client statistics."""
-        return {
+        stats = {
             "connected": self.connected,
             "authenticated": self.authenticated,
             "messages_received": self.messages_received,
             "last_message_time": self.last_message_time,
-            "active_subscriptions": len(self.subscriptions)
+            "active_subscriptions": len(self.subscriptions),
+            "reconnects": self.reconnects,
+            "backfilled_bars": self.backfilled_bars
         }
 
+        if self.pipeline:
+            stats["pipeline"] = self.pipeline.get_stats()
+
+        return stats
+
 
 # Example usage
 if __name__ == "__main__":
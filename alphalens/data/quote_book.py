@@ -0,0 +1,232 @@
+"""
+Conflated latest-quote book.
+
+Keeps only the latest bid/ask/last trade per symbol, in array columns
+indexed by a symbol id, fed by stream callbacks (Polygon WebSocket quotes
+and trades, Alpaca real-time bars).
+
+Writers serialize on a lock and bump a sequence number before and after
+each update (a seqlock). Readers never take the lock: they copy what they
+need and retry if the sequence changed meanwhile, so a reader never stalls
+the socket thread writing quotes.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from alphalens.data.stream_pipeline import message_symbol
+
+_Columns = Tuple[np.ndarray, ...]
+
+# column positions
+_BID, _ASK, _LAST, _QUOTED, _TRADED = range(5)
+
+
+class QuoteBook:
+    """
+    Latest bid/ask/last per symbol with lock-free snapshot reads.
+
+    Usage:
+        book = QuoteBook()
+        client.register_handler("Q", book.on_message)
+        alpaca.subscribe_realtime(symbols, book.on_bar)
+        prices = book.get_latest_prices(["AAPL"], max_age=2.0)
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize quote book.
+
+        Args:
+            capacity: Initial number of symbols (grows as needed)
+        """
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._columns: _Columns = self._allocate(max(1, capacity))
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+        self.updates = 0
+        self.retries = 0
+
+    @staticmethod
+    def _allocate(capacity: int) -> _Columns:
+        # bid, ask, last, quote and trade times (epoch seconds, NaN = never)
+        return tuple(np.full(capacity, np.nan) for _ in range(5))
+
+    # Writers
+
+    def _write(self, symbol: str, values: Dict[int, float], stamp: int, updated: Optional[float]) -> None:
+        with self._lock:
+            self._sequence += 1  # odd: write in progress
+            i = self._ids.get(symbol)
+            if i is None:
+                i = self._ids[symbol] = len(self._symbols)
+                self._symbols.append(symbol)
+                if i >= len(self._columns[0]):
+                    grown = self._allocate(2 * len(self._columns[0]))
+                    for old, new in zip(self._columns, grown):
+                        new[:len(old)] = old
+                    # readers holding the old columns still see a consistent copy
+                    self._columns = grown
+
+            columns = self._columns
+            for column, value in values.items():
+                columns[column][i] = value
+            columns[stamp][i] = time.time() if updated is None else updated
+            self._sequence += 1
+            self.updates += 1
+
+    def update_quote(
+        self,
+        symbol: str,
+        bid: float,
+        ask: float,
+        updated: Optional[float] = None
+    ) -> None:
+        """
+        Set the latest quote of a symbol.
+
+        Args:
+            symbol: Symbol
+            bid: Bid price
+            ask: Ask price
+            updated: Receive time in epoch seconds (None = now)
+        """
+        self._write(symbol, {_BID: bid, _ASK: ask}, _QUOTED, updated)
+
+    def update_trade(self, symbol: str, price: float, updated: Optional[float] = None) -> None:
+        """
+        Set the latest trade (or bar close) of a symbol.
+
+        Args:
+            symbol: Symbol
+            price: Trade price
+            updated: Receive time in epoch seconds (None = now)
+        """
+        self._write(symbol, {_LAST: price}, _TRADED, updated)
+
+    def on_message(self, msg: Dict[str, Any]) -> None:
+        """
+        Update from a Polygon WebSocket message (Q, T, A or AM events).
+
+        Aggregates are stamped with their end time; backfilled ones are
+        ignored.
+
+        Args:
+            msg: Polygon WebSocket message
+        """
+        event = msg.get("ev")
+        symbol = message_symbol(msg)
+        if symbol is None:
+            return
+
+        if event in ("Q", "XQ"):
+            self.update_quote(symbol, msg.get("bp", np.nan), msg.get("ap", np.nan))
+        elif event in ("T", "XT"):
+            self.update_trade(symbol, msg["p"])
+        elif event in ("A", "AM", "XA"):
+            if msg.get("backfill"):
+                return  # REST bars replayed after a reconnect, minutes old
+            # an aggregate's price is as of its end time (ms), not receipt
+            end = msg.get("e")
+            self.update_trade(symbol, msg["c"], None if end is None else end / 1000.0)
+
+    def on_bar(self, bar: Dict[str, Any]) -> None:
+        """
+        Update from an AlpacaDataFeed.subscribe_realtime bar.
+
+        Args:
+            bar: Bar dict with 'symbol' and 'close'
+        """
+        self.update_trade(bar["symbol"], bar["close"])
+
+    # Readers
+
+    def _read(self, symbols: Optional[List[str]]) -> Tuple[List[str], np.ndarray]:
+        """Consistent copy of the rows of 'symbols' (known ones only)."""
+        while True:
+            sequence = self._sequence
+            if sequence % 2 == 0:
+                columns = self._columns
+                if symbols is None:
+                    names = self._symbols[:len(self._ids)]
+                else:
+                    names = [symbol for symbol in symbols if symbol in self._ids]
+                rows = np.fromiter((self._ids[name] for name in names), dtype=np.int64, count=len(names))
+                # a symbol added since 'columns' was taken means a retry anyway
+                if not len(rows) or rows.max() < len(columns[0]):
+                    values = np.stack([column[rows] for column in columns], axis=1)
+                    if self._sequence == sequence:
+                        return names, values
+            self.retries += 1
+            time.sleep(0)
+
+    def snapshot(self, symbols: Optional[List[str]] = None, max_age: Optional[float] = None) -> pd.DataFrame:
+        """
+        Copy of the book.
+
+        Quotes and trades age separately: price is the mid while the quote
+        is within 'max_age', else the last price while the trade is, so a
+        fresh trade never makes an old quote look fresh.
+
+        Args:
+            symbols: Symbols to read (None = all)
+            max_age: Staleness bound in seconds for price (None = none)
+
+        Returns:
+            DataFrame indexed by symbol with bid, ask, last, mid,
+            quote_age, trade_age (seconds), price (NaN if stale) and the
+            age of that price
+        """
+        names, values = self._read(symbols)
+        bid, ask, last, quoted_at, traded_at = values.T
+
+        now = time.time()
+        quote_age = now - quoted_at
+        trade_age = now - traded_at
+        mid = np.where((bid > 0) & (ask > 0), (bid + ask) / 2, np.nan)
+
+        bound = np.inf if max_age is None else max_age
+        use_mid = ~np.isnan(mid) & (quote_age <= bound)
+        use_last = ~use_mid & ~np.isnan(last) & (trade_age <= bound)
+
+        return pd.DataFrame({
+            "bid": bid,
+            "ask": ask,
+            "last": last,
+            "mid": mid,
+            "quote_age": quote_age,
+            "trade_age": trade_age,
+            "price": np.where(use_mid, mid, np.where(use_last, last, np.nan)),
+            "age": np.where(use_mid, quote_age, np.where(use_last, trade_age, np.nan)),
+        }, index=pd.Index(names, name="symbol"))
+
+    def get_latest_prices(self, symbols: List[str], max_age: float = 2.0) -> pd.Series:
+        """
+        Latest prices updated within 'max_age' seconds.
+
+        Args:
+            symbols: List of symbols
+            max_age: Staleness bound in seconds
+
+        Returns:
+            Series with symbol -> price (stale or unknown symbols left out)
+        """
+        return self.snapshot(symbols, max_age)["price"].dropna()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get quote book statistics."""
+        return {
+            "symbols": len(self),
+            "capacity": len(self._columns[0]),
+            "updates": self.updates,
+            "read_retries": self.retries,
+        }
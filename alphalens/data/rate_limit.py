@@ -0,0 +1,390 @@
+"""
+Rate limiting for data feed API calls.
+
+A token bucket refills continuously at the allowed call rate and holds at
+most 'capacity' tokens (the burst size). Every request takes one token;
+when the bucket is empty the caller waits until a token is refilled.
+
+Limiters are shared:
+- across threads: every operation is O(1) under a lock, callers sleep
+  outside of it
+- across feeds: get_rate_limiter() returns one limiter per name (e.g. per
+  API key), so several feed instances draw from the same budget
+- across processes: FileTokenBucket keeps the bucket state in a small file
+  updated under an exclusive file lock (POSIX only)
+
+When the server signals throttling (HTTP 429), backoff_delay() derives the
+wait from the Retry-After / X-RateLimit-Reset headers, falling back to
+jittered exponential backoff, and penalize() holds every caller of the
+bucket for that long.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+import hashlib
+import os
+import random
+import threading
+import time
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Callers reserve their token under a lock and sleep outside of it, so
+    concurrent threads are served in arrival order and each acquire is O(1).
+    The token count goes negative while callers are queued.
+    """
+
+    def __init__(self, calls_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            calls_per_minute: Sustained call rate
+            capacity: Burst size (defaults to one minute worth of calls)
+        """
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive")
+
+        self.calls_per_minute = calls_per_minute
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else calls_per_minute)
+
+        self._tokens = self.capacity
+        self._last = self._now()
+        self._lock = threading.Lock()
+
+        # Metrics (this process only)
+        self._stats_lock = threading.Lock()
+        self._calls = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._throttled = 0
+
+    # Storage, overridden by shared backends
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            yield
+
+    def _load(self):
+        return self._tokens, self._last
+
+    def _store(self, tokens: float, last: float) -> None:
+        self._tokens = tokens
+        self._last = last
+
+    def _apply(self, update) -> float:
+        """
+        Refill the bucket and apply 'update' (tokens -> tokens) atomically.
+
+        Returns:
+            Token count after the update
+        """
+        with self._locked():
+            tokens, last = self._load()
+            now = self._now()
+            tokens = min(self.capacity, tokens + max(0.0, now - last) * self.rate)
+            tokens = update(tokens)
+            self._store(tokens, now)
+        return tokens
+
+    # Public interface
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens without waiting.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds the caller must wait before using them
+        """
+        remaining = self._apply(lambda t: t - tokens)
+        wait = max(0.0, -remaining / self.rate)
+        self._record(wait)
+        return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, sleeping until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Hold all callers for 'seconds' (e.g. after the server throttled us).
+
+        Args:
+            seconds: Time until the next token is available
+        """
+        with self._stats_lock:
+            self._throttled += 1
+        self._apply(lambda t: min(t, -seconds * self.rate))
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Align the bucket with the server's own accounting.
+
+        Uses X-RateLimit-Remaining (never hold more tokens than the server
+        grants) and X-RateLimit-Reset (when nothing remains, wait for the
+        reset).
+
+        Args:
+            headers: Response headers
+        """
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        if remaining is None:
+            return
+
+        if remaining <= 0:
+            delay = _reset_delay(headers)
+            if delay:
+                self.penalize(delay)
+            return
+
+        self._apply(lambda t: min(t, remaining))
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the bucket (negative when callers are queued)."""
+        return self._apply(lambda t: t)
+
+    def _record(self, wait: float) -> None:
+        with self._stats_lock:
+            self._calls += 1
+            if wait > 0:
+                self._waits += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter metrics.
+
+        Returns:
+            Dictionary with call, wait and throttling counters
+        """
+        with self._stats_lock:
+            calls = self._calls
+            stats = {
+                "calls": calls,
+                "waits": self._waits,
+                "total_wait": self._total_wait,
+                "max_wait": self._max_wait,
+                "avg_wait": self._total_wait / calls if calls else 0.0,
+                "throttled": self._throttled,
+            }
+        stats.update({
+            "calls_per_minute": self.calls_per_minute,
+            "capacity": self.capacity,
+            "tokens": self.available,
+        })
+        return stats
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket shared by every process using the same state file.
+
+    The state (token count and last refill wall-clock time) is read and
+    written under an exclusive flock, so the bucket stays O(1) per call.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        calls_per_minute: float,
+        capacity: Optional[float] = None
+    ):
+        """
+        Initialize file-backed token bucket.
+
+        Args:
+            path: State file (created if missing); processes sharing an
+                API key must use the same path
+            calls_per_minute: Sustained call rate
+            capacity: Burst size (defaults to one minute worth of calls)
+        """
+        if not FCNTL_AVAILABLE:
+            raise ImportError("FileTokenBucket requires fcntl (POSIX)")
+
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        super().__init__(calls_per_minute, capacity)
+
+    def _now(self) -> float:
+        # wall clock: comparable across processes
+        return time.time()
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _load(self):
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        raw = os.read(self._fd, 64).split()
+        if len(raw) != 2:
+            # new file: start full
+            return self.capacity, self._now()
+        return float(raw[0]), float(raw[1])
+
+    def _store(self, tokens: float, last: float) -> None:
+        data = f"{tokens!r} {last!r}".encode()
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.ftruncate(self._fd, 0)
+        os.write(self._fd, data)
+
+    def close(self) -> None:
+        """Close the state file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _header_float(headers: Optional[Mapping[str, str]], name: str) -> Optional[float]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _reset_delay(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Seconds until X-RateLimit-Reset (epoch seconds or delta seconds)."""
+    reset = _header_float(headers, "X-RateLimit-Reset")
+    if reset is None:
+        return None
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+def backoff_delay(
+    attempt: int,
+    headers: Optional[Mapping[str, str]] = None,
+    base: float = 1.0,
+    cap: float = 60.0
+) -> float:
+    """
+    Delay before retrying a throttled or failed request.
+
+    Honours Retry-After (seconds or HTTP date) or X-RateLimit-Reset when the
+    server sends them, plus a little jitter so that waiting clients do not
+    retry in lockstep. Without headers uses "full jitter" exponential
+    backoff: uniform(0, min(cap, base * 2 ** attempt)).
+
+    Args:
+        attempt: Retry attempt (0 for the first retry)
+        headers: Response headers
+        base: Base delay in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    delay = None
+
+    if headers:
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after).timestamp()
+                             - time.time())
+                except (TypeError, ValueError):
+                    delay = None
+
+        if delay is None:
+            delay = _reset_delay(headers)
+
+    if delay is not None:
+        delay = max(0.0, min(delay, cap))
+        return delay + random.uniform(0, min(1.0, 0.1 * delay + 0.1))
+
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+_registry: Dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    name: str,
+    calls_per_minute: float,
+    capacity: Optional[float] = None,
+    path: Optional[str] = None
+) -> TokenBucket:
+    """
+    Get the limiter shared by everything using the same name.
+
+    The first call creates the limiter; later calls with the same name get
+    the same instance whatever rate they pass.
+
+    Args:
+        name: Limiter name, e.g. "polygon:<key id>"
+        calls_per_minute: Sustained call rate
+        capacity: Burst size
+        path: State file to share the limiter across processes
+
+    Returns:
+        TokenBucket (FileTokenBucket if path is given)
+    """
+    with _registry_lock:
+        limiter = _registry.get(name)
+        if limiter is None:
+            if path:
+                limiter = FileTokenBucket(path, calls_per_minute, capacity)
+            else:
+                limiter = TokenBucket(calls_per_minute, capacity)
+            _registry[name] = limiter
+    return limiter
+
+
+def key_id(secret: Optional[str]) -> str:
+    """Short non-reversible identifier of an API key, for limiter names."""
+    return hashlib.sha256((secret or "").encode()).hexdigest()[:12]
@@ -0,0 +1,602 @@
+"""
+Stream recorder.
+
+Captures every message of a PolygonWebSocketClient (or any message
+source) to rotating, append-only files, for replay (MarketReplay) and
+post-mortems.
+
+The socket thread only appends the raw frame and its receive time to a
+bounded queue. A writer thread decodes the frames and writes them in
+blocks, so recording never waits on the disk.
+
+File layout (little-endian):
+
+    file   := FILE_MAGIC block*
+    block  := header payload
+    header := b"BLK1", codec (u8), 3 pad bytes, count (u32),
+              first/last event time (i64 ms), raw size (u32), stored size (u32)
+
+The payload (zlib compressed unless codec is 0) is columnar:
+
+    sizes (3 x u32: symbol table, event table, bodies)
+    received (i64 ns)[count], time (i64 ms)[count],
+    symbol id (u32)[count], event id (u16)[count], body offsets (u32)[count + 1]
+    symbol table ("\\n"-joined), event table ("\\n"-joined), bodies (compact JSON)
+
+When a file is closed, an index ("<file>.idx", JSON) lists each block's
+offset, size, count, time range and symbols, so readers only load the
+blocks of the symbols and times they ask for. Files without an index
+(e.g. after a crash) are indexed by scanning their blocks.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from collections import deque
+from datetime import datetime, timezone
+import glob
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from alphalens.data.json_codec import dumps, loads
+from alphalens.data.stream_pipeline import event_time, message_symbol
+
+FILE_MAGIC = b"ALRC\x01\x00\x00\x00"
+BLOCK_MAGIC = b"BLK1"
+BLOCK_HEADER = struct.Struct("<4sB3xIqqII")
+PAYLOAD_SIZES = struct.Struct("<III")
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+
+
+def _to_ms(value: Any) -> Optional[int]:
+    """Epoch milliseconds of a timestamp-like value (ints are taken as ms)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize("UTC")
+    return stamp.value // 10**6
+
+
+def encode_block(records: List[Tuple[int, Dict[str, Any]]], codec: int = CODEC_ZLIB, level: int = 1) -> bytes:
+    """
+    Encode messages as one block.
+
+    Args:
+        records: (receive time in ns, message) pairs
+        codec: CODEC_ZLIB or CODEC_NONE
+        level: zlib compression level
+
+    Returns:
+        Block bytes (header and payload)
+    """
+    messages = [msg for _, msg in records]
+    received = np.fromiter((ns for ns, _ in records), dtype=np.int64, count=len(records))
+    times = np.fromiter(map(event_time, messages), dtype=np.int64, count=len(records))
+
+    names = [message_symbol(msg) or "" for msg in messages]
+    symbol_ids = {name: i for i, name in enumerate(dict.fromkeys(names))}
+    symbols = np.fromiter(map(symbol_ids.__getitem__, names), dtype=np.uint32, count=len(records))
+
+    kinds = [msg.get("ev") or "" for msg in messages]
+    event_ids = {kind: i for i, kind in enumerate(dict.fromkeys(kinds))}
+    events = np.fromiter(map(event_ids.__getitem__, kinds), dtype=np.uint16, count=len(records))
+
+    bodies = list(map(dumps, messages))
+    offsets = np.zeros(len(bodies) + 1, dtype=np.uint32)
+    np.cumsum(np.fromiter(map(len, bodies), dtype=np.int64, count=len(bodies)), out=offsets[1:])
+    symbol_table = "\n".join(symbol_ids).encode()
+    event_table = "\n".join(event_ids).encode()
+    body_bytes = b"".join(bodies)
+
+    raw = b"".join([
+        PAYLOAD_SIZES.pack(len(symbol_table), len(event_table), len(body_bytes)),
+        received.tobytes(),
+        times.tobytes(),
+        symbols.tobytes(),
+        events.tobytes(),
+        offsets.tobytes(),
+        symbol_table,
+        event_table,
+        body_bytes,
+    ])
+    stored = zlib.compress(raw, level) if codec == CODEC_ZLIB else raw
+
+    header = BLOCK_HEADER.pack(BLOCK_MAGIC, codec, len(records), times.min(), times.max(), len(raw), len(stored))
+    return header + stored
+
+
+def decode_block(header: tuple, stored: bytes) -> Dict[str, Any]:
+    """
+    Decode a block payload into its columns.
+
+    Args:
+        header: Unpacked BLOCK_HEADER
+        stored: Payload bytes as stored
+
+    Returns:
+        Dictionary with 'received', 'time', 'symbol', 'event' and
+        'offsets' arrays, 'symbols' and 'events' tables and raw 'bodies'
+    """
+    _, codec, count, _, _, _, _ = header
+    raw = zlib.decompress(stored) if codec == CODEC_ZLIB else stored
+
+    symbols_size, events_size, bodies_size = PAYLOAD_SIZES.unpack_from(raw)
+    pos = PAYLOAD_SIZES.size
+    columns: Dict[str, Any] = {}
+    for name, dtype, length in (("received", np.int64, count), ("time", np.int64, count),
+                                ("symbol", np.uint32, count), ("event", np.uint16, count),
+                                ("offsets", np.uint32, count + 1)):
+        columns[name] = np.frombuffer(raw, dtype=dtype, count=length, offset=pos)
+        pos += columns[name].nbytes
+
+    columns["symbols"] = raw[pos:pos + symbols_size].decode().split("\n")
+    pos += symbols_size
+    columns["events"] = raw[pos:pos + events_size].decode().split("\n")
+    pos += events_size
+    columns["bodies"] = raw[pos:pos + bodies_size]
+    return columns
+
+
+class StreamRecorder:
+    """
+    Records stream messages to rotating binary files on a writer thread.
+
+    Usage:
+        recorder = StreamRecorder("recordings/")
+        recorder.attach(client)  # PolygonWebSocketClient
+        recorder.start()
+        ...
+        recorder.stop()
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "stream",
+        max_file_bytes: int = 256 * 1024 * 1024,
+        rotate_seconds: Optional[float] = None,
+        block_size: int = 10000,
+        flush_interval: float = 1.0,
+        buffer_size: int = 1000000,
+        compression: bool = True
+    ):
+        """
+        Initialize recorder.
+
+        Args:
+            directory: Directory of the recording files
+            prefix: File name prefix
+            max_file_bytes: Start a new file past this size
+            rotate_seconds: Also start a new file after this many seconds
+            block_size: Messages per block (larger compresses better)
+            flush_interval: Longest time a message waits before being written
+            buffer_size: Frames queued before the oldest are dropped
+            compression: zlib-compress blocks
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.max_file_bytes = max_file_bytes
+        self.rotate_seconds = rotate_seconds
+        self.block_size = max(1, block_size)
+        self.flush_interval = flush_interval
+        self.codec = CODEC_ZLIB if compression else CODEC_NONE
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue: deque = deque(maxlen=max(1, buffer_size))
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._clients: List[Any] = []
+
+        # Current file (writer thread only)
+        self._file = None
+        self._path: Optional[str] = None
+        self._opened = 0.0
+        self._blocks: List[Dict[str, Any]] = []
+        self._sequence = 0
+
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.decode_errors = 0
+        self.messages_written = 0
+        self.blocks_written = 0
+        self.bytes_written = 0
+        self.raw_bytes = 0
+        self.files: List[str] = []
+
+    # Producers
+
+    def put(self, frame: Union[str, bytes]) -> None:
+        """
+        Queue a raw frame (called from the socket thread).
+
+        Args:
+            frame: JSON text of one message or an array of messages
+        """
+        if len(self._queue) == self._queue.maxlen:
+            self.frames_dropped += 1
+        self._queue.append((time.time_ns(), frame))
+        self.frames_received += 1
+
+    def record(self, msg: Dict[str, Any]) -> None:
+        """
+        Queue a decoded message (e.g. as a register_handler handler).
+
+        Args:
+            msg: Message dict
+        """
+        self.put(msg)
+
+    def attach(self, client: Any) -> None:
+        """
+        Record every frame a PolygonWebSocketClient receives.
+
+        Args:
+            client: PolygonWebSocketClient
+        """
+        client.add_frame_listener(self.put)
+        self._clients.append(client)
+
+    def detach(self) -> None:
+        """Stop receiving frames from attached clients."""
+        for client in self._clients:
+            client.remove_frame_listener(self.put)
+        self._clients = []
+
+    # Writer
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._write_loop, name="stream-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Write what is queued, close the current file and stop.
+
+        Args:
+            timeout: Seconds to wait for the writer
+        """
+        self.detach()
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _write_loop(self) -> None:
+        records: List[Tuple[int, Dict[str, Any]]] = []
+        deadline = time.monotonic() + self.flush_interval
+
+        try:
+            while True:
+                stopping = self._stopping.is_set()
+                while self._queue and len(records) < self.block_size:
+                    ns, frame = self._queue.popleft()
+                    records.extend((ns, msg) for msg in self._decode(frame))
+
+                if records and (len(records) >= self.block_size or stopping
+                                or time.monotonic() >= deadline):
+                    self._write_block(records)
+                    records = []
+                    deadline = time.monotonic() + self.flush_interval
+                    continue
+
+                if stopping and not self._queue:
+                    return
+                if not self._queue:
+                    self._stopping.wait(min(0.05, self.flush_interval))
+        except Exception as e:
+            logger.error(f"Recorder stopped: {e}")
+        finally:
+            self._close_file()
+
+    def _decode(self, frame: Union[str, bytes, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Data messages of a frame (status messages are left out)."""
+        if isinstance(frame, dict):
+            document: Any = frame
+        else:
+            try:
+                document = loads(frame)
+            except Exception as e:
+                self.decode_errors += 1
+                logger.error(f"Failed to decode frame: {e}")
+                return []
+
+        messages = document if isinstance(document, list) else [document]
+        return [msg for msg in messages if msg.get("ev") not in (None, "status")]
+
+    def _write_block(self, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if self._file is None or self._should_rotate():
+            self._close_file()
+            self._open_file()
+
+        block = encode_block(records, self.codec)
+        offset = self._file.tell()
+        self._file.write(block)
+        self._file.flush()
+
+        header = BLOCK_HEADER.unpack_from(block)
+        self._blocks.append({
+            "offset": offset,
+            "size": len(block),
+            "count": len(records),
+            "start": header[3],
+            "end": header[4],
+            "symbols": sorted({message_symbol(msg) or "" for _, msg in records}),
+        })
+        self.messages_written += len(records)
+        self.blocks_written += 1
+        self.bytes_written += len(block)
+        self.raw_bytes += header[5]
+
+    def _should_rotate(self) -> bool:
+        if self._file.tell() >= self.max_file_bytes:
+            return True
+        return self.rotate_seconds is not None and time.monotonic() - self._opened >= self.rotate_seconds
+
+    def _open_file(self) -> None:
+        self._sequence += 1
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self._path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{self._sequence:04d}.rec")
+        self._file = open(self._path, "ab", buffering=1024 * 1024)
+        if self._file.tell() == 0:
+            self._file.write(FILE_MAGIC)
+        self._opened = time.monotonic()
+        self._blocks = []
+        self.files.append(self._path)
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        write_index(self._path, self._blocks)
+        self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get recorder statistics.
+
+        Returns:
+            Dictionary with frame, message, block and byte counters
+        """
+        return {
+            "running": self.running,
+            "frames_received": self.frames_received,
+            "frames_dropped": self.frames_dropped,
+            "queue_depth": len(self._queue),
+            "decode_errors": self.decode_errors,
+            "messages_written": self.messages_written,
+            "blocks_written": self.blocks_written,
+            "bytes_written": self.bytes_written,
+            "compression_ratio": self.raw_bytes / self.bytes_written if self.bytes_written else 0.0,
+            "files": len(self.files),
+            "current_file": self._path,
+        }
+
+
+def write_index(path: str, blocks: List[Dict[str, Any]]) -> None:
+    """
+    Write the index of a recording file.
+
+    Args:
+        path: Recording file path
+        blocks: Block entries (offset, size, count, start, end, symbols)
+    """
+    by_symbol: Dict[str, List[int]] = {}
+    for i, block in enumerate(blocks):
+        for symbol in block["symbols"]:
+            by_symbol.setdefault(symbol, []).append(i)
+
+    entries = [{k: v for k, v in block.items() if k != "symbols"} for block in blocks]
+    tmp = path + ".idx.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"version": 1, "blocks": entries, "symbols": by_symbol}, f)
+    os.replace(tmp, path + ".idx")
+
+
+class RecordingReader:
+    """
+    Reads recordings written by StreamRecorder.
+
+    Usage:
+        reader = RecordingReader("recordings/")
+        for msg in reader.read(["AAPL"], start="2024-01-02 14:30"):
+            ...
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize reader.
+
+        Args:
+            path: Recording file or directory of recording files
+        """
+        if os.path.isdir(path):
+            self.paths = sorted(glob.glob(os.path.join(path, "*.rec")))
+        else:
+            self.paths = [path]
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+
+    def index(self, path: str) -> Dict[str, Any]:
+        """
+        Index of a recording file (scanned if missing or outdated).
+
+        Args:
+            path: Recording file path
+
+        Returns:
+            Dictionary with 'blocks' (offset, size, count, start, end)
+            and 'symbols' (symbol -> block numbers)
+        """
+        if path in self._indexes:
+            return self._indexes[path]
+
+        index = None
+        if os.path.exists(path + ".idx"):
+            with open(path + ".idx") as f:
+                index = json.load(f)
+            blocks = index["blocks"]
+            # a file still being written has blocks past its last index
+            end = blocks[-1]["offset"] + blocks[-1]["size"] if blocks else len(FILE_MAGIC)
+            if end != os.path.getsize(path):
+                index = None
+
+        if index is None:
+            index = self._scan(path)
+        self._indexes[path] = index
+        return index
+
+    @staticmethod
+    def _scan(path: str) -> Dict[str, Any]:
+        """Index a file by reading every block."""
+        blocks: List[Dict[str, Any]] = []
+        by_symbol: Dict[str, List[int]] = {}
+
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"Not a stream recording: {path}")
+            while True:
+                offset = f.tell()
+                head = f.read(BLOCK_HEADER.size)
+                if len(head) < BLOCK_HEADER.size:
+                    break
+                header = BLOCK_HEADER.unpack(head)
+                stored = f.read(header[6])
+                if header[0] != BLOCK_MAGIC or len(stored) < header[6]:
+                    logger.warning(f"Truncated block at {offset} in {path}")
+                    break
+
+                columns = decode_block(header, stored)
+                for symbol in set(columns["symbols"][i] for i in np.unique(columns["symbol"])):
+                    by_symbol.setdefault(symbol, []).append(len(blocks))
+                blocks.append({"offset": offset, "size": BLOCK_HEADER.size + header[6],
+                               "count": header[2], "start": header[3], "end": header[4]})
+
+        return {"version": 1, "blocks": blocks, "symbols": by_symbol}
+
+    def symbols(self) -> List[str]:
+        """Symbols present in the recording."""
+        names = set()
+        for path in self.paths:
+            names.update(self.index(path)["symbols"])
+        names.discard("")
+        return sorted(names)
+
+    def read(
+        self,
+        symbols: Optional[List[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        events: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Recorded messages, in receive order.
+
+        Args:
+            symbols: Symbols to read (None = all)
+            start: Earliest event time (epoch ms or timestamp-like, inclusive)
+            end: Latest event time (inclusive)
+            events: Event types to read (None = all)
+
+        Yields:
+            Message dicts
+        """
+        lo, hi = _to_ms(start), _to_ms(end)
+
+        for path in self.paths:
+            index = self.index(path)
+            if symbols is None:
+                wanted = range(len(index["blocks"]))
+            else:
+                wanted = sorted({i for symbol in symbols for i in index["symbols"].get(symbol, [])})
+
+            with open(path, "rb") as f:
+                for i in wanted:
+                    block = index["blocks"][i]
+                    if (lo is not None and block["end"] < lo) or (hi is not None and block["start"] > hi):
+                        continue
+
+                    f.seek(block["offset"])
+                    header = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+                    columns = decode_block(header, f.read(header[6]))
+                    yield from self._select(columns, symbols, lo, hi, events)
+
+    @staticmethod
+    def _select(
+        columns: Dict[str, Any],
+        symbols: Optional[List[str]],
+        lo: Optional[int],
+        hi: Optional[int],
+        events: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Decode the rows of a block matching the filters."""
+        mask = np.ones(len(columns["time"]), dtype=bool)
+        if symbols is not None:
+            wanted = set(symbols)
+            ids = [i for i, name in enumerate(columns["symbols"]) if name in wanted]
+            mask &= np.isin(columns["symbol"], ids)
+        if events is not None:
+            wanted = set(events)
+            ids = [i for i, name in enumerate(columns["events"]) if name in wanted]
+            mask &= np.isin(columns["event"], ids)
+        if lo is not None:
+            mask &= columns["time"] >= lo
+        if hi is not None:
+            mask &= columns["time"] <= hi
+
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+
+        offsets, bodies = columns["offsets"], columns["bodies"]
+        return loads(b"[" + b",".join(bodies[offsets[i]:offsets[i + 1]] for i in rows) + b"]")
+
+    def to_frame(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Receive time, event time, symbol and event of every message,
+        without decoding the message bodies.
+
+        Args:
+            symbols: Symbols to include (None = all)
+
+        Returns:
+            DataFrame with columns received (ns), time (ms), symbol, event
+        """
+        parts = []
+        for path in self.paths:
+            index = self.index(path)
+            with open(path, "rb") as f:
+                for block in index["blocks"]:
+                    f.seek(block["offset"])
+                    header = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+                    columns = decode_block(header, f.read(header[6]))
+                    frame = pd.DataFrame({
+                        "received": columns["received"],
+                        "time": columns["time"],
+                        "symbol": np.asarray(columns["symbols"], dtype=object)[columns["symbol"]],
+                        "event": np.asarray(columns["events"], dtype=object)[columns["event"]],
+                    })
+                    if symbols is not None:
+                        frame = frame[frame["symbol"].isin(symbols)]
+                    parts.append(frame)
+
+        if not parts:
+            return pd.DataFrame(columns=["received", "time", "symbol", "event"])
+        return pd.concat(parts, ignore_index=True)
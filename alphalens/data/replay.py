@@ -0,0 +1,452 @@
+"""
+Market-data replay.
+
+Plays recorded trades, quotes and bars back through the same callback
+interfaces as the live clients, so streaming handlers (BarAggregator,
+QuoteBook, strategies) can be tested and benchmarked without a live feed:
+
+- register_handler / subscribe, as PolygonWebSocketClient
+- subscribe_realtime, as AlpacaDataFeed (bar dicts from A/AM events)
+
+Sources are Polygon-style message dicts, stored bars (a BarStore or a bars
+DataFrame, replayed as AM messages), StreamRecorder recordings and captured
+WebSocket logs (one JSON frame per line). Sources are merged by event time.
+
+Pacing:
+- speed=1.0 replays at recorded speed, speed=N at N times that speed
+- speed=None replays as fast as possible
+
+Every message is timed from emission to the return of its last handler,
+so get_stats() reports throughput and latency percentiles. With
+pipeline=True messages go through a MessagePipeline first, as with
+PolygonWebSocketClient(pipeline=True), and the latency includes queueing.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import heapq
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from alphalens.data.json_codec import loads
+from alphalens.data.recorder import RecordingReader
+from alphalens.data.stream_pipeline import MessagePipeline, event_time, message_symbol
+
+# Bar length of each store timeframe, in milliseconds
+TIMEFRAME_MS = {
+    "1Min": 60000,
+    "5Min": 300000,
+    "15Min": 900000,
+    "1Hour": 3600000,
+    "1Day": 86400000,
+}
+
+BAR_EVENTS = ("A", "AM", "XA")
+
+
+def bars_to_messages(bars: pd.DataFrame, timeframe: str = "1Min") -> Iterator[Dict[str, Any]]:
+    """
+    Stored bars as AM messages, in time order.
+
+    Args:
+        bars: DataFrame with MultiIndex (timestamp, symbol) and OHLCV
+            columns (BarStore.read layout)
+        timeframe: Bar timeframe (sets the 'e' end time)
+
+    Yields:
+        AM message dicts
+    """
+    if bars.empty:
+        return
+
+    length = TIMEFRAME_MS.get(timeframe, 60000)
+    timestamps = bars.index.get_level_values(0)
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_convert("UTC").tz_localize(None)
+    starts = timestamps.values.astype("datetime64[ms]").astype(np.int64)
+    order = np.argsort(starts, kind="mergesort")
+
+    symbols = bars.index.get_level_values(1).values
+    columns = {key: bars[col].to_numpy(dtype=float) if col in bars else None
+               for key, col in (("o", "open"), ("h", "high"), ("l", "low"), ("c", "close"),
+                                ("v", "volume"), ("vw", "vwap"))}
+
+    for i in order:
+        start = int(starts[i])
+        msg = {"ev": "AM", "sym": symbols[i], "s": start, "e": start + length}
+        for key, values in columns.items():
+            if values is not None and not np.isnan(values[i]):
+                msg[key] = float(values[i])
+        yield msg
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Messages of a captured WebSocket log.
+
+    Args:
+        path: Text file with one raw frame (a message or an array of
+            messages) per line
+
+    Yields:
+        Data messages (status messages are skipped)
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                document = loads(line)
+            except Exception as e:
+                logger.error(f"Failed to decode frame in {path}: {e}")
+                continue
+            for msg in document if isinstance(document, list) else [document]:
+                if msg.get("ev") not in (None, "status"):
+                    yield msg
+
+
+class MarketReplay:
+    """
+    Replays recorded market data through live-client callbacks.
+
+    Usage:
+        replay = MarketReplay(speed=10)
+        replay.add_bar_store(store, ["AAPL", "MSFT"], "2024-01-02", "2024-01-02")
+        replay.register_handler("AM", bars.on_message)
+        stats = replay.run()
+    """
+
+    def __init__(
+        self,
+        speed: Optional[float] = 1.0,
+        pipeline: bool = False,
+        buffer_size: int = 10000,
+        workers: int = 4,
+        backpressure: str = "block"
+    ):
+        """
+        Initialize replay.
+
+        Args:
+            speed: Replay speed relative to recorded time (None = as fast
+                as possible)
+            pipeline: Deliver through a MessagePipeline
+            buffer_size: Pipeline queue capacity
+            workers: Pipeline worker threads
+            backpressure: Pipeline policy ("block" loses no messages)
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive (or None for as fast as possible)")
+
+        self.speed = speed
+        self._sources: List[Iterable[Dict[str, Any]]] = []
+
+        # Callbacks, keyed as in PolygonWebSocketClient / AlpacaDataFeed
+        self.subscriptions: Dict[str, List[Callable]] = {}
+        self.message_handlers: Dict[str, List[Callable]] = {}
+        self._bar_callbacks: Dict[str, List[Callable]] = {}
+
+        self.pipeline: Optional[MessagePipeline] = None
+        if pipeline:
+            self.pipeline = MessagePipeline(
+                self._dispatch_queued,
+                buffer_size=buffer_size,
+                workers=workers,
+                policy=backpressure
+            )
+
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._emitted_at: Dict[int, float] = {}
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.messages_emitted = 0
+        self.handler_errors = 0
+        self.max_schedule_lag = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._latencies: List[float] = []
+
+    # Sources
+
+    def add_messages(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add Polygon-style messages (in time order).
+
+        Args:
+            messages: Message dicts
+        """
+        self._sources.append(messages)
+
+    def add_bars(self, bars: pd.DataFrame, timeframe: str = "1Min") -> None:
+        """
+        Add bars, replayed as AM messages.
+
+        Args:
+            bars: DataFrame with MultiIndex (timestamp, symbol) and OHLCV columns
+            timeframe: Bar timeframe
+        """
+        self._sources.append(bars_to_messages(bars, timeframe))
+
+    def add_bar_store(
+        self,
+        store: Any,
+        symbols: List[str],
+        start: Any,
+        end: Any,
+        timeframe: str = "1Min"
+    ) -> None:
+        """
+        Add bars from a local BarStore.
+
+        Args:
+            store: BarStore
+            symbols: Symbols
+            start: Range start
+            end: Range end (inclusive)
+            timeframe: Timeframe
+        """
+        self.add_bars(store.read(symbols, start, end, timeframe), timeframe)
+
+    def add_log(self, path: str) -> None:
+        """
+        Add a captured WebSocket log (one JSON frame per line).
+
+        Args:
+            path: Log file path
+        """
+        self._sources.append(read_log(path))
+
+    def add_recording(
+        self,
+        path: str,
+        symbols: Optional[List[str]] = None,
+        start: Any = None,
+        end: Any = None
+    ) -> None:
+        """
+        Add a StreamRecorder recording.
+
+        Args:
+            path: Recording file or directory
+            symbols: Symbols to replay (None = all)
+            start: Earliest event time (inclusive)
+            end: Latest event time (inclusive)
+        """
+        self._sources.append(RecordingReader(path).read(symbols, start, end))
+
+    # Callbacks
+
+    def register_handler(self, event_type: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register handler for all messages of a type.
+
+        Args:
+            event_type: Event type (T, Q, AM, etc.)
+            handler: Handler function
+        """
+        self.message_handlers.setdefault(event_type, []).append(handler)
+
+    def subscribe(self, channel: str, symbols: List[str], callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a callback for the messages of a channel and symbols.
+
+        Args:
+            channel: Event type (T, Q, A, AM)
+            symbols: List of symbols
+            callback: Called with each message
+        """
+        for symbol in symbols:
+            self.subscriptions.setdefault(f"{channel}:{symbol}", []).append(callback)
+
+    def subscribe_realtime(self, symbols: List[str], callback: Callable[[dict], None]) -> None:
+        """
+        Register a bar callback, as AlpacaDataFeed.subscribe_realtime.
+
+        Args:
+            symbols: List of symbols
+            callback: Called with a bar dict (symbol, timestamp, open, high,
+                low, close, volume) for each aggregate message
+        """
+        for symbol in symbols:
+            self._bar_callbacks.setdefault(symbol, []).append(callback)
+
+    # Delivery
+
+    def _deliver(self, msg: Dict[str, Any]) -> None:
+        """Call the handlers and subscribers of a message."""
+        msg_type = msg.get("ev")
+        symbol = message_symbol(msg)
+
+        callbacks = list(self.message_handlers.get(msg_type, ()))
+        if symbol:
+            callbacks.extend(self.subscriptions.get(f"{msg_type}:{symbol}", ()))
+        for callback in callbacks:
+            try:
+                callback(msg)
+            except Exception as e:
+                self.handler_errors += 1
+                logger.error(f"Handler error: {e}")
+
+        if msg_type in BAR_EVENTS and symbol in self._bar_callbacks:
+            bar = {
+                "symbol": symbol,
+                "timestamp": pd.Timestamp(msg["s"], unit="ms", tz="UTC"),
+                "open": msg.get("o"),
+                "high": msg.get("h"),
+                "low": msg.get("l"),
+                "close": msg.get("c"),
+                "volume": msg.get("v", 0),
+            }
+            for callback in self._bar_callbacks[symbol]:
+                try:
+                    callback(dict(bar))
+                except Exception as e:
+                    self.handler_errors += 1
+                    logger.error(f"Callback error: {e}")
+
+    def _dispatch_queued(self, msg: Dict[str, Any]) -> None:
+        """Pipeline worker: deliver and time from emission."""
+        self._deliver(msg)
+        emitted = self._emitted_at.pop(id(msg), None)
+        if emitted is not None:
+            self._latencies.append(time.perf_counter() - emitted)
+
+    def _messages(self) -> Iterator[Dict[str, Any]]:
+        if len(self._sources) == 1:
+            return iter(self._sources[0])
+        return heapq.merge(*self._sources, key=event_time)
+
+    # Running
+
+    def run(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Replay the sources on this thread.
+
+        Sources are consumed: add them again to replay twice.
+
+        Args:
+            limit: Stop after this many messages
+
+        Returns:
+            Replay statistics (see get_stats)
+        """
+        self._reset_stats()
+        self._stopping.clear()
+        messages = self._messages()
+        self._sources = []
+
+        if self.pipeline:
+            self.pipeline.start()
+
+        clock = time.perf_counter
+        first: Optional[int] = None
+        self.started = clock()
+
+        try:
+            for msg in messages:
+                if self._stopping.is_set() or (limit is not None and self.messages_emitted >= limit):
+                    break
+
+                if self.speed is not None:
+                    stamp = event_time(msg)
+                    if first is None:
+                        first = stamp
+                    due = self.started + (stamp - first) / 1000 / self.speed
+                    delay = due - clock()
+                    if delay > 0:
+                        if self._stopping.wait(delay):
+                            break
+                    else:
+                        self.max_schedule_lag = max(self.max_schedule_lag, -delay)
+
+                self.messages_emitted += 1
+                emitted = clock()
+                if self.pipeline:
+                    self._emitted_at[id(msg)] = emitted
+                    self.pipeline.put_messages([msg])
+                else:
+                    self._deliver(msg)
+                    self._latencies.append(clock() - emitted)
+        finally:
+            if self.pipeline:
+                # drains what is queued
+                self.pipeline.stop()
+                self._emitted_at.clear()
+            self.finished = clock()
+
+        stats = self.get_stats()
+        logger.info(f"Replayed {stats['messages_delivered']} messages in "
+                    f"{stats['elapsed_seconds']:.3f}s ({stats['messages_per_second']:,.0f} msg/s)")
+        return stats
+
+    def start(self, limit: Optional[int] = None) -> None:
+        """
+        Replay on a background thread.
+
+        Args:
+            limit: Stop after this many messages
+        """
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self.run, args=(limit,), name="market-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop a running replay (queued messages are still delivered)."""
+        self._stopping.set()
+        self.join()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a background replay.
+
+        Args:
+            timeout: Seconds to wait (None = until done)
+
+        Returns:
+            True if the replay has finished
+        """
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get replay statistics.
+
+        Returns:
+            Dictionary with message counts, elapsed time, throughput,
+            latency percentiles (emission to last handler, ms) and the
+            largest delay behind the replay schedule (ms)
+        """
+        end = self.finished if self.finished is not None else time.perf_counter()
+        elapsed = end - self.started if self.started is not None else 0.0
+        latencies = np.array(self._latencies) * 1000
+
+        stats = {
+            "speed": self.speed,
+            "messages_emitted": self.messages_emitted,
+            "messages_delivered": len(latencies),
+            "handler_errors": self.handler_errors,
+            "elapsed_seconds": elapsed,
+            "messages_per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+            "max_schedule_lag_ms": self.max_schedule_lag * 1000,
+            "latency_ms": {
+                "mean": float(latencies.mean()) if len(latencies) else 0.0,
+                "p50": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                "p99": float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+                "max": float(latencies.max()) if len(latencies) else 0.0,
+            },
+        }
+
+        if self.pipeline:
+            stats["pipeline"] = self.pipeline.get_stats()
+
+        return stats
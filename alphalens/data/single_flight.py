@@ -0,0 +1,320 @@
+"""
+Request coalescing for concurrent data requests.
+
+- SingleFlight / AsyncSingleFlight: concurrent callers asking for the same
+  key share one in-flight call and all receive its result (or exception).
+  Nothing is cached: the next call after completion goes upstream again.
+- PriceBatcher / AsyncPriceBatcher: calls arriving within a short window
+  are merged into one multi-symbol fetch; each caller gets its symbols.
+- coalesced: method decorator keying the single-flight on the method name
+  and its arguments.
+
+Callers served by another caller's fetch get their own copy of a pandas
+or NumPy result, so mutating it does not affect the others.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+import asyncio
+import functools
+import threading
+import time
+
+import pandas as pd
+
+from alphalens.data.memory_cache import copy_value
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-level single-flight."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call fn(*args, **kwargs), or wait for the in-flight call of 'key'.
+
+        Args:
+            key: Identity of the request
+            fn: Function performing the request
+
+        Returns:
+            Result of the (shared) call, copied for waiters
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy_value(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        # waiters copy call.result once woken: never hand it out as well
+        return copy_value(call.result) if call.waiters else call.result
+
+    def get_stats(self) -> Dict[str, int]:
+        """Upstream calls made and calls served by an in-flight one."""
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+class AsyncSingleFlight:
+    """Event-loop single-flight."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await fn(*args, **kwargs), or the in-flight call of 'key'.
+
+        The call runs as its own task, so a cancelled caller does not
+        cancel it for the others.
+
+        Args:
+            key: Identity of the request
+            fn: Coroutine function performing the request
+
+        Returns:
+            Result of the (shared) call, copied for waiters
+        """
+        # tasks belong to one event loop
+        key = (id(asyncio.get_running_loop()), key)
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(fn(*args, **kwargs)))
+            flight.task.add_done_callback(lambda _: self._flights.pop(key, None))
+            self.calls += 1
+        else:
+            flight.waiters += 1
+            self.coalesced += 1
+
+        result = await asyncio.shield(flight.task)
+        # the shared result itself only goes to a caller that had no waiters
+        return copy_value(result) if flight.waiters else result
+
+    def get_stats(self) -> Dict[str, int]:
+        """Upstream calls made and calls served by an in-flight one."""
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def coalesced(method: Callable) -> Callable:
+    """
+    Coalesce concurrent identical calls of a data method.
+
+    The instance must have 'single_flight' (SingleFlight) and, for
+    coroutine methods, 'async_single_flight' (AsyncSingleFlight).
+    """
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            key = (method.__name__, _freeze(args), _freeze(kwargs))
+            return await self.async_single_flight.do(key, method, self, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, _freeze(args), _freeze(kwargs))
+        return self.single_flight.do(key, method, self, *args, **kwargs)
+    return wrapper
+
+
+def _select(prices: pd.Series, symbols: List[str]) -> pd.Series:
+    return prices[prices.index.isin(symbols)]
+
+
+class _Batch:
+    def __init__(self):
+        self.symbols: Set[str] = set()
+        self.call = _Call()
+
+
+class PriceBatcher:
+    """
+    Merge concurrent latest-price calls into one multi-symbol fetch.
+
+    The first caller opens a batch and waits 'window' seconds for others
+    to add their symbols, then fetches the union once.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], pd.Series],
+        window: float = 0.01,
+        max_symbols: Optional[int] = None
+    ):
+        """
+        Initialize price batcher.
+
+        Args:
+            fetch: symbols -> Series of prices
+            window: Seconds a batch stays open
+            max_symbols: Close a batch early at this many symbols
+        """
+        self.fetch = fetch
+        self.window = window
+        self.max_symbols = max_symbols
+        self._open: Optional[_Batch] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+
+    def get(self, symbols: List[str]) -> pd.Series:
+        """
+        Get latest prices through the current batch.
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            Series with symbol -> price (symbols without price left out)
+        """
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+                self.batches += 1
+            batch.symbols.update(symbols)
+            self.requests += 1
+            if self.max_symbols and len(batch.symbols) >= self.max_symbols:
+                self._open = None
+
+        call = batch.call
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            try:
+                call.result = self.fetch(sorted(batch.symbols))
+            except BaseException as e:
+                call.error = e
+            finally:
+                call.event.set()
+        else:
+            call.event.wait()
+
+        if call.error is not None:
+            raise call.error
+        return _select(call.result, symbols)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Caller requests and upstream batches."""
+        return {"requests": self.requests, "batches": self.batches}
+
+
+class AsyncPriceBatcher:
+    """Event-loop version of PriceBatcher."""
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Awaitable[pd.Series]],
+        window: float = 0.01,
+        max_symbols: Optional[int] = None
+    ):
+        """
+        Initialize async price batcher.
+
+        Args:
+            fetch: Coroutine function symbols -> Series of prices
+            window: Seconds a batch stays open
+            max_symbols: Close a batch early at this many symbols
+        """
+        self.fetch = fetch
+        self.window = window
+        self.max_symbols = max_symbols
+        self._open: Dict[int, "_AsyncBatch"] = {}
+        self.batches = 0
+        self.requests = 0
+
+    async def get(self, symbols: List[str]) -> pd.Series:
+        """
+        Get latest prices through the current batch.
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            Series with symbol -> price (symbols without price left out)
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._open.get(id(loop))
+        if batch is None:
+            batch = self._open[id(loop)] = _AsyncBatch()
+            batch.task = asyncio.ensure_future(self._run(batch, id(loop)))
+            self.batches += 1
+        batch.symbols.update(symbols)
+        self.requests += 1
+        if self.max_symbols and len(batch.symbols) >= self.max_symbols:
+            self._close(batch, id(loop))
+            batch.full.set()
+
+        return _select(await asyncio.shield(batch.task), symbols)
+
+    async def _run(self, batch: "_AsyncBatch", loop_id: int) -> pd.Series:
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        self._close(batch, loop_id)
+        return await self.fetch(sorted(batch.symbols))
+
+    def _close(self, batch: "_AsyncBatch", loop_id: int) -> None:
+        if self._open.get(loop_id) is batch:
+            del self._open[loop_id]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Caller requests and upstream batches."""
+        return {"requests": self.requests, "batches": self.batches}
+
+
+class _AsyncBatch:
+    def __init__(self):
+        self.symbols: Set[str] = set()
+        self.full = asyncio.Event()
+        self.task: Optional["asyncio.Future"] = None
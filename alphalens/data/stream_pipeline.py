@@ -0,0 +1,325 @@
+"""
+Message pipeline for streaming feeds.
+
+Decouples the socket thread from message handling:
+
+    socket thread -> frame ring buffer -> decoder -> lanes -> worker pool
+
+- The socket thread only appends the raw frame to a bounded ring buffer.
+- One decoder thread drains the buffer in batches and parses each batch
+  with a single JSON call.
+- Decoded messages are routed to one lane per worker by symbol, so the
+  handlers of a symbol run in arrival order while different symbols are
+  handled in parallel.
+
+When a queue is full the backpressure policy decides what happens:
+- "drop_oldest": the oldest queued item is discarded
+- "conflate": a pending message of a conflatable event (quotes by default)
+  is dropped and the latest one for the same symbol queued at the tail;
+  otherwise the oldest item is discarded
+- "block": the producer waits (the socket stops reading)
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Union
+from collections import OrderedDict, deque
+import itertools
+import threading
+
+from loguru import logger
+
+from alphalens.data.json_codec import loads
+
+BACKPRESSURE_POLICIES = ("drop_oldest", "conflate", "block")
+
+
+def message_symbol(msg: Dict[str, Any]) -> Optional[str]:
+    """Symbol of a stream message (stocks/options 'sym', crypto/forex 'pair')."""
+    return msg.get("sym") or msg.get("pair")
+
+
+def event_time(msg: Dict[str, Any]) -> int:
+    """
+    Time a stream message was published (epoch ms).
+
+    Trades and quotes carry 't'; aggregates are published when they end
+    ('e'), falling back to their start ('s'). Messages without a time
+    sort first.
+    """
+    if msg.get("ev") in ("A", "AM", "XA"):
+        return int(msg.get("e", msg.get("s", 0)))
+    return int(msg.get("t", 0))
+
+
+class _Lane:
+    """Bounded FIFO of decoded messages served by one worker."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.items: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.cond = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+
+        self.max_depth = 0
+        self.processed = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.errors = 0
+
+
+class MessagePipeline:
+    """
+    Bounded, multi-stage pipeline from raw frames to message handlers.
+
+    Usage:
+        pipeline = MessagePipeline(handle_message, workers=4, policy="conflate")
+        pipeline.start()
+        pipeline.put(frame)  # from the socket thread
+        ...
+        pipeline.stop()
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[Dict[str, Any]], None],
+        buffer_size: int = 10000,
+        workers: int = 4,
+        policy: str = "drop_oldest",
+        batch_size: int = 500,
+        conflate_events: Iterable[str] = ("Q",)
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            dispatch: Called with every decoded message on a worker thread
+            buffer_size: Capacity of the frame buffer and of each lane
+            workers: Number of worker threads (lanes)
+            policy: Backpressure policy ("drop_oldest", "conflate", "block")
+            batch_size: Frames decoded per batch
+            conflate_events: Event types the "conflate" policy may replace
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy {policy!r}, "
+                             f"expected one of {BACKPRESSURE_POLICIES}")
+
+        self.dispatch = dispatch
+        self.buffer_size = max(1, buffer_size)
+        self.policy = policy
+        self.batch_size = max(1, batch_size)
+        self.conflate_events = frozenset(conflate_events)
+
+        self._frames: deque = deque()
+        self._frames_cond = threading.Condition()
+        self._lanes = [_Lane(self.buffer_size) for _ in range(max(1, workers))]
+        self._sequence = itertools.count()
+        self._decoder: Optional[threading.Thread] = None
+        self._decoding = False
+        self._dispatching = False
+
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.max_frame_depth = 0
+        self.batches = 0
+        self.messages_decoded = 0
+        self.decode_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._decoding
+
+    def start(self) -> None:
+        """Start the decoder and worker threads."""
+        if self._decoding:
+            return
+
+        self._decoding = self._dispatching = True
+        for i, lane in enumerate(self._lanes):
+            lane.thread = threading.Thread(
+                target=self._work, args=(lane,), name=f"stream-worker-{i}", daemon=True)
+            lane.thread.start()
+
+        self._decoder = threading.Thread(target=self._decode_loop, name="stream-decoder", daemon=True)
+        self._decoder.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the pipeline after handling what is already queued.
+
+        Args:
+            timeout: Seconds to wait for each thread
+        """
+        if not self._decoding:
+            return
+
+        # decoder first so everything it routes still reaches the workers
+        with self._frames_cond:
+            self._decoding = False
+            self._frames_cond.notify_all()
+        if self._decoder is not None:
+            self._decoder.join(timeout)
+
+        self._dispatching = False
+        for lane in self._lanes:
+            with lane.cond:
+                lane.cond.notify_all()
+        for lane in self._lanes:
+            # a handler may stop the pipeline from its own worker
+            if lane.thread is not None and lane.thread is not threading.current_thread():
+                lane.thread.join(timeout)
+
+    # Producers
+
+    def put(self, frame: Union[str, bytes]) -> None:
+        """
+        Queue a raw frame (called from the socket thread).
+
+        Args:
+            frame: JSON text of one message or an array of messages
+        """
+        with self._frames_cond:
+            if len(self._frames) >= self.buffer_size:
+                if self.policy == "block":
+                    while len(self._frames) >= self.buffer_size and self._decoding:
+                        self._frames_cond.wait(0.1)
+                else:
+                    # raw frames cannot be conflated before decoding
+                    self._frames.popleft()
+                    self.frames_dropped += 1
+
+            self._frames.append(frame)
+            self.frames_received += 1
+            self.max_frame_depth = max(self.max_frame_depth, len(self._frames))
+            self._frames_cond.notify_all()
+
+    def put_messages(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queue already decoded messages (e.g. from SDK streams or backfills).
+
+        Args:
+            messages: Message dicts
+        """
+        for msg in messages:
+            self._enqueue(msg)
+
+    # Decoder stage
+
+    def _decode_loop(self) -> None:
+        while True:
+            with self._frames_cond:
+                while not self._frames and self._decoding:
+                    self._frames_cond.wait()
+                if not self._frames:
+                    return
+
+                count = min(len(self._frames), self.batch_size)
+                batch = [self._frames.popleft() for _ in range(count)]
+                # wake producers blocked on a full buffer
+                self._frames_cond.notify_all()
+
+            for msg in self._decode(batch):
+                self._enqueue(msg)
+
+    def _decode(self, batch: List[Union[str, bytes]]) -> List[Dict[str, Any]]:
+        """Parse a batch of frames into a flat list of messages."""
+        self.batches += 1
+        frames = [frame.decode() if isinstance(frame, bytes) else frame for frame in batch]
+
+        try:
+            documents = loads("[" + ",".join(frames) + "]")
+        except Exception:
+            # isolate the bad frame(s)
+            documents = []
+            for frame in frames:
+                try:
+                    documents.append(loads(frame))
+                except Exception as e:
+                    self.decode_errors += 1
+                    logger.error(f"Failed to decode frame: {e}")
+
+        messages = []
+        for document in documents:
+            if isinstance(document, list):
+                messages.extend(document)
+            else:
+                messages.append(document)
+
+        self.messages_decoded += len(messages)
+        return messages
+
+    # Lanes and workers
+
+    def _enqueue(self, msg: Dict[str, Any]) -> None:
+        symbol = message_symbol(msg)
+        lane = self._lanes[hash(symbol) % len(self._lanes)] if symbol else self._lanes[0]
+
+        with lane.cond:
+            if self.policy == "conflate" and msg.get("ev") in self.conflate_events:
+                key: Hashable = (msg.get("ev"), symbol)
+                if key in lane.items:
+                    # moved to the tail, so it is never handled before
+                    # messages of the symbol that arrived ahead of it
+                    del lane.items[key]
+                    lane.items[key] = msg
+                    lane.conflated += 1
+                    return
+            else:
+                key = next(self._sequence)
+
+            if len(lane.items) >= lane.capacity:
+                if self.policy == "block":
+                    while len(lane.items) >= lane.capacity and self._dispatching:
+                        lane.cond.wait(0.1)
+                else:
+                    lane.items.popitem(last=False)
+                    lane.dropped += 1
+
+            lane.items[key] = msg
+            lane.max_depth = max(lane.max_depth, len(lane.items))
+            lane.cond.notify_all()
+
+    def _work(self, lane: _Lane) -> None:
+        while True:
+            with lane.cond:
+                while not lane.items and self._dispatching:
+                    lane.cond.wait()
+                if not lane.items:
+                    return
+
+                _, msg = lane.items.popitem(last=False)
+                # wake producers blocked on a full lane
+                lane.cond.notify_all()
+
+            try:
+                self.dispatch(msg)
+            except Exception as e:
+                lane.errors += 1
+                logger.error(f"Handler error: {e}")
+            lane.processed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pipeline statistics.
+
+        Returns:
+            Dictionary with throughput, drop and queue depth counters
+        """
+        lane_depths = [len(lane.items) for lane in self._lanes]
+        return {
+            "running": self.running,
+            "policy": self.policy,
+            "workers": len(self._lanes),
+            "frames_received": self.frames_received,
+            "frames_dropped": self.frames_dropped,
+            "frame_depth": len(self._frames),
+            "max_frame_depth": self.max_frame_depth,
+            "batches": self.batches,
+            "decode_errors": self.decode_errors,
+            "messages_decoded": self.messages_decoded,
+            "messages_processed": sum(lane.processed for lane in self._lanes),
+            "messages_dropped": sum(lane.dropped for lane in self._lanes),
+            "messages_conflated": sum(lane.conflated for lane in self._lanes),
+            "handler_errors": sum(lane.errors for lane in self._lanes),
+            "lane_depths": lane_depths,
+            "queue_depth": len(self._frames) + sum(lane_depths),
+            "max_lane_depth": max(lane.max_depth for lane in self._lanes),
+        }
@@ -7,24 +7,97 @@ Automatically routes requests to best data source:
 - Yahoo Finance: Free backup for historical data
 
 Features:
-- Intelligent caching
+- Intelligent caching (historical bars in a local columnar store, only
+  missing date ranges are fetched upstream)
 - Automatic failover
 - Rate limit management
 - Cost optimization
+- Async facade (async_* methods) fanning requests out concurrently
+- Request coalescing: concurrent identical requests share one upstream call
 """
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import asyncio
+import shutil
+import numpy as np
 import pandas as pd
 from loguru import logger
-from functools import lru_cache
+from functools import lru_cache, partial
 import pickle
 import os
 
+from alphalens.assets.option_chain import OptionChain
 from alphalens.data.base import BaseDataFeed
 from alphalens.data.alpaca_feed import AlpacaDataFeed
 from alphalens.data.polygon_feed import PolygonDataFeed
 from alphalens.data.yahoo_feed import YahooDataFeed
+from alphalens.data.async_base import AsyncBaseDataFeed, AIOHTTP_AVAILABLE
+from alphalens.data.bar_store import BarStore
+from alphalens.data.fetch_planner import FetchRequest, plan_fetches
+from alphalens.data.memory_cache import MemoryCache
+from alphalens.data.quote_book import QuoteBook
+from alphalens.data.single_flight import (
+    AsyncPriceBatcher,
+    AsyncSingleFlight,
+    PriceBatcher,
+    SingleFlight,
+    coalesced,
+)
+
+if AIOHTTP_AVAILABLE:
+    from alphalens.data.alpaca_async import AsyncAlpacaDataFeed
+    from alphalens.data.polygon_async import AsyncPolygonDataFeed
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+# Sources whose historical 'end' is exclusive (yfinance) or a timestamp
+# (Alpaca): a request through the end of a day needs the next midnight.
+# Polygon takes inclusive dates.
+_EXCLUSIVE_END_SOURCES = ("yahoo", "alpaca")
+
+
+def _feed_end(source: str, day: date) -> datetime:
+    """Upstream 'end' argument that includes all of 'day'."""
+    if source in _EXCLUSIVE_END_SOURCES:
+        return _day_start(day + timedelta(days=1))
+    return _day_start(day)
+
+
+def _complete_until() -> date:
+    """Last day whose bars are final (earlier days are never refetched)."""
+    return date.today() - timedelta(days=1)
+
+
+def _concat_bars(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate bar frames, keeping the failed windows each feed reported."""
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    data = pd.concat(frames).sort_index()
+    data.attrs["failed_windows"] = [window for frame in frames
+                                    for window in frame.attrs.get("failed_windows", ())]
+    return data
+
+
+def _absent_symbols(data: Optional[pd.DataFrame], symbols: List[str]) -> List[str]:
+    """
+    Symbols to refetch per symbol after a grouped daily request.
+
+    A failed request (None) lacks every symbol. An empty response is a
+    market holiday (see _check_grouped) and lacks none; otherwise symbols
+    the grouped endpoint did not list are refetched.
+    """
+    if data is None:
+        return list(symbols)
+    if data.empty:
+        return []
+    found = set(data.index.get_level_values("symbol"))
+    return [symbol for symbol in symbols if symbol not in found]
 
 
 class UnifiedDataManager:
@@ -38,24 +111,75 @@ class UnifiedDataManager:
     - Crypto data: Polygon > Alpaca
 
     **Caching Strategy**:
-    - Historical data: Cache for 24 hours
+    - Two tiers: a size-bounded in-memory LRU (memory_cache_mb) in front of
+      the disk cache, each entry expiring after the TTL of its data type
+      (CACHE_TTL_HOURS)
+    - Historical data: Cache for 24 hours in memory; on disk stored permanently in a columnar bar store
+      (cache_dir/bars); a request fetches only the date ranges the store
+      does not cover yet. The current day is refetched until it is complete.
+    - Missing ranges are planned into the fewest upstream requests the
+      source allows (see FETCH_PROFILES) and fetched concurrently
     - Intraday data: Cache for 1 minute
     - Options chains: Cache for 5 minutes
-    - Real-time quotes: No caching
+    - Real-time quotes: No caching; with a quote_book fed by a stream,
+      get_latest_prices serves symbols quoted within quote_max_age seconds
+      from it and asks REST only for the rest
 
     **Rate Limiting**:
     - Automatic rate limit detection
     - Intelligent backoff
     - Queue management
+
+    **Coalescing**:
+    - Concurrent identical calls (same method and arguments) share one
+      in-flight upstream call and all receive its result
+    - With price_batch_window > 0, concurrent get_latest_prices calls for
+      different symbols within the window are merged into one request
+
+    **Async**:
+    - async_* methods use the aiohttp feeds for Polygon and Alpaca (sources
+      without an async feed run in the default executor)
+    - Call aclose() (or use "async with manager.async_session()") to
+      release the connection pools
     """
 
+    # Failover order of each request type
+    HISTORICAL_ROUTE = ["polygon", "yahoo"]
+    PRICES_ROUTE = ["alpaca", "polygon", "yahoo"]
+    # Bulk chain snapshot (quotes, greeks, IV) first, contracts reference
+    # for plans without snapshot access
+    OPTIONS_METHODS = ["get_options_snapshot", "get_options_chain"]
+    NEWS_ROUTE = ["polygon", "alpaca"]
+
+    # Time-to-live of cached data, hours (real-time quotes are never cached)
+    CACHE_TTL_HOURS = {
+        "historical": 24,
+        "intraday": 1 / 60,
+        "options": 5 / 60,
+        "crypto": 1,
+    }
+
+    # Upstream request shape of each source, used by the fetch planner:
+    # symbols per request (None = any number) and whether a grouped daily
+    # endpoint returns every symbol of a day in one request
+    FETCH_PROFILES = {
+        "polygon": {"symbols_per_request": 1, "grouped_daily": True},
+        "alpaca": {"symbols_per_request": 100, "grouped_daily": False},
+        "yahoo": {"symbols_per_request": None, "grouped_daily": False},
+    }
+
     def __init__(
         self,
         alpaca_key: Optional[str] = None,
         alpaca_secret: Optional[str] = None,
         polygon_key: Optional[str] = None,
         cache_dir: str = ".cache",
-        enable_caching: bool = True
+        enable_caching: bool = True,
+        max_workers: int = 8,
+        memory_cache_mb: float = 256,
+        price_batch_window: float = 0.0,
+        quote_book: Optional[QuoteBook] = None,
+        quote_max_age: float = 2.0
     ):
         """
         Initialize unified data manager.
@@ -66,12 +190,44 @@ class UnifiedDataManager:
             polygon_key: Polygon API key
             cache_dir: Directory for cache files
             enable_caching: Enable data caching
+            max_workers: Upstream requests of a fetch plan run concurrently
+            memory_cache_mb: Byte budget of the in-memory cache tier, MB
+            price_batch_window: Seconds during which concurrent latest-price
+                calls are merged into one request (0 = no batching)
+            quote_book: Live quote book serving fresh latest prices
+            quote_max_age: Seconds a quote book price stays fresh
         """
         self.cache_dir = cache_dir
         self.enable_caching = enable_caching
-
+        self.max_workers = max(1, max_workers)
+
+        # Credentials of the lazily created async feeds
+        self._alpaca_credentials = (alpaca_key, alpaca_secret) \
+            if alpaca_key and alpaca_secret else None
+        self._polygon_key = polygon_key
+        self.async_sources: Dict[str, AsyncBaseDataFeed] = {}
+
+        # Request coalescing
+        self.single_flight = SingleFlight()
+        self.async_single_flight = AsyncSingleFlight()
+        self.price_batcher: Optional[PriceBatcher] = None
+        self.async_price_batcher: Optional[AsyncPriceBatcher] = None
+        if price_batch_window > 0:
+            self.price_batcher = PriceBatcher(self._fetch_latest_prices, price_batch_window)
+            self.async_price_batcher = AsyncPriceBatcher(
+                self._async_fetch_latest_prices, price_batch_window)
+
+        # Live prices
+        self.quote_book = quote_book
+        self.quote_max_age = quote_max_age
+        self.live_price_hits = 0
+        self.live_price_misses = 0
+
+        self.memory_cache = MemoryCache(int(memory_cache_mb * 2 ** 20) if enable_caching else 0)
+        self.bar_store: Optional[BarStore] = None
         if enable_caching:
             os.makedirs(cache_dir, exist_ok=True)
+            self.bar_store = BarStore(os.path.join(cache_dir, "bars"))
 
         # Initialize data sources
         self.sources: Dict[str, Optional[BaseDataFeed]] = {}
@@ -111,12 +267,16 @@ class UnifiedDataManager:
             logger.warning(f"Yahoo Finance initialization failed: {e}")
             self.sources["yahoo"] = None
 
-        # Cache statistics
+        # Cache statistics (the memory tier counts its own)
         self.cache_hits = 0
         self.cache_misses = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_evictions = 0
 
         logger.info("Unified Data Manager initialized")
 
+    @coalesced
     def get_historical_data(
         self,
         symbols: List[str],
@@ -128,6 +288,9 @@ class UnifiedDataManager:
         """
         Get historical data with intelligent source selection.
 
+        With caching enabled the bars are served from the bar store and only
+        the date ranges it does not cover yet are fetched upstream.
+
         Args:
             symbols: List of symbols
             start: Start date
@@ -138,39 +301,137 @@ class UnifiedDataManager:
         Returns:
             DataFrame with historical data
         """
+        if not self.enable_caching:
+            self.cache_misses += 1
+            return self._fetch_historical(symbols, start, end, timeframe, source)
+
         cache_key = f"hist_{'-'.join(symbols)}_{start.date()}_{end.date()}_{timeframe}"
+        cached_data = self.memory_cache.get(cache_key)
+        if cached_data is not None:
+            self.cache_hits += 1
+            return cached_data
+
+        gaps = self._missing_ranges(symbols, start, end, timeframe)
+        if not gaps:
+            self.cache_hits += 1
+            self.disk_hits += 1
+            logger.debug(f"Bar store hit: {len(symbols)} symbols {start.date()} - {end.date()}")
+        else:
+            self.cache_misses += 1
+            self.disk_misses += 1
+            selected = self._historical_source(source)
+            plan = self._plan_historical(gaps, timeframe, selected)
+
+            def run(request: FetchRequest) -> None:
+                if request.grouped:
+                    data = self._fetch_grouped(request, selected)
+                else:
+                    data = self._fetch_historical(
+                        request.symbols, _day_start(request.start), _day_start(request.end),
+                        timeframe, selected, whole_days=True)
+                self._store_bars(data, timeframe, request.start, request.end, request.symbols)
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(plan))) as executor:
+                list(executor.map(run, plan))
+
+        data = self.bar_store.read(symbols, start, end, timeframe)
+        if not data.empty:
+            self.memory_cache.put(cache_key, data, self._historical_ttl(timeframe))
+        return data
+
+    def _historical_ttl(self, timeframe: str) -> float:
+        """Memory tier TTL of historical bars, seconds."""
+        kind = "historical" if timeframe == "1Day" else "intraday"
+        return self.CACHE_TTL_HOURS[kind] * 3600
+
+    def _historical_source(self, source: Optional[str] = None) -> str:
+        """Forced source, else the first available one of HISTORICAL_ROUTE."""
+        if source:
+            return source
+        for name in self.HISTORICAL_ROUTE:
+            if self.sources.get(name):
+                return name
+        raise RuntimeError("No data sources available")
 
-        # Check cache
-        if self.enable_caching:
-            cached_data = self._load_from_cache(cache_key, max_age_hours=24)
-            if cached_data is not None:
-                self.cache_hits += 1
-                logger.debug(f"Cache hit: {cache_key}")
-                return cached_data
+    def _plan_historical(
+        self,
+        gaps: Dict[str, List[Tuple[date, date]]],
+        timeframe: str,
+        source: str
+    ) -> List[FetchRequest]:
+        """Plan the upstream requests of 'source' filling the gaps."""
+        profile = self.FETCH_PROFILES.get(source, {})
+        plan = plan_fetches(
+            gaps,
+            window_days=PolygonDataFeed.window_days(timeframe) if source == "polygon" else None,
+            symbols_per_request=profile.get("symbols_per_request"),
+            grouped_daily=profile.get("grouped_daily", False) and timeframe == "1Day"
+        )
+        grouped = sum(request.grouped for request in plan)
+        logger.info(f"Fetch plan for {len(gaps)} symbols from {source}: "
+                    f"{len(plan)} requests ({grouped} grouped daily)")
+        return plan
+
+    def _fetch_grouped(self, request: FetchRequest, source: str) -> pd.DataFrame:
+        """Fetch a grouped daily request, per symbol for symbols it lacks."""
+        day = _day_start(request.start)
+        try:
+            data = self.sources[source].get_grouped_daily([request.start], request.symbols)
+        except Exception as e:
+            logger.error(f"Failed to get grouped daily bars from {source}: {e}")
+            data = None
 
-        self.cache_misses += 1
+        data = self._check_grouped(data, request)
+        absent = _absent_symbols(data, request.symbols)
+        if not absent:
+            return data
+        fallback = self._fetch_historical(absent, day, day, "1Day", source, whole_days=True)
+        return _concat_bars([data, fallback])
 
-        # Select source
-        if source:
-            selected_source = source
-        else:
-            # Auto-select: Polygon > Yahoo
-            if self.sources.get("polygon"):
-                selected_source = "polygon"
-            elif self.sources.get("yahoo"):
-                selected_source = "yahoo"
-            else:
-                raise RuntimeError("No data sources available")
+    def _check_grouped(
+        self,
+        data: Optional[pd.DataFrame],
+        request: FetchRequest
+    ) -> Optional[pd.DataFrame]:
+        """
+        Classify a grouped daily response: None if the request failed.
 
-        # Get data
-        try:
-            feed = self.sources[selected_source]
-            data = feed.get_historical_data(symbols, start, end, timeframe)
+        An empty response for a complete day is a market holiday and is
+        marked covered for every requested symbol, since _store_bars has no
+        bars to record it with. For a day not yet complete the grouped file
+        may just be unpublished, so it counts as failed and every symbol is
+        fetched on its own.
+        """
+        if data is None or data.attrs.get("failed_days"):
+            return None
+        if data.empty:
+            if request.end > _complete_until():
+                return None
+            for symbol in request.symbols:
+                self.bar_store.mark_covered(symbol, "1Day", request.start, request.end)
+        return data
 
-            # Cache the result
-            if self.enable_caching and not data.empty:
-                self._save_to_cache(cache_key, data)
+    def _fetch_historical(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str,
+        source: Optional[str] = None,
+        whole_days: bool = False
+    ) -> pd.DataFrame:
+        """
+        Fetch historical data upstream, failing over along HISTORICAL_ROUTE.
 
+        With whole_days, 'end' is a day fetched in full whatever the
+        source's end convention (the bar store covers whole days).
+        """
+        selected_source = self._historical_source(source)
+        feed_end = _feed_end(selected_source, end.date()) if whole_days else end
+
+        try:
+            feed = self.sources[selected_source]
+            data = feed.get_historical_data(symbols, start, feed_end, timeframe)
             logger.info(f"Retrieved historical data from {selected_source}: {len(data)} rows")
             return data
 
@@ -180,10 +441,62 @@ class UnifiedDataManager:
             # Failover to alternative source
             if selected_source == "polygon" and self.sources.get("yahoo"):
                 logger.info("Failing over to Yahoo Finance")
-                return self.get_historical_data(symbols, start, end, timeframe, source="yahoo")
+                return self._fetch_historical(symbols, start, end, timeframe, source="yahoo",
+                                              whole_days=whole_days)
 
             return pd.DataFrame()
 
+    def _missing_ranges(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str
+    ) -> Dict[str, List[Tuple[date, date]]]:
+        """
+        Date ranges of each symbol the bar store does not cover.
+
+        Ranges without a business day are marked covered right away instead
+        of being fetched (there are no stock bars to get).
+
+        Returns:
+            Dictionary symbol -> missing inclusive date intervals (symbols
+            without gaps are left out)
+        """
+        gaps = {}
+        for symbol in symbols:
+            intervals = []
+            for gap_start, gap_end in self.bar_store.missing(symbol, start, end, timeframe):
+                if gap_end <= _complete_until() and \
+                        np.busday_count(gap_start, gap_end + timedelta(days=1)) == 0:
+                    self.bar_store.mark_covered(symbol, timeframe, gap_start, gap_end)
+                else:
+                    intervals.append((gap_start, gap_end))
+            if intervals:
+                gaps[symbol] = intervals
+        return gaps
+
+    def _store_bars(
+        self,
+        data: pd.DataFrame,
+        timeframe: str,
+        start: date,
+        end: date,
+        symbols: List[str]
+    ) -> None:
+        """
+        Write fetched bars to the store; days not yet complete and windows
+        the feed failed to fetch stay uncovered.
+        """
+        if data is None or data.empty:
+            return
+        try:
+            self.bar_store.write(data, timeframe, start, min(end, _complete_until()), symbols,
+                                 failed=data.attrs.get("failed_windows"))
+        except Exception as e:
+            logger.warning(f"Failed to store bars: {e}")
+
+    @coalesced
     def get_latest_prices(
         self,
         symbols: List[str],
@@ -199,6 +512,38 @@ class UnifiedDataManager:
         Returns:
             Series with latest prices
         """
+        live, symbols = self._live_prices(symbols, source)
+        if not symbols:
+            return live
+
+        if source is None and self.price_batcher is not None:
+            prices = self.price_batcher.get(symbols)
+        else:
+            prices = self._fetch_latest_prices(symbols, source)
+        return pd.concat([live, prices]) if len(live) else prices
+
+    def _live_prices(
+        self,
+        symbols: List[str],
+        source: Optional[str] = None
+    ) -> Tuple[pd.Series, List[str]]:
+        """Fresh quote book prices, and the symbols still to fetch."""
+        if source is not None or self.quote_book is None:
+            return pd.Series(dtype=float), symbols
+
+        live = self.quote_book.get_latest_prices(symbols, self.quote_max_age)
+        missing = [symbol for symbol in symbols if symbol not in live.index]
+
+        self.live_price_hits += len(live)
+        self.live_price_misses += len(missing)
+        return live, missing
+
+    def _fetch_latest_prices(
+        self,
+        symbols: List[str],
+        source: Optional[str] = None
+    ) -> pd.Series:
+        """Fetch latest prices upstream, failing over along PRICES_ROUTE."""
         # Select source: Alpaca > Polygon > Yahoo
         if source:
             selected_source = source
@@ -222,12 +567,13 @@ class UnifiedDataManager:
 
             # Failover
             if selected_source == "alpaca" and self.sources.get("polygon"):
-                return self.get_latest_prices(symbols, source="polygon")
+                return self._fetch_latest_prices(symbols, source="polygon")
             elif selected_source == "polygon" and self.sources.get("yahoo"):
-                return self.get_latest_prices(symbols, source="yahoo")
+                return self._fetch_latest_prices(symbols, source="yahoo")
 
             return pd.Series()
 
+    @coalesced
     def get_options_chain(
         self,
         underlying_symbol: str,
@@ -254,7 +600,7 @@ class UnifiedDataManager:
 
         # Check cache (5 minute expiry for options)
         if self.enable_caching:
-            cached_data = self._load_from_cache(cache_key, max_age_hours=0.083)  # 5 minutes
+            cached_data = self._load_from_cache(cache_key, self.CACHE_TTL_HOURS["options"])
             if cached_data is not None:
                 self.cache_hits += 1
                 return cached_data
@@ -264,16 +610,19 @@ class UnifiedDataManager:
         # Get from Polygon
         try:
             polygon = self.sources["polygon"]
-            chain = polygon.get_options_chain(
-                underlying_symbol,
-                expiration_date,
-                strike_price,
-                option_type
-            )
+            chain = pd.DataFrame()
+            for method in self.OPTIONS_METHODS:
+                if chain.empty and hasattr(polygon, method):
+                    chain = getattr(polygon, method)(
+                        underlying_symbol,
+                        expiration_date,
+                        strike_price,
+                        option_type
+                    )
 
             # Cache
             if self.enable_caching and not chain.empty:
-                self._save_to_cache(cache_key, chain)
+                self._save_to_cache(cache_key, chain, self.CACHE_TTL_HOURS["options"])
 
             logger.info(f"Retrieved options chain: {len(chain)} contracts")
             return chain
@@ -282,6 +631,29 @@ class UnifiedDataManager:
             logger.error(f"Failed to get options chain: {e}")
             return pd.DataFrame()
 
+    def get_option_chain(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> OptionChain:
+        """
+        Get options chain as a columnar OptionChain (Polygon only).
+
+        Args:
+            underlying_symbol: Underlying symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type
+
+        Returns:
+            OptionChain (contract objects are created on demand)
+        """
+        chain = self.get_options_chain(underlying_symbol, expiration_date, strike_price, option_type)
+        return OptionChain.from_frame(chain, underlying=underlying_symbol)
+
+    @coalesced
     def get_crypto_data(
         self,
         from_currency: str,
@@ -307,10 +679,11 @@ class UnifiedDataManager:
             raise RuntimeError("Polygon is required for crypto data")
 
         cache_key = f"crypto_{from_currency}{to_currency}_{start.date()}_{end.date()}_{timeframe}"
+        ttl_hours = self.CACHE_TTL_HOURS["crypto" if timeframe == "1Day" else "intraday"]
 
         # Check cache
         if self.enable_caching:
-            cached_data = self._load_from_cache(cache_key, max_age_hours=1)
+            cached_data = self._load_from_cache(cache_key, ttl_hours)
             if cached_data is not None:
                 self.cache_hits += 1
                 return cached_data
@@ -323,7 +696,7 @@ class UnifiedDataManager:
 
             # Cache
             if self.enable_caching and not data.empty:
-                self._save_to_cache(cache_key, data)
+                self._save_to_cache(cache_key, data, ttl_hours)
 
             logger.info(f"Retrieved crypto data: {len(data)} bars")
             return data
@@ -332,6 +705,7 @@ class UnifiedDataManager:
             logger.error(f"Failed to get crypto data: {e}")
             return pd.DataFrame()
 
+    @coalesced
     def get_news(
         self,
         symbol: Optional[str] = None,
@@ -361,8 +735,371 @@ class UnifiedDataManager:
             logger.error(f"Failed to get news: {e}")
             return []
 
-    def _save_to_cache(self, key: str, data: Any) -> None:
-        """Save data to cache."""
+    # Async facade
+
+    def _get_async_source(self, name: str) -> Optional[AsyncBaseDataFeed]:
+        """Get (creating it on first use) the async feed of a source."""
+        if not AIOHTTP_AVAILABLE:
+            return None
+
+        feed = self.async_sources.get(name)
+        if feed is None:
+            if name == "polygon" and self._polygon_key:
+                feed = AsyncPolygonDataFeed(self._polygon_key)
+            elif name == "alpaca" and self._alpaca_credentials:
+                feed = AsyncAlpacaDataFeed(*self._alpaca_credentials)
+            if feed is not None:
+                self.async_sources[name] = feed
+
+        return feed
+
+    def _async_available(self, name: str) -> bool:
+        return (self.sources.get(name) is not None
+                or (AIOHTTP_AVAILABLE and name in ("polygon", "alpaca")
+                    and self._get_async_source(name) is not None))
+
+    async def _async_call(self, name: str, method: str, *args) -> Any:
+        """Call a feed method on the async feed, or on the sync feed in a thread."""
+        feed = self._get_async_source(name)
+        if feed is not None:
+            return await getattr(feed, method)(*args)
+
+        sync_feed = self.sources.get(name)
+        if sync_feed is None:
+            raise RuntimeError(f"Data source {name} not available")
+
+        return await self._in_thread(getattr(sync_feed, method), *args)
+
+    @staticmethod
+    async def _in_thread(func: Callable[..., Any], *args) -> Any:
+        """Run blocking work (sync feeds, disk I/O) off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args))
+
+    async def _async_failover(
+        self,
+        route: List[str],
+        method: str,
+        *args,
+        args_for: Optional[Callable[[str], tuple]] = None
+    ) -> Tuple[Optional[str], Any]:
+        """
+        Try the sources of 'route' in order until one returns data.
+
+        'args_for', if given, builds the arguments for each source instead
+        of 'args'.
+
+        Returns:
+            (source name, result), (None, None) if every source failed
+        """
+        for name in route:
+            if not self._async_available(name):
+                continue
+            try:
+                result = await self._async_call(name, method, *(args_for(name) if args_for else args))
+            except Exception as e:
+                logger.error(f"Failed to get data from {name}: {e}")
+                continue
+
+            if result is not None and len(result) > 0:
+                return name, result
+            logger.warning(f"No data from {name}, failing over")
+
+        return None, None
+
+    @coalesced
+    async def async_get_historical_data(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str = "1Day",
+        source: Optional[str] = None,
+        sources: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Async get_historical_data.
+
+        Args:
+            symbols: List of symbols
+            start: Start date
+            end: End date
+            timeframe: Timeframe
+            source: Force specific source (None = auto-select)
+            sources: Fan out: split the symbols across these sources and
+                fetch the parts concurrently, each failing over to the
+                usual route (spreads a large universe over several rate
+                limits)
+
+        Returns:
+            DataFrame with historical data
+        """
+        if not self.enable_caching:
+            self.cache_misses += 1
+            return await self._async_fetch_historical(
+                symbols, start, end, timeframe, source, sources)
+
+        cache_key = f"hist_{'-'.join(symbols)}_{start.date()}_{end.date()}_{timeframe}"
+        cached_data = self.memory_cache.get(cache_key)
+        if cached_data is not None:
+            self.cache_hits += 1
+            return cached_data
+
+        gaps = await self._in_thread(self._missing_ranges, symbols, start, end, timeframe)
+        if not gaps:
+            self.cache_hits += 1
+            self.disk_hits += 1
+        else:
+            self.cache_misses += 1
+            self.disk_misses += 1
+            fan_out = [name for name in (sources or []) if self._async_available(name)]
+            selected = source or next(
+                (name for name in fan_out + self.HISTORICAL_ROUTE if self._async_available(name)),
+                None)
+            if selected is None:
+                raise RuntimeError("No data sources available")
+            plan = self._plan_historical(gaps, timeframe, selected)
+
+            # spread the requests over the fan-out sources
+            results = await asyncio.gather(*(
+                self._async_fetch_request(
+                    request, timeframe, source,
+                    fan_out[i % len(fan_out):] + fan_out[:i % len(fan_out)] if fan_out else None)
+                for i, request in enumerate(plan)
+            ))
+            for request, data in zip(plan, results):
+                await self._in_thread(
+                    self._store_bars, data, timeframe, request.start, request.end, request.symbols)
+
+        data = await self._in_thread(self.bar_store.read, symbols, start, end, timeframe)
+        if not data.empty:
+            self.memory_cache.put(cache_key, data, self._historical_ttl(timeframe))
+        return data
+
+    async def _async_fetch_request(
+        self,
+        request: FetchRequest,
+        timeframe: str,
+        source: Optional[str] = None,
+        sources: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Fetch one planned request (grouped daily requests go to Polygon)."""
+        day = _day_start(request.start)
+        if not request.grouped:
+            return await self._async_fetch_historical(
+                request.symbols, day, _day_start(request.end), timeframe, source, sources,
+                whole_days=True)
+
+        try:
+            data = await self._async_call(
+                "polygon", "get_grouped_daily", [request.start], request.symbols)
+        except Exception as e:
+            logger.error(f"Failed to get grouped daily bars from polygon: {e}")
+            data = None
+
+        data = await self._in_thread(self._check_grouped, data, request)
+        absent = _absent_symbols(data, request.symbols)
+        if not absent:
+            return data
+        fallback = await self._async_fetch_historical(
+            absent, day, day, "1Day", "polygon", whole_days=True)
+        return _concat_bars([data, fallback])
+
+    async def _async_fetch_historical(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str,
+        source: Optional[str] = None,
+        sources: Optional[List[str]] = None,
+        whole_days: bool = False
+    ) -> pd.DataFrame:
+        """
+        Fetch historical data upstream, fanning out over 'sources'.
+
+        With whole_days, 'end' is a day fetched in full whatever the
+        source's end convention.
+        """
+        fan_out = [name for name in (sources or []) if self._async_available(name)]
+
+        def arguments(part: List[str]) -> Callable[[str], tuple]:
+            def args_for(name: str) -> tuple:
+                return part, start, _feed_end(name, end.date()) if whole_days else end, timeframe
+            return args_for
+
+        if len(fan_out) > 1 and len(symbols) > 1:
+            parts = [symbols[i::len(fan_out)] for i in range(len(fan_out))]
+            results = await asyncio.gather(*(
+                self._async_failover(
+                    [name] + [n for n in self.HISTORICAL_ROUTE if n != name],
+                    "get_historical_data", args_for=arguments(part))
+                for name, part in zip(fan_out, parts) if part
+            ))
+            frames = [data for _, data in results if data is not None]
+            return _concat_bars(frames)
+
+        route = [source] if source else \
+            fan_out + [name for name in self.HISTORICAL_ROUTE if name not in fan_out]
+        selected, data = await self._async_failover(
+            route, "get_historical_data", args_for=arguments(symbols))
+        if data is None:
+            return pd.DataFrame()
+
+        logger.info(f"Retrieved historical data from {selected}: {len(data)} rows")
+        return data
+
+    @coalesced
+    async def async_get_latest_prices(
+        self,
+        symbols: List[str],
+        source: Optional[str] = None
+    ) -> pd.Series:
+        """
+        Async get_latest_prices (Alpaca > Polygon > Yahoo).
+
+        Args:
+            symbols: List of symbols
+            source: Force specific source
+
+        Returns:
+            Series with latest prices
+        """
+        live, symbols = self._live_prices(symbols, source)
+        if not symbols:
+            return live
+
+        if source is None and self.async_price_batcher is not None:
+            prices = await self.async_price_batcher.get(symbols)
+        else:
+            prices = await self._async_fetch_latest_prices(symbols, source)
+        return pd.concat([live, prices]) if len(live) else prices
+
+    async def _async_fetch_latest_prices(
+        self,
+        symbols: List[str],
+        source: Optional[str] = None
+    ) -> pd.Series:
+        """Fetch latest prices upstream, failing over along PRICES_ROUTE."""
+        route = [source] if source else self.PRICES_ROUTE
+        _, prices = await self._async_failover(route, "get_latest_prices", symbols)
+        return prices if prices is not None else pd.Series()
+
+    @coalesced
+    async def async_get_options_chain(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Async get_options_chain (Polygon only).
+
+        Args:
+            underlying_symbol: Underlying symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type
+
+        Returns:
+            DataFrame with options
+        """
+        if not self._async_available("polygon"):
+            raise RuntimeError("Polygon is required for options data")
+
+        cache_key = f"options_{underlying_symbol}_{expiration_date}_{strike_price}_{option_type}"
+
+        if self.enable_caching:
+            cached_data = await self._in_thread(
+                self._load_from_cache, cache_key, self.CACHE_TTL_HOURS["options"])
+            if cached_data is not None:
+                self.cache_hits += 1
+                return cached_data
+
+        self.cache_misses += 1
+
+        chain = None
+        for method in self.OPTIONS_METHODS:
+            _, chain = await self._async_failover(
+                ["polygon"], method,
+                underlying_symbol, expiration_date, strike_price, option_type)
+            if chain is not None:
+                break
+        if chain is None:
+            return pd.DataFrame()
+
+        if self.enable_caching:
+            await self._in_thread(
+                self._save_to_cache, cache_key, chain, self.CACHE_TTL_HOURS["options"])
+
+        logger.info(f"Retrieved options chain: {len(chain)} contracts")
+        return chain
+
+    async def async_get_option_chain(
+        self,
+        underlying_symbol: str,
+        expiration_date: Optional[datetime] = None,
+        strike_price: Optional[float] = None,
+        option_type: Optional[str] = None
+    ) -> OptionChain:
+        """
+        Async get_option_chain (Polygon only).
+
+        Args:
+            underlying_symbol: Underlying symbol
+            expiration_date: Filter by expiration
+            strike_price: Filter by strike
+            option_type: Filter by type
+
+        Returns:
+            OptionChain (contract objects are created on demand)
+        """
+        chain = await self.async_get_options_chain(
+            underlying_symbol, expiration_date, strike_price, option_type)
+        return OptionChain.from_frame(chain, underlying=underlying_symbol)
+
+    @coalesced
+    async def async_get_news(
+        self,
+        symbol: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Async get_news (Polygon > Alpaca).
+
+        Args:
+            symbol: Filter by symbol
+            limit: Number of articles
+
+        Returns:
+            List of news articles
+        """
+        _, news = await self._async_failover(self.NEWS_ROUTE, "get_news", symbol, limit)
+        return news or []
+
+    async def aclose(self) -> None:
+        """Close the connection pools of the async feeds."""
+        for feed in self.async_sources.values():
+            await feed.disconnect()
+        self.async_sources = {}
+
+    def async_session(self) -> "_AsyncSession":
+        """
+        Async context manager closing the async feeds on exit.
+
+        Example:
+            async with manager.async_session():
+                bars, prices = await asyncio.gather(
+                    manager.async_get_historical_data(symbols, start, end),
+                    manager.async_get_latest_prices(symbols),
+                )
+        """
+        return _AsyncSession(self)
+
+    def _save_to_cache(self, key: str, data: Any, max_age_hours: float) -> None:
+        """Save data to the memory and disk caches."""
+        self.memory_cache.put(key, data, max_age_hours * 3600)
         try:
             cache_path = os.path.join(self.cache_dir, f"{key}.pkl")
             with open(cache_path, "wb") as f:
@@ -374,11 +1111,16 @@ class UnifiedDataManager:
             logger.warning(f"Failed to save cache: {e}")
 
     def _load_from_cache(self, key: str, max_age_hours: float) -> Optional[Any]:
-        """Load data from cache if not expired."""
+        """Load data from the memory cache, else from disk if not expired."""
+        data = self.memory_cache.get(key)
+        if data is not None:
+            return data
+
         try:
             cache_path = os.path.join(self.cache_dir, f"{key}.pkl")
 
             if not os.path.exists(cache_path):
+                self.disk_misses += 1
                 return None
 
             with open(cache_path, "rb") as f:
@@ -388,33 +1130,73 @@ class UnifiedDataManager:
             age_hours = (datetime.now() - cache_data["timestamp"]).total_seconds() / 3600
 
             if age_hours <= max_age_hours:
+                self.disk_hits += 1
+                # Promote for the rest of its lifetime
+                self.memory_cache.put(key, cache_data["data"], (max_age_hours - age_hours) * 3600)
                 return cache_data["data"]
             else:
                 # Expired
                 os.remove(cache_path)
+                self.disk_misses += 1
+                self.disk_evictions += 1
                 return None
 
         except Exception as e:
             logger.warning(f"Failed to load cache: {e}")
+            self.disk_misses += 1
             return None
 
     def get_cache_stats(self) -> Dict[str, Any]:
-        """Get caching statistics."""
+        """Get caching statistics, overall and per tier."""
         total_requests = self.cache_hits + self.cache_misses
         hit_rate = self.cache_hits / total_requests if total_requests > 0 else 0
+        disk_requests = self.disk_hits + self.disk_misses
 
-        return {
+        stats = {
             "cache_hits": self.cache_hits,
             "cache_misses": self.cache_misses,
             "hit_rate": hit_rate,
-            "total_requests": total_requests
+            "total_requests": total_requests,
+            "memory": self.memory_cache.get_stats(),
+            "disk": {
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "hit_rate": self.disk_hits / disk_requests if disk_requests else 0,
+                "evictions": self.disk_evictions,
+            }
+        }
+        if self.bar_store is not None:
+            stats["bar_store"] = self.bar_store.get_stats()
+        stats["coalescing"] = {
+            "sync": self.single_flight.get_stats(),
+            "async": self.async_single_flight.get_stats(),
         }
+        if self.price_batcher is not None:
+            stats["coalescing"]["price_batches"] = self.price_batcher.get_stats()
+            stats["coalescing"]["async_price_batches"] = self.async_price_batcher.get_stats()
+        if self.quote_book is not None:
+            stats["quote_book"] = dict(
+                self.quote_book.get_stats(),
+                served=self.live_price_hits,
+                fetched=self.live_price_misses,
+            )
+        return stats
 
     def clear_cache(self) -> None:
-        """Clear all cached data."""
+        """Clear all cached data and reset the statistics."""
+        self.memory_cache.clear()
+        self.cache_hits = self.cache_misses = 0
+        self.disk_hits = self.disk_misses = self.disk_evictions = 0
+
         if os.path.exists(self.cache_dir):
             for file in os.listdir(self.cache_dir):
-                os.remove(os.path.join(self.cache_dir, file))
+                path = os.path.join(self.cache_dir, file)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            if self.bar_store is not None:
+                self.bar_store = BarStore(self.bar_store.root)
             logger.info("Cache cleared")
 
     def get_available_sources(self) -> List[str]:
@@ -435,3 +1217,16 @@ class UnifiedDataManager:
                     health[name] = False
 
         return health
+
+
+class _AsyncSession:
+    """Async context manager returned by UnifiedDataManager.async_session."""
+
+    def __init__(self, manager: UnifiedDataManager):
+        self.manager = manager
+
+    async def __aenter__(self) -> UnifiedDataManager:
+        return self.manager
+
+    async def __aexit__(self, *exc) -> None:
+        await self.manager.aclose()
@@ -8,6 +8,7 @@ import pandas as pd
 from loguru import logger
 
 from alphalens.data.base import BaseDataFeed
+from alphalens.data.rate_limit import get_rate_limiter
 
 try:
     import yfinance as yf
@@ -19,13 +20,28 @@ except ImportError:
 class YahooDataFeed(BaseDataFeed):
     """Yahoo Finance data feed (historical data only)."""
 
-    def __init__(self):
-        """Initialize Yahoo Finance data feed."""
+    def __init__(
+        self,
+        calls_per_minute: int = 60,
+        rate_limit_path: Optional[str] = None
+    ):
+        """
+        Initialize Yahoo Finance data feed.
+
+        Args:
+            calls_per_minute: Request budget (Yahoo publishes no limit but
+                throttles bursts)
+            rate_limit_path: State file shared across processes
+        """
         if not YFINANCE_AVAILABLE:
             raise ImportError("yfinance not installed. Run: pip install yfinance")
 
         super().__init__({})
 
+        self.rate_limiter = get_rate_limiter(
+            "yahoo", calls_per_minute, path=rate_limit_path
+        )
+
     def connect(self) -> bool:
         """Connect (no-op for Yahoo Finance)."""
         self.connected = True
@@ -57,6 +73,7 @@ class YahooDataFeed(BaseDataFeed):
         interval = interval_map.get(timeframe, "1d")
 
         # Download data for all symbols
+        self.rate_limiter.acquire()
         data = yf.download(
             tickers=symbols,
             start=start,
@@ -86,6 +103,7 @@ class YahooDataFeed(BaseDataFeed):
 
         prices = {}
         for symbol in symbols:
+            self.rate_limiter.acquire()
             ticker = yf.Ticker(symbol)
             info = ticker.info
             prices[symbol] = info.get('regularMarketPrice', info.get('previousClose', 0))
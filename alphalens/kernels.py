@@ -0,0 +1,340 @@
+"""
+Optional JIT-compiled kernels for the alphalens analytics core.
+
+The inner loops behind ``utils.quantize_factor``,
+``performance.factor_information_coefficient``,
+``performance.factor_rank_autocorrelation`` and
+``performance.mean_return_by_quantile`` all work on contiguous segments of
+rows (one segment per date, or per date/quantile).  This module implements
+those loops over plain NumPy arrays.  When numba is installed
+(``pip install alpha-lens[numba]``) the kernels are compiled on first use and
+the machine code is cached on disk, so later sessions start without paying
+the compilation cost again.  Without numba the library keeps using the pandas
+implementations and the kernels below remain plain (slow) Python, which is
+what the equivalence tests run against.
+
+Set the ``ALPHALENS_DISABLE_NUMBA`` environment variable, or call
+``set_enabled(False)``, to force the pandas code paths.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+_ENABLED = not os.environ.get('ALPHALENS_DISABLE_NUMBA')
+
+
+def _jit(func):
+    """
+    Compile 'func' lazily with numba (cached on disk) if available.
+    """
+    if NUMBA_AVAILABLE:
+        return numba.njit(cache=True, nogil=True)(func)
+    return func
+
+
+def enabled():
+    """
+    Whether the analytics functions should dispatch to the compiled kernels.
+
+    Returns
+    -------
+    bool
+        True if numba is installed and the kernels have not been disabled.
+    """
+    return NUMBA_AVAILABLE and _ENABLED
+
+
+def set_enabled(flag):
+    """
+    Globally enable or disable the compiled kernels.
+
+    Parameters
+    ----------
+    flag : bool
+        If False, the pandas implementations are always used.
+    """
+    global _ENABLED
+    _ENABLED = bool(flag)
+
+
+#
+# Compiled kernels. They only use the subset of NumPy supported by numba and
+# assume the input has already been sorted so that every segment
+# [starts[i], starts[i + 1]) is contiguous.
+#
+
+@_jit
+def _rank_segment(seg, out):
+    """
+    Average ranks (1-based, ties get the mean rank) of 'seg' written to 'out'.
+    NaNs are left unranked, as pandas.Series.rank does.
+    """
+    m = seg.shape[0]
+    order = np.argsort(seg, kind='mergesort')
+    i = 0
+    while i < m:
+        v = seg[order[i]]
+        if np.isnan(v):
+            for k in range(i, m):
+                out[order[k]] = np.nan
+            break
+        j = i
+        while j + 1 < m and seg[order[j + 1]] == v:
+            j += 1
+        r = 0.5 * (i + j) + 1.0
+        for k in range(i, j + 1):
+            out[order[k]] = r
+        i = j + 1
+
+
+@_jit
+def segment_rank(values, starts):
+    """
+    Average rank of each value within its segment.
+    """
+    out = np.empty(values.shape[0])
+    for s in range(starts.shape[0] - 1):
+        lo = starts[s]
+        hi = starts[s + 1]
+        _rank_segment(values[lo:hi], out[lo:hi])
+    return out
+
+
+@_jit
+def _pearson(x, y):
+    n = x.shape[0]
+    if n < 2:
+        return np.nan
+    mx = x.mean()
+    my = y.mean()
+    sxy = 0.0
+    sxx = 0.0
+    syy = 0.0
+    for i in range(n):
+        dx = x[i] - mx
+        dy = y[i] - my
+        sxy += dx * dy
+        sxx += dx * dx
+        syy += dy * dy
+    if sxx == 0.0 or syy == 0.0:
+        return np.nan
+    return sxy / np.sqrt(sxx * syy)
+
+
+@_jit
+def segment_spearman(x, y, starts):
+    """
+    Spearman rank correlation between 'x' and every column of 'y', computed
+    separately for each segment.  Returns an array (n_segments, n_columns).
+    """
+    nseg = starts.shape[0] - 1
+    ncol = y.shape[1]
+    out = np.empty((nseg, ncol))
+    for s in range(nseg):
+        lo = starts[s]
+        hi = starts[s + 1]
+        rx = np.empty(hi - lo)
+        _rank_segment(x[lo:hi], rx)
+        ry = np.empty(hi - lo)
+        for c in range(ncol):
+            _rank_segment(np.ascontiguousarray(y[lo:hi, c]), ry)
+            out[s, c] = _pearson(rx, ry)
+    return out
+
+
+@_jit
+def segment_qcut(values, starts, fractions):
+    """
+    Quantile bucket (1-based) of every value within its segment, mirroring
+    ``pd.qcut(x, fractions, labels=False) + 1``.  Segments whose quantile
+    edges are not unique get NaN labels and are flagged in the returned
+    'failed' array.
+    """
+    n = values.shape[0]
+    nseg = starts.shape[0] - 1
+    nedges = fractions.shape[0]
+    out = np.empty(n)
+    failed = np.zeros(nseg, dtype=np.bool_)
+    edges = np.empty(nedges)
+    for s in range(nseg):
+        lo = starts[s]
+        hi = starts[s + 1]
+        m = hi - lo
+        srt = np.sort(values[lo:hi])
+        for e in range(nedges):
+            pos = fractions[e] * (m - 1)
+            i = int(np.floor(pos))
+            frac = pos - i
+            if frac == 0.0 or i + 1 >= m:
+                edges[e] = srt[min(i, m - 1)]
+            else:
+                edges[e] = srt[i] + (srt[i + 1] - srt[i]) * frac
+        unique = True
+        for e in range(1, nedges):
+            if edges[e] == edges[e - 1]:
+                unique = False
+                break
+        if not unique:
+            failed[s] = True
+            for k in range(lo, hi):
+                out[k] = np.nan
+            continue
+        for k in range(lo, hi):
+            v = values[k]
+            # bins are right-closed, the first one also includes its left edge
+            b = np.searchsorted(edges, v)
+            if b == 0:
+                b = 1
+            if b >= nedges or v < edges[0]:
+                out[k] = np.nan
+            else:
+                out[k] = b
+    return out, failed
+
+
+@_jit
+def grouped_moments(values, codes, ngroups):
+    """
+    NaN-skipping mean, sample standard deviation and count of every column
+    of 'values' for each group code.  Returns three (ngroups, n_columns)
+    arrays.
+    """
+    n = values.shape[0]
+    ncol = values.shape[1]
+    total = np.zeros((ngroups, ncol))
+    count = np.zeros((ngroups, ncol))
+    for i in range(n):
+        g = codes[i]
+        for c in range(ncol):
+            v = values[i, c]
+            if not np.isnan(v):
+                total[g, c] += v
+                count[g, c] += 1.0
+    mean = np.empty((ngroups, ncol))
+    for g in range(ngroups):
+        for c in range(ncol):
+            mean[g, c] = total[g, c] / count[g, c] \
+                if count[g, c] > 0 else np.nan
+    sqdev = np.zeros((ngroups, ncol))
+    for i in range(n):
+        g = codes[i]
+        for c in range(ncol):
+            v = values[i, c]
+            if not np.isnan(v):
+                d = v - mean[g, c]
+                sqdev[g, c] += d * d
+    std = np.empty((ngroups, ncol))
+    for g in range(ngroups):
+        for c in range(ncol):
+            std[g, c] = np.sqrt(sqdev[g, c] / (count[g, c] - 1.0)) \
+                if count[g, c] > 1 else np.nan
+    return mean, std, count
+
+
+#
+# pandas-facing helpers
+#
+
+def segments(keys):
+    """
+    Sort order and segment boundaries for a grouping key.
+
+    Parameters
+    ----------
+    keys : array-like
+        Group label of each row (e.g. the 'date' index level).
+
+    Returns
+    -------
+    order : np.ndarray
+        Stable permutation that makes each group contiguous.
+    starts : np.ndarray
+        Segment boundaries into the reordered rows, len(uniques) + 1 long.
+    uniques : pd.Index
+        Sorted group labels, one per segment.
+    """
+    codes, uniques = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='mergesort')
+    starts = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(uniques)), out=starts[1:])
+    return order, starts, uniques
+
+
+def grouped_rank(values, keys):
+    """
+    Equivalent of ``values.groupby(keys).rank()`` for a numeric array.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    order, starts, _ = segments(keys)
+    ranks = np.empty(len(values))
+    ranks[order] = segment_rank(values[order], starts)
+    return ranks
+
+
+def grouped_spearman(x, y, keys):
+    """
+    Spearman correlation between 'x' and each column of 'y' within every
+    group of 'keys'.
+
+    Returns
+    -------
+    corr : np.ndarray
+        Array (n_groups, n_columns) of correlations.
+    uniques : pd.Index
+        Sorted group labels matching the rows of 'corr'.
+    """
+    order, starts, uniques = segments(keys)
+    x = np.asarray(x, dtype=np.float64)[order]
+    y = np.ascontiguousarray(np.asarray(y, dtype=np.float64)[order])
+    return segment_spearman(x, y, starts), uniques
+
+
+def grouped_qcut(values, keys, quantiles):
+    """
+    Equivalent of ``pd.qcut(x, quantiles, labels=False) + 1`` applied to
+    each group of 'keys'.
+
+    Returns
+    -------
+    labels : np.ndarray
+        Float quantile labels aligned with 'values', NaN where the group
+        edges were not unique.
+    failed : bool
+        True if at least one group had non-unique edges.
+    """
+    if isinstance(quantiles, int):
+        fractions = np.linspace(0, 1, quantiles + 1)
+    else:
+        fractions = np.asarray(quantiles, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    order, starts, _ = segments(keys)
+    labels = np.empty(len(values))
+    sorted_labels, failed = segment_qcut(values[order], starts, fractions)
+    labels[order] = sorted_labels
+    return labels, bool(failed.any())
+
+
+def warmup():
+    """
+    Compile (or load from the on-disk cache) all kernels up front, so that
+    the first analytics call does not include compilation time.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    x = np.arange(4, dtype=np.float64)
+    starts = np.array([0, 2, 4], dtype=np.int64)
+    segment_rank(x, starts)
+    segment_spearman(x, np.ascontiguousarray(np.stack([x, x], axis=1)),
+                     starts)
+    segment_qcut(x, starts, np.linspace(0, 1, 3))
+    grouped_moments(np.stack([x, x], axis=1),
+                    np.array([0, 0, 1, 1], dtype=np.int64), 2)
@@ -16,15 +16,19 @@
 import pandas as pd
 import numpy as np
 import warnings
+from numbers import Integral
 
 import empyrical as ep
 from pandas.tseries.offsets import BDay
 from scipy import stats
 from statsmodels.regression.linear_model import OLS
 from statsmodels.tools.tools import add_constant
+from . import kernels
+from . import profiling
 from . import utils
 
 
+@profiling.profiled
 def factor_information_coefficient(factor_data,
                                    group_adjust=False,
                                    by_group=False):
@@ -69,6 +73,13 @@ def factor_information_coefficient(factor_data,
     if by_group:
         grouper.append('group')
 
+    if kernels.enabled() and not by_group:
+        columns = utils.get_forward_returns_columns(factor_data.columns)
+        corr, dates = kernels.grouped_spearman(factor_data['factor'].values,
+                                               factor_data[columns].values,
+                                               grouper[0])
+        return pd.DataFrame(corr, index=dates.rename('date'), columns=columns)
+
     ic = factor_data.groupby(grouper).apply(src_ic)
 
     return ic
@@ -126,6 +137,7 @@ def mean_information_coefficient(factor_data,
     return ic
 
 
+@profiling.profiled
 def factor_weights(factor_data,
                    demeaned=True,
                    group_adjust=False,
@@ -205,6 +217,7 @@ def factor_weights(factor_data,
     return weights
 
 
+@profiling.profiled
 def factor_returns(factor_data,
                    demeaned=True,
                    group_adjust=False,
@@ -255,6 +268,7 @@ def factor_returns(factor_data,
     return returns
 
 
+@profiling.profiled
 def factor_alpha_beta(factor_data,
                       returns=None,
                       demeaned=True,
@@ -352,7 +366,48 @@ def cumulative_returns(returns):
     return ep.cum_returns(returns, starting_value=1)
 
 
-def positions(weights, period, freq=None):
+def _bar_positions(weights, period, bar_index=None):
+    """
+    positions() with a holding period of 'period' bars of 'bar_index'.
+
+    The weights held at a bar are the sum of the trades placed within the
+    last 'period' bars. Portfolio weights are reported at every trade and
+    at every bar where a trade expires.
+    """
+    if bar_index is None:
+        bar_index = weights.index
+    trade_pos = bar_index.get_indexer(weights.index)
+    if (trade_pos < 0).any():
+        raise ValueError("'bar_index' must contain every weights timestamp")
+
+    expiry_pos = trade_pos + period
+    out_pos = np.union1d(trade_pos, expiry_pos[expiry_pos < len(bar_index)])
+
+    #
+    # trades active at each output bar: those placed in (bar - period, bar]
+    #
+    first = np.searchsorted(trade_pos, out_pos - period, side='right')
+    last = np.searchsorted(trade_pos, out_pos, side='right')
+
+    values = weights.fillna(0).values
+    tot_weights = np.zeros((len(out_pos), values.shape[1]))
+    for lag in range((last - first).max(initial=0)):
+        row = last - 1 - lag
+        active = row >= first
+        tot_weights[active] += values[row[active]]
+
+    # every bar reported: keep the index (and its freq) as is
+    out_index = bar_index if len(out_pos) == len(bar_index) \
+        else bar_index[out_pos]
+    tot_weights = pd.DataFrame(tot_weights, index=out_index,
+                               columns=weights.columns)
+    tot_weights.index.name = weights.index.name
+    tot_weights = tot_weights.div(tot_weights.abs().sum(axis=1), axis=0)
+    return tot_weights.fillna(0)
+
+
+@profiling.profiled
+def positions(weights, period, freq=None, bar_index=None):
     """
     Builds net position values time series, the portfolio percentage invested
     in each position.
@@ -364,13 +419,22 @@ def positions(weights, period, freq=None):
         which the trades are computed and the values correspond to assets
         weights
         - see factor_weights for more details
-    period: pandas.Timedelta or string
+    period: pandas.Timedelta, string or int
         Assets holding period (1 day, 2 mins, 3 hours etc). It can be a
         Timedelta or a string in the format accepted by Timedelta constructor
-        ('1 days', '1D', '30m', '3h', '1D1h', etc)
+        ('1 days', '1D', '30m', '3h', '1D1h', etc). An integer is a number of
+        bars of 'bar_index': each trade is held for that many bars, which is
+        the way to go for intraday factors (see the 'intraday' option of
+        utils.compute_forward_returns). No calendar is needed in that case
+        and trades still open at the end of 'bar_index' are not unwound.
     freq : pandas DateOffset, optional
         Used to specify a particular trading calendar. If not present
-        weights.index.freq will be used
+        weights.index.freq will be used. Ignored when 'period' is an int
+    bar_index : pd.DatetimeIndex, optional
+        Only used when 'period' is an int: the bars (prices index) the
+        holding period is counted on. It must contain every weights
+        timestamp. If not given, the weights index itself is used, which is
+        only right if the factor has a value on every bar.
 
     Returns
     -------
@@ -387,6 +451,9 @@ def positions(weights, period, freq=None):
 
     weights = weights.unstack()
 
+    if isinstance(period, Integral):
+        return _bar_positions(weights, period, bar_index)
+
     if not isinstance(period, pd.Timedelta):
         period = pd.Timedelta(period)
 
@@ -407,6 +474,7 @@ def positions(weights, period, freq=None):
     trades_idx = weights.index.copy()
     returns_idx = utils.add_custom_calendar_timedelta(trades_idx, period, freq)
     weights_idx = trades_idx.union(returns_idx)
+    expiries = dict(zip(trades_idx, returns_idx))
 
     #
     # Compute portfolio weights for each point in time contained in the index
@@ -423,8 +491,7 @@ def positions(weights, period, freq=None):
         #
         if curr_time in weights.index:
             assets_weights = weights.loc[curr_time]
-            expire_ts = utils.add_custom_calendar_timedelta(curr_time,
-                                                            period, freq)
+            expire_ts = expiries[curr_time]
             active_weights.append((expire_ts, assets_weights))
 
         #
@@ -450,6 +517,7 @@ def positions(weights, period, freq=None):
     return portfolio_weights.fillna(0)
 
 
+@profiling.profiled
 def mean_return_by_quantile(factor_data,
                             by_date=False,
                             by_group=False,
@@ -497,9 +565,9 @@ def mean_return_by_quantile(factor_data,
     if by_group:
         grouper.append('group')
 
-    group_stats = factor_data.groupby(grouper)[
-        utils.get_forward_returns_columns(factor_data.columns)] \
-        .agg(['mean', 'std', 'count'])
+    group_stats = _mean_std_count(
+        factor_data, utils.get_forward_returns_columns(factor_data.columns),
+        grouper, by_group)
 
     mean_ret = group_stats.T.xs('mean', level=1).T
 
@@ -507,8 +575,8 @@ def mean_return_by_quantile(factor_data,
         grouper = [mean_ret.index.get_level_values('factor_quantile')]
         if by_group:
             grouper.append(mean_ret.index.get_level_values('group'))
-        group_stats = mean_ret.groupby(grouper)\
-            .agg(['mean', 'std', 'count'])
+        group_stats = _mean_std_count(mean_ret, mean_ret.columns, grouper,
+                                      by_group)
         mean_ret = group_stats.T.xs('mean', level=1).T
 
     std_error_ret = group_stats.T.xs('std', level=1).T \
@@ -517,6 +585,35 @@ def mean_return_by_quantile(factor_data,
     return mean_ret, std_error_ret
 
 
+def _mean_std_count(data, columns, grouper, by_group=False):
+    """
+    Equivalent of data.groupby(grouper)[columns].agg(['mean', 'std', 'count'])
+    using the compiled kernels when they are available. Categorical 'group'
+    keys always go through pandas.
+    """
+    grouped = data.groupby(grouper)
+
+    if not kernels.enabled() or by_group:
+        return grouped[columns].agg(['mean', 'std', 'count'])
+
+    codes = grouped.ngroup().values
+    if (codes < 0).any():
+        return grouped[columns].agg(['mean', 'std', 'count'])
+
+    keys = grouped.size().index
+    mean, std, count = kernels.grouped_moments(
+        data[columns].values.astype(np.float64), codes, len(keys))
+
+    stats = {}
+    for i, col in enumerate(columns):
+        stats[(col, 'mean')] = mean[:, i]
+        stats[(col, 'std')] = std[:, i]
+        stats[(col, 'count')] = count[:, i].astype(np.int64)
+    stats_columns = pd.MultiIndex.from_product([columns,
+                                                ['mean', 'std', 'count']])
+    return pd.DataFrame(stats, index=keys, columns=stats_columns)
+
+
 def compute_mean_returns_spread(mean_returns,
                                 upper_quant,
                                 lower_quant,
@@ -565,6 +662,7 @@ def compute_mean_returns_spread(mean_returns,
     return mean_return_difference, joint_std_err
 
 
+@profiling.profiled
 def quantile_turnover(quantile_factor, quantile, period=1):
     """
     Computes the proportion of names in a factor quantile that were
@@ -598,6 +696,7 @@ def quantile_turnover(quantile_factor, quantile, period=1):
     return quant_turnover
 
 
+@profiling.profiled
 def factor_rank_autocorrelation(factor_data, period=1):
     """
     Computes autocorrelation of mean factor ranks in specified time spans.
@@ -626,7 +725,12 @@ def factor_rank_autocorrelation(factor_data, period=1):
     """
     grouper = [factor_data.index.get_level_values('date')]
 
-    ranks = factor_data.groupby(grouper)['factor'].rank()
+    if kernels.enabled():
+        ranks = pd.Series(kernels.grouped_rank(factor_data['factor'].values,
+                                               grouper[0]),
+                          index=factor_data.index, name='factor')
+    else:
+        ranks = factor_data.groupby(grouper)['factor'].rank()
 
     asset_factor_rank = ranks.reset_index().pivot(index='date',
                                                   columns='asset',
@@ -727,6 +831,7 @@ def common_start_returns(factor,
     return pd.concat(all_returns, axis=1)
 
 
+@profiling.profiled
 def average_cumulative_return_by_quantile(factor_data,
                                           returns,
                                           periods_before=10,
@@ -939,7 +1044,8 @@ def factor_positions(factor_data,
                      group_neutral=False,
                      equal_weight=False,
                      quantiles=None,
-                     groups=None):
+                     groups=None,
+                     bar_index=None):
     """
     Simulate a portfolio using the factor in input and returns the assets
     positions as percentage of the total portfolio.
@@ -970,6 +1076,10 @@ def factor_positions(factor_data,
     groups: sequence[string], optional
         Use only specific groups in the computation. By default all groups
         are used
+    bar_index : pd.DatetimeIndex, optional
+        Intraday factor_data only: the price bars (prices.index). Each trade
+        is then held for the period's bar count of these bars, taken from
+        factor_data.attrs['period_bars'] or inferred from the bars.
 
     Returns
     -------
@@ -1002,6 +1112,19 @@ def factor_positions(factor_data,
     weights = \
         factor_weights(portfolio_data, long_short, group_neutral, equal_weight)
 
+    # intraday factor_data: hold for the period's bar count on the price bars
+    bars = factor_data.attrs.get('period_bars', {}).get(period)
+    if bar_index is not None:
+        if bars is None:
+            bars = int(round(pd.Timedelta(period) /
+                             utils.infer_bar_length(bar_index)))
+        return positions(weights, bars, bar_index=bar_index)
+
+    if bars is not None:
+        warnings.warn("'bar_index' not set, holding intraday trades for "
+                      "%d factor timestamps" % bars, UserWarning)
+        return positions(weights, bars)
+
     return positions(weights, period)
 
 
@@ -1013,7 +1136,8 @@ def create_pyfolio_input(factor_data,
                          equal_weight=False,
                          quantiles=None,
                          groups=None,
-                         benchmark_period='1D'):
+                         benchmark_period='1D',
+                         bar_index=None):
     """
     Simulate a portfolio using the input factor and returns the portfolio
     performance data properly formatted for Pyfolio analysis.
@@ -1071,6 +1195,8 @@ def create_pyfolio_input(factor_data,
         benchmark returns. More generally benchmark returns are computed as the
         factor universe returns traded at 'benchmark_period' frequency, equal
         weighting and long only
+    bar_index : pd.DatetimeIndex, optional
+        Intraday factor_data only: the price bars, see factor_positions
 
 
     Returns
@@ -1129,7 +1255,8 @@ def create_pyfolio_input(factor_data,
                                  group_neutral,
                                  equal_weight,
                                  quantiles,
-                                 groups)
+                                 groups,
+                                 bar_index)
     positions = positions.resample('1D').sum().fillna(method='ffill')
     positions = positions.div(positions.abs().sum(axis=1), axis=0).fillna(0)
     positions['cash'] = 1. - positions.sum(axis=1)
@@ -0,0 +1,217 @@
+"""
+Per-stage instrumentation for the alphalens pipeline.
+
+``get_clean_factor_and_forward_returns`` and the ``create_*_tear_sheet``
+functions report each of their internal stages (forward returns, calendar
+inference, merge, quantization, max_loss check, ...) to every active
+``Profiler``.  With no profiler active a stage costs a single attribute
+lookup, so the instrumentation can stay in place permanently.
+
+Example
+-------
+>>> with profiling.Profiler() as prof:
+...     factor_data = utils.get_clean_factor_and_forward_returns(factor,
+...                                                              prices)
+>>> prof.to_frame()
+
+To forward every stage to a metrics system pass a callback, which receives
+one record (a dict) per completed stage:
+
+>>> with profiling.Profiler(callback=lambda rec: statsd.timing(
+...         rec['stage'], rec['wall_time'])):
+...     tears.create_full_tear_sheet(factor_data)
+"""
+
+from functools import wraps
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+_state = threading.local()
+
+
+def _active():
+    return getattr(_state, 'profilers', None)
+
+
+class Profiler(object):
+    """
+    Collects timing, row counts and memory deltas of the stages executed in
+    the current thread while the profiler is active.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with each stage record as soon as the stage completes, e.g.
+        to emit it to a metrics sink.
+    track_memory : bool, optional
+        Record the traced memory delta of each stage. This starts
+        tracemalloc for the duration of the profiling session (if it was not
+        already running), which slows down the profiled code noticeably.
+    """
+
+    def __init__(self, callback=None, track_memory=False):
+        self.callback = callback
+        self.track_memory = track_memory
+        self.records = []
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        profilers = _active()
+        if profilers is None:
+            profilers = _state.profilers = []
+            _state.path = []
+        profilers.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _state.profilers.remove(self)
+        if not _state.profilers:
+            _state.profilers = None
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _record(self, record):
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def to_dict(self):
+        """
+        Stage totals keyed by stage name.
+
+        Returns
+        -------
+        dict
+            {stage: {'calls', 'wall_time', 'rows_in', 'rows_out',
+            'memory_delta'}}. Times and memory are summed over calls, row
+            counts are those of the last call.
+        """
+        totals = {}
+        for rec in self.records:
+            tot = totals.setdefault(rec['stage'], {'calls': 0,
+                                                   'wall_time': 0.0,
+                                                   'memory_delta': None})
+            tot['calls'] += 1
+            tot['wall_time'] += rec['wall_time']
+            tot['rows_in'] = rec['rows_in']
+            tot['rows_out'] = rec['rows_out']
+            if rec['memory_delta'] is not None:
+                tot['memory_delta'] = \
+                    (tot['memory_delta'] or 0) + rec['memory_delta']
+        return totals
+
+    def to_frame(self):
+        """
+        All stage records as a DataFrame, in completion order.
+        """
+        return pd.DataFrame(self.records,
+                            columns=['stage', 'wall_time', 'rows_in',
+                                     'rows_out', 'memory_delta', 'depth'])
+
+
+class _Stage(object):
+
+    __slots__ = ('name', 'rows_in', 'rows_out', '_profilers', '_path',
+                 '_start', '_mem')
+
+    def __init__(self, profilers, name, rows_in):
+        self._profilers = list(profilers)
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        _state.path.append(self.name)
+        self._path = '/'.join(_state.path)
+        self._mem = tracemalloc.get_traced_memory()[0] \
+            if tracemalloc.is_tracing() else None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall_time = time.perf_counter() - self._start
+        mem_delta = None
+        if self._mem is not None and tracemalloc.is_tracing():
+            mem_delta = tracemalloc.get_traced_memory()[0] - self._mem
+
+        record = {
+            'stage': self._path,
+            'wall_time': wall_time,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'memory_delta': mem_delta,
+            'depth': len(_state.path) - 1,
+        }
+        _state.path.pop()
+
+        for profiler in self._profilers:
+            profiler._record(record)
+
+
+class _NullStage(object):
+    """
+    Stand-in returned by stage() when no profiler is active.
+    """
+
+    __slots__ = ('rows_in', 'rows_out')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, rows_in=None):
+    """
+    Context manager timing a pipeline stage.
+
+    Parameters
+    ----------
+    name : str
+        Stage name. Nested stages are recorded as 'outer/inner'.
+    rows_in : int, optional
+        Number of input rows. The stage object returned by the context
+        manager has a writable 'rows_out' attribute.
+    """
+    profilers = _active()
+    if not profilers:
+        return _NULL_STAGE
+    return _Stage(profilers, name, rows_in)
+
+
+def _nrows(obj):
+    return len(obj) if isinstance(obj, (pd.Series, pd.DataFrame)) else None
+
+
+def profiled(func):
+    """
+    Decorator recording a call to 'func' as a stage named after it. Input
+    rows are taken from the first argument and output rows from the result,
+    when those are pandas objects.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        profilers = _active()
+        if not profilers:
+            return func(*args, **kwargs)
+
+        rows_in = _nrows(args[0]) if args else None
+        with _Stage(profilers, func.__name__, rows_in) as st:
+            result = func(*args, **kwargs)
+            st.rows_out = _nrows(result)
+        return result
+    return wrapper
@@ -2,9 +2,12 @@
 Options trading strategies.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
+import numpy as np
 from alphalens.assets.option import OptionAsset, OptionType, Greeks
+from alphalens.assets.option_pricing import black_scholes_greeks
+from alphalens.assets.vol_surface import VolatilitySurface
 from alphalens.assets.equity import EquityAsset
 from loguru import logger
 
@@ -78,42 +81,105 @@ class OptionsStrategy:
 
         return current_value - initial_value
 
-    def calculate_greeks(self, underlying_price: float, volatility: float) -> Optional[Greeks]:
+    def _option_legs(self) -> List[Position]:
+        return [pos for pos in self.positions if isinstance(pos.asset, OptionAsset)]
+
+    @staticmethod
+    def _leg_greeks(
+        options: List[Position],
+        underlying_price: float,
+        volatility: Union[float, VolatilitySurface]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Prices and Greeks of the option legs in one pass, each at its own vol.
+
+        With a surface, the legs are priced with the rates and valuation time
+        it was fitted with, so its volatilities match the other inputs.
+        """
+        strikes = np.array([pos.asset.strike for pos in options])
+        is_call = np.array([pos.asset.option_type == OptionType.CALL for pos in options])
+        if isinstance(volatility, VolatilitySurface):
+            surface = volatility
+            times = np.maximum(surface.time_to_expiry([pos.asset.expiry for pos in options]), 0.0)
+            return black_scholes_greeks(
+                underlying_price, strikes, times, surface.volatility(strikes, times), is_call,
+                surface.risk_free_rate, surface.dividend_yield
+            )
+        return black_scholes_greeks(
+            underlying_price,
+            strikes,
+            np.array([pos.asset.time_to_expiry() for pos in options]),
+            volatility,
+            is_call
+        )
+
+    def theoretical_value(
+        self,
+        underlying_price: float,
+        volatility: Union[float, VolatilitySurface]
+    ) -> float:
+        """
+        Black-Scholes value of the strategy.
+
+        Args:
+            underlying_price: Current underlying price
+            volatility: Implied volatility, or a VolatilitySurface giving
+                each leg the volatility of its strike and expiry (priced at
+                the surface's rates and valuation time)
+
+        Returns:
+            Total strategy value
+        """
+        total_value = 0.0
+
+        options = self._option_legs()
+        if options:
+            prices = self._leg_greeks(options, underlying_price, volatility)["price"]
+            for pos, price in zip(options, prices):
+                total_value += pos.asset.calculate_value(pos.quantity, float(price))
+
+        for pos in self.positions:
+            if isinstance(pos.asset, EquityAsset):
+                total_value += pos.asset.calculate_value(pos.quantity, underlying_price)
+
+        return total_value
+
+    def calculate_greeks(
+        self,
+        underlying_price: float,
+        volatility: Union[float, VolatilitySurface]
+    ) -> Optional[Greeks]:
         """
         Calculate aggregate Greeks for strategy.
 
         Args:
             underlying_price: Current underlying price
-            volatility: Implied volatility
+            volatility: Implied volatility, or a VolatilitySurface giving
+                each leg the volatility of its strike and expiry (priced at
+                the surface's rates and valuation time)
 
         Returns:
             Aggregate Greeks or None
         """
-        total_delta = 0.0
-        total_gamma = 0.0
-        total_theta = 0.0
-        total_vega = 0.0
-        total_rho = 0.0
+        options = self._option_legs()
+        totals = dict.fromkeys(("delta", "gamma", "theta", "vega", "rho"), 0.0)
+
+        if options:
+            # all legs in one pass
+            values = self._leg_greeks(options, underlying_price, volatility)
+            quantities = np.array([pos.quantity for pos in options], dtype=np.float64)
+            for name in totals:
+                totals[name] = float(values[name] @ quantities)
+
+            for i, pos in enumerate(options):
+                pos.asset._greeks = Greeks(**{name: float(values[name][i]) for name in totals})
 
         for pos in self.positions:
-            if isinstance(pos.asset, OptionAsset):
-                greeks = pos.asset.calculate_greeks(underlying_price, volatility)
-                total_delta += greeks.delta * pos.quantity
-                total_gamma += greeks.gamma * pos.quantity
-                total_theta += greeks.theta * pos.quantity
-                total_vega += greeks.vega * pos.quantity
-                total_rho += greeks.rho * pos.quantity
-            elif isinstance(pos.asset, EquityAsset):
+            if isinstance(pos.asset, EquityAsset):
                 # Stock has delta of 1
-                total_delta += pos.quantity
-
-        return Greeks(
-            delta=total_delta,
-            gamma=total_gamma,
-            theta=total_theta,
-            vega=total_vega,
-            rho=total_rho
-        )
+                totals["delta"] += pos.quantity
+
+        return Greeks(**totals)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert strategy to dictionary."""
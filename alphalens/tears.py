@@ -20,6 +20,7 @@ import warnings
 
 from . import plotting
 from . import performance as perf
+from . import profiling
 from . import utils
 
 
@@ -59,6 +60,7 @@ class GridFigure(object):
 
 
 @plotting.customize
+@profiling.profiled
 def create_summary_tear_sheet(
     factor_data, long_short=True, group_neutral=False
 ):
@@ -176,6 +178,7 @@ def create_summary_tear_sheet(
 
 
 @plotting.customize
+@profiling.profiled
 def create_returns_tear_sheet(
     factor_data, long_short=True, group_neutral=False, by_group=False
 ):
@@ -345,6 +348,7 @@ def create_returns_tear_sheet(
 
 
 @plotting.customize
+@profiling.profiled
 def create_information_tear_sheet(
     factor_data, group_neutral=False, by_group=False
 ):
@@ -407,6 +411,7 @@ def create_information_tear_sheet(
 
 
 @plotting.customize
+@profiling.profiled
 def create_turnover_tear_sheet(factor_data, turnover_periods=None):
     """
     Creates a tear sheet for analyzing the turnover properties of a factor.
@@ -486,6 +491,7 @@ def create_turnover_tear_sheet(factor_data, turnover_periods=None):
 
 
 @plotting.customize
+@profiling.profiled
 def create_full_tear_sheet(factor_data,
                            long_short=True,
                            group_neutral=False,
@@ -527,6 +533,7 @@ def create_full_tear_sheet(factor_data,
 
 
 @plotting.customize
+@profiling.profiled
 def create_event_returns_tear_sheet(factor_data,
                                     returns,
                                     avgretplot=(5, 15),
@@ -633,6 +640,7 @@ def create_event_returns_tear_sheet(factor_data,
 
 
 @plotting.customize
+@profiling.profiled
 def create_event_study_tear_sheet(factor_data,
                                   returns,
                                   avgretplot=(5, 15),
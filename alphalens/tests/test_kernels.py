@@ -0,0 +1,148 @@
+from __future__ import division
+from unittest import TestCase, skipUnless
+from parameterized import parameterized
+
+import numpy as np
+from pandas import (
+    DataFrame,
+    date_range,
+    qcut,
+)
+from pandas.util.testing import (assert_frame_equal,
+                                 assert_series_equal)
+
+from .. import kernels
+from .. performance import (factor_information_coefficient,
+                            factor_rank_autocorrelation,
+                            mean_return_by_quantile)
+from .. utils import quantize_factor
+
+
+def make_factor_data(n_dates=20, n_assets=30, ties=False, seed=0):
+    rs = np.random.RandomState(seed)
+    dr = date_range(start='2015-1-1', periods=n_dates, freq='B')
+    dr.name = 'date'
+    assets = ['A%d' % i for i in range(n_assets)]
+    values = rs.randn(n_dates, n_assets)
+    if ties:
+        values = np.round(values, 1)
+    factor = DataFrame(values, index=dr, columns=assets).stack()
+    factor.index = factor.index.set_names(['date', 'asset'])
+
+    factor_data = DataFrame({'factor': factor})
+    factor_data['1D'] = rs.randn(len(factor)) / 100
+    factor_data['5D'] = rs.randn(len(factor)) / 100
+    factor_data['factor_quantile'] = factor_data.groupby(
+        level='date')['factor'].apply(lambda x: qcut(x, 5, labels=False) + 1)
+    return factor_data
+
+
+class KernelsTestCase(TestCase):
+
+    @parameterized.expand([(False,), (True,)])
+    def test_grouped_rank(self, ties):
+        factor_data = make_factor_data(ties=ties)
+        dates = factor_data.index.get_level_values('date')
+
+        expected = factor_data.groupby(dates)['factor'].rank()
+        result = kernels.grouped_rank(factor_data['factor'].values, dates)
+
+        np.testing.assert_allclose(result, expected.values)
+
+    @parameterized.expand([(5,), ([0, .1, .5, .9, 1.],), ([.05, .5, .95],)])
+    def test_grouped_qcut(self, quantiles):
+        factor_data = make_factor_data()
+        dates = factor_data.index.get_level_values('date')
+
+        expected = factor_data.groupby(dates)['factor'].apply(
+            lambda x: qcut(x, quantiles, labels=False) + 1)
+        result, failed = kernels.grouped_qcut(factor_data['factor'].values,
+                                              dates, quantiles)
+
+        self.assertFalse(failed)
+        np.testing.assert_array_equal(result, expected.values)
+
+    def test_grouped_qcut_non_unique_edges(self):
+        values = np.array([1., 1., 1., 3., 2., 1.])
+        dates = date_range(start='2015-1-1', periods=2).repeat(3)
+
+        result, failed = kernels.grouped_qcut(values, dates, 5)
+
+        self.assertTrue(failed)
+        self.assertTrue(np.isnan(result[:3]).all())
+        self.assertFalse(np.isnan(result[3:]).any())
+
+    def test_grouped_spearman(self):
+        from scipy import stats
+
+        factor_data = make_factor_data(ties=True)
+        dates = factor_data.index.get_level_values('date')
+
+        corr, uniques = kernels.grouped_spearman(
+            factor_data['factor'].values, factor_data[['1D', '5D']].values,
+            dates)
+
+        for i, (date, group) in enumerate(factor_data.groupby(dates)):
+            self.assertEqual(uniques[i], date)
+            for j, col in enumerate(['1D', '5D']):
+                expected = stats.spearmanr(group[col], group['factor'])[0]
+                self.assertAlmostEqual(corr[i, j], expected)
+
+    def test_grouped_moments(self):
+        factor_data = make_factor_data()
+        factor_data.iloc[::7, 1] = np.nan
+        grouped = factor_data.groupby('factor_quantile')[['1D', '5D']]
+
+        mean, std, count = kernels.grouped_moments(
+            factor_data[['1D', '5D']].values,
+            grouped.ngroup().values, grouped.ngroups)
+
+        np.testing.assert_allclose(mean, grouped.mean().values)
+        np.testing.assert_allclose(std, grouped.std().values)
+        np.testing.assert_array_equal(count, grouped.count().values)
+
+
+@skipUnless(kernels.NUMBA_AVAILABLE, "numba not installed")
+class KernelsDispatchTestCase(TestCase):
+    """
+    The public analytics functions must return the same results with and
+    without the compiled kernels.
+    """
+
+    factor_data = make_factor_data(n_dates=30, n_assets=50)
+
+    def setUp(self):
+        self.was_enabled = kernels._ENABLED
+
+    def tearDown(self):
+        kernels.set_enabled(self.was_enabled)
+
+    def _both(self, func, *args, **kwargs):
+        kernels.set_enabled(False)
+        expected = func(*args, **kwargs)
+        kernels.set_enabled(True)
+        result = func(*args, **kwargs)
+        return result, expected
+
+    @parameterized.expand([(5,), ([0, .25, .5, .75, 1.],)])
+    def test_quantize_factor(self, quantiles):
+        result, expected = self._both(quantize_factor, self.factor_data,
+                                      quantiles=quantiles)
+        assert_series_equal(result, expected)
+
+    def test_factor_information_coefficient(self):
+        result, expected = self._both(factor_information_coefficient,
+                                      self.factor_data)
+        assert_frame_equal(result, expected, check_names=False)
+
+    def test_factor_rank_autocorrelation(self):
+        result, expected = self._both(factor_rank_autocorrelation,
+                                      self.factor_data)
+        assert_series_equal(result, expected)
+
+    @parameterized.expand([(False,), (True,)])
+    def test_mean_return_by_quantile(self, by_date):
+        result, expected = self._both(mean_return_by_quantile,
+                                      self.factor_data, by_date=by_date)
+        assert_frame_equal(result[0], expected[0])
+        assert_frame_equal(result[1], expected[1])
@@ -0,0 +1,179 @@
+from __future__ import division
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from .. assets import OptionChain, VolatilitySurface
+from .. assets.option_pricing import (black_scholes_greeks,
+                                      black_scholes_price,
+                                      implied_volatility)
+from .. strategies.options import Straddle, Strangle
+
+
+def make_chain():
+    """Two expiries x three strikes x call/put at 0.2 implied vol."""
+    grid = [(expiry, strike, kind)
+            for expiry in ('2030-01-18', '2030-02-15')
+            for strike in (90.0, 100.0, 110.0)
+            for kind in ('call', 'put')]
+    strikes = [strike for _, strike, _ in grid]
+    return OptionChain(
+        'SPX', ['O:SPX%d' % i for i in range(len(grid))], strikes,
+        [expiry for expiry, _, _ in grid], [kind for _, _, kind in grid],
+        underlying_price=100.0,
+        bid=[strike / 100 for strike in strikes],
+        ask=[strike / 100 + 0.2 for strike in strikes],
+        implied_volatility=np.full(len(grid), 0.2))
+
+
+class BlackScholesTestCase(TestCase):
+
+    def test_textbook_values(self):
+        values = black_scholes_greeks(100.0, 100.0, [1.0, 1.0, 0.0], 0.2,
+                                      [True, False, True], 0.05)
+        assert_allclose(values['price'][:2], [10.4506, 5.5735], atol=1e-4)
+        assert_allclose(values['delta'][:2], [0.6368, -0.3632], atol=1e-4)
+        assert_allclose(values['gamma'][0], 0.018762, atol=1e-6)
+        assert_allclose(values['vega'][0], 0.37524, atol=1e-5)
+        assert_allclose(values['theta'][0], -6.4140 / 365, atol=1e-6)
+        assert_allclose(values['rho'][:2], [0.53232, -0.41890], atol=1e-5)
+        # expired: intrinsic value, no Greeks
+        self.assertEqual(values['price'][2], 0.0)
+        self.assertEqual(values['delta'][2], 0.0)
+        self.assertTrue(np.isnan(
+            black_scholes_price(100.0, 100.0, 1.0, np.nan, True)))
+
+    def test_matches_option_asset_and_strategies(self):
+        chain = make_chain()
+        greeks = chain.greeks()
+        asset = chain.contract(7)
+        scalar = asset.calculate_greeks(chain.underlying_price, 0.2)
+        assert_allclose(greeks['delta'][7], scalar.delta, rtol=1e-6)
+        assert_allclose(greeks['theta'][7], scalar.theta, rtol=1e-6)
+        assert_allclose(chain.price()[7],
+                        asset.black_scholes_price(100.0, 0.2), rtol=1e-6)
+
+        call, put = chain.contract(8), chain.contract(9)
+        straddle = Straddle(call, put, 2, 1.0, 1.0)
+        total = straddle.calculate_greeks(100.0, 0.2)
+        assert_allclose(total.vega,
+                        2 * (call.get_greeks().vega + put.get_greeks().vega))
+        assert_allclose(total.delta,
+                        2 * (call.calculate_greeks(100.0, 0.2).delta +
+                             put.calculate_greeks(100.0, 0.2).delta))
+
+
+class ImpliedVolatilityTestCase(TestCase):
+
+    def test_recovers_vols(self):
+        strikes = np.array([90.0, 80.0, 100.0, 120.0, 200.0, 100.0])
+        expiry = np.array([0.02, 0.5, 1.0, 2.0, 0.25, 1.0])
+        vols = np.array([0.9, 0.15, 0.2, 0.6, 1.5, 0.05])
+        is_call = np.array([False, True, False, True, True, False])
+        prices = black_scholes_price(100.0, strikes, expiry, vols, is_call,
+                                     0.03, 0.01)
+
+        solved, converged = implied_volatility(prices, 100.0, strikes, expiry,
+                                               is_call, 0.03, 0.01)
+        self.assertTrue(converged.all())
+        assert_allclose(solved, vols, atol=1e-4)
+
+    def test_unsolvable_prices(self):
+        # below intrinsic, above the underlying, expired
+        solved, converged = implied_volatility(
+            [1.0, 150.0, 1.0], 100.0, [50.0, 100.0, 100.0],
+            [1.0, 1.0, 0.0], [True, True, True])
+        self.assertFalse(converged.any())
+        self.assertTrue(np.isnan(solved).all())
+
+    def test_option_asset_and_chain(self):
+        chain = make_chain()
+        asset = chain.contract(7)
+        price = asset.black_scholes_price(100.0, 0.35)
+        assert_allclose(asset.implied_volatility(price, 100.0), 0.35)
+        self.assertIsNone(asset.get_greeks())
+
+        chain.implied_volatility[:] = np.nan
+        solved, converged = chain.solve_implied_volatility(
+            chain.price(volatility=0.25), update=True)
+        self.assertTrue(converged.all())
+        assert_allclose(chain.implied_volatility, 0.25, atol=1e-4)
+
+
+class VolatilitySurfaceTestCase(TestCase):
+    expiries = ['2030-06-21', '2031-06-20', '2032-06-18']
+
+    def setUp(self):
+        grid = [(expiry, strike, kind)
+                for expiry in self.expiries
+                for strike in np.arange(70.0, 131.0, 10.0)
+                for kind in ('call', 'put')]
+        self.chain = OptionChain(
+            'SPX', ['O:SPX%d' % i for i in range(len(grid))],
+            [strike for _, strike, _ in grid],
+            [expiry for expiry, _, _ in grid],
+            [kind for _, _, kind in grid], underlying_price=100.0)
+
+    @staticmethod
+    def smile(strike, years):
+        moneyness = (np.log(np.asarray(strike) / 100.0) -
+                     0.02 * np.asarray(years))
+        return np.sqrt(0.04 + 0.05 * moneyness ** 2)
+
+    def make_surface(self):
+        chain = self.chain
+        ttm = chain.time_to_expiry()
+        prices = chain.price(volatility=self.smile(chain.strikes, ttm))
+        return VolatilitySurface(chain, prices), ttm
+
+    def test_recovers_smile(self):
+        surface, ttm = self.make_surface()
+        strikes = self.chain.strikes
+        self.assertTrue(surface.converged.all())
+        self.assertTrue(surface.smiles()['fitted'].all())
+        assert_allclose(surface.volatility(strikes, ttm),
+                        self.smile(strikes, ttm), atol=1e-4)
+
+        # between and beyond the quoted expiries
+        times = np.array([[ttm[0]], [(ttm[0] + ttm[-1]) / 2], [ttm[-1] + 1]])
+        vols = surface.volatility(np.array([75.0, 100.0, 125.0]), times)
+        self.assertEqual(vols.shape, (3, 3))
+        assert_allclose(vols[1], self.smile([75.0, 100.0, 125.0], times[1]),
+                        atol=1e-3)
+
+    def test_incremental_refit(self):
+        surface, ttm = self.make_surface()
+        symbols = self.chain.symbols
+
+        before = surface.volatility_at(100.0, self.expiries[2])
+        self.assertEqual(
+            surface.update({symbols[2]: surface.prices[2] * 1.5}), 1)
+        self.assertGreater(surface.volatilities[2],
+                           self.smile(90.0, ttm[2]) + 0.01)
+        self.assertEqual(surface.volatility_at(100.0, self.expiries[2]),
+                         before)
+
+    def test_strategy_pricing(self):
+        surface, ttm = self.make_surface()
+        chain = self.chain
+        call, put = chain.contract(26), chain.contract(15)
+        strangle = Strangle(call, put, 2, 1.0, 1.0)
+
+        expected = 200 * (
+            call.black_scholes_price(100.0, float(self.smile(130.0, ttm[26])))
+            + put.black_scholes_price(100.0, float(self.smile(70.0, ttm[15]))))
+        assert_allclose(strangle.theoretical_value(100.0, surface), expected,
+                        rtol=1e-3)
+        self.assertGreater(strangle.calculate_greeks(100.0, surface).vega,
+                           strangle.calculate_greeks(100.0, 0.2).vega)
+
+        # legs are priced at the surface's own rates and valuation time
+        now = datetime(2029, 6, 21)
+        quoted = chain.price(volatility=0.3, risk_free_rate=0.05,
+                             dividend_yield=0.01, now=now)
+        surface = VolatilitySurface(chain, quoted, risk_free_rate=0.05,
+                                    dividend_yield=0.01, now=now)
+        assert_allclose(strangle.theoretical_value(100.0, surface),
+                        200 * (quoted[26] + quoted[15]), rtol=1e-4)
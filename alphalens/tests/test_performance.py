@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from __future__ import division
+import warnings
 from unittest import TestCase
 from parameterized import parameterized
 from numpy import nan
@@ -40,6 +41,7 @@ from .. performance import (factor_information_coefficient,
                             factor_rank_autocorrelation,
                             factor_returns, factor_alpha_beta,
                             cumulative_returns, factor_weights,
+                            positions, factor_positions,
                             common_start_returns,
                             average_cumulative_return_by_quantile)
 
@@ -1040,3 +1042,71 @@ class PerformanceTestCase(TestCase):
         expected = DataFrame(
             index=index, columns=range(-before, after + 1), data=expected_vals)
         assert_frame_equal(avgrt, expected)
+
+    def test_positions_bar_period(self):
+        dr = date_range(start='2015-1-5', periods=4, freq='B')
+        weights = DataFrame(index=dr, columns=['A', 'B'],
+                            data=[[.5, -.5], [1., nan],
+                                  [-.5, .5], [nan, .25]]).stack()
+        weights.index = weights.index.set_names(['date', 'asset'])
+
+        pos = positions(weights, 2)
+
+        expected = DataFrame(index=dr, columns=['A', 'B'],
+                             data=[[.5, -.5], [.75, -.25],
+                                   [.5, .5], [-.4, .6]])
+        expected.index.name = 'date'
+        expected.columns.name = 'asset'
+        assert_frame_equal(pos, expected)
+
+        # same holding period expressed on the business day calendar
+        expected = positions(weights, '2D', freq=BDay())
+        assert_frame_equal(pos, expected.loc[pos.index])
+
+    def test_positions_bar_index(self):
+        bars = date_range(start='2015-1-5 09:30', periods=6, freq='5min')
+        weights = DataFrame(index=bars[[0, 3]], columns=['A', 'B'],
+                            data=[[.5, -.5], [1., nan]]).stack()
+        weights.index = weights.index.set_names(['date', 'asset'])
+
+        pos = positions(weights, 2, bar_index=bars)
+
+        # trades are reported until they expire 2 bars later
+        expected = DataFrame(index=bars[[0, 2, 3, 5]], columns=['A', 'B'],
+                             data=[[.5, -.5], [0., 0.],
+                                   [1., 0.], [0., 0.]])
+        expected.index.name = 'date'
+        expected.columns.name = 'asset'
+        assert_frame_equal(pos, expected)
+
+    def test_factor_positions_intraday(self):
+        bars = DatetimeIndex(
+            [d + Timedelta(minutes=5 * i)
+             for d in date_range('2015-1-5 09:30', periods=2, freq='D')
+             for i in range(6)])
+        prices = DataFrame(index=bars, columns=['A', 'B'],
+                           data=[[1. + i / 100, 1. - i / 100]
+                                 for i in range(len(bars))])
+        # factor on every other bar only
+        factor = DataFrame(index=bars[::2], columns=['A', 'B'],
+                           data=[[1., -1.], [-1., 1.]] * 3).stack()
+        factor.index = factor.index.set_names(['date', 'asset'])
+
+        factor_data = get_clean_factor_and_forward_returns(
+            factor, prices, periods=(2,), quantiles=2, intraday=True)
+        self.assertEqual(factor_data.attrs['period_bars'], {'10m': 2})
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UserWarning)
+            pos = factor_positions(factor_data, '10m', bar_index=bars)
+
+        expected = positions(factor_weights(factor_data), 2, bar_index=bars)
+        assert_frame_equal(pos, expected)
+
+        # the bar count is inferred when attrs were lost (e.g. by concat)
+        factor_data.attrs.clear()
+        assert_frame_equal(
+            factor_positions(factor_data, '10m', bar_index=bars), expected)
+        # each trade is held 2 bars, not 2 factor rows
+        self.assertEqual((pos.abs().sum(axis=1) > 0).sum(),
+                         factor_data.index.get_level_values(0).nunique())
@@ -0,0 +1,58 @@
+from __future__ import division
+from unittest import TestCase
+
+from pandas import (
+    DataFrame,
+    date_range,
+)
+
+from .. import profiling
+from .. utils import get_clean_factor_and_forward_returns
+
+
+class ProfilingTestCase(TestCase):
+    dr = date_range(start='2015-1-1', end='2015-1-10')
+    prices = DataFrame(index=dr, columns=['A', 'B', 'C', 'D'],
+                       data=[[1. + i, 2. + i, 3. - .1 * i, 4. + .5 * i]
+                             for i in range(10)])
+    factor = prices[:8].stack()
+    factor.index = factor.index.set_names(['date', 'asset'])
+
+    def run_pipeline(self):
+        return get_clean_factor_and_forward_returns(self.factor, self.prices,
+                                                    quantiles=2,
+                                                    periods=(1, 2))
+
+    def test_stages_recorded(self):
+        received = []
+        with profiling.Profiler(callback=received.append) as prof:
+            factor_data = self.run_pipeline()
+
+        stages = prof.to_dict()
+        root = 'get_clean_factor_and_forward_returns'
+        for name in ['compute_forward_returns',
+                     'compute_forward_returns/infer_trading_calendar',
+                     'get_clean_factor/merge',
+                     'get_clean_factor/quantize_factor',
+                     'get_clean_factor/max_loss']:
+            self.assertIn(root + '/' + name, stages)
+
+        self.assertEqual(stages[root]['rows_in'], len(self.factor))
+        self.assertEqual(stages[root]['rows_out'], len(factor_data))
+        self.assertEqual(len(received), len(prof.records))
+        self.assertEqual(received[-1]['stage'], root)
+
+    def test_memory_tracking(self):
+        with profiling.Profiler(track_memory=True) as prof:
+            self.run_pipeline()
+
+        self.assertTrue(all(rec['memory_delta'] is not None
+                            for rec in prof.records))
+
+    def test_inactive(self):
+        with profiling.Profiler() as prof:
+            pass
+        self.run_pipeline()
+
+        self.assertEqual(prof.records, [])
+        self.assertIs(profiling.stage('noop'), profiling._NULL_STAGE)
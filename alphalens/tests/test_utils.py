@@ -119,6 +119,66 @@ class UtilsTestCase(TestCase):
 
         assert_frame_equal(fp, expected)
 
+    @parameterized.expand([(True, False), (False, False),
+                           (True, True), (False, True)])
+    def test_compute_forward_returns_sparse(self, cumulative_returns,
+                                            intraday):
+        dr = date_range(start='2015-1-5 9:30', periods=6, freq='T' if
+                        intraday else 'B')
+        prices = DataFrame(index=dr, columns=['A', 'B', 'C'],
+                           data=[[1. + i, 2. + i % 3, 50. - i]
+                                 for i in range(6)])
+        prices.iloc[4, 1] = nan
+
+        # a few events, one of them on an asset without prices
+        factor = Series(index=MultiIndex.from_tuples(
+            [(dr[1], 'A'), (dr[2], 'B'), (dr[2], 'C'), (dr[3], 'D'),
+             (dr[4], 'A')], names=['date', 'asset']),
+            data=[1., -1., 2., 3., 4.])
+
+        dense = compute_forward_returns(factor, prices, periods=[1, 3],
+                                        cumulative_returns=cumulative_returns,
+                                        intraday=intraday)
+        sparse = compute_forward_returns(factor, prices, periods=[1, 3],
+                                         cumulative_returns=cumulative_returns,
+                                         intraday=intraday, sparse=True)
+
+        assert_frame_equal(sparse, dense)
+        self.assertTrue(sparse.loc[(dr[3], 'D')].isnull().all())
+        self.assertTrue(sparse.loc[(dr[4], 'A')].iloc[1:].isnull().all())
+
+    def test_compute_forward_returns_intraday(self):
+        dr = date_range(start='2015-1-5 9:30', periods=3, freq='T').append(
+            date_range(start='2015-1-6 9:30', periods=3, freq='T'))
+        prices = DataFrame(index=dr, columns=['A', 'B'],
+                           data=[[1, 2], [2, 2], [3, 2],
+                                 [4, 2], [5, 2], [6, 2]])
+        factor = prices.stack()
+
+        ix = MultiIndex.from_product([dr, ['A', 'B']],
+                                     names=['date', 'asset'])
+
+        fp = compute_forward_returns(factor, prices, periods=[1, 2],
+                                     intraday=True)
+
+        expected = DataFrame(index=ix, columns=['1m', '2m'])
+        expected['1m'] = [1., 0., 1. / 2, 0., 1. / 3, 0.,
+                          1. / 4, 0., 1. / 5, 0., nan, nan]
+        expected['2m'] = [2., 0., 1., 0., 2. / 3, 0.,
+                          1. / 2, 0., nan, nan, nan, nan]
+
+        assert_frame_equal(fp, expected)
+
+        fp = compute_forward_returns(factor, prices, periods=[1, 2],
+                                     intraday=True, cross_sessions=False)
+
+        expected['1m'] = [1., 0., 1. / 2, 0., nan, nan,
+                          1. / 4, 0., 1. / 5, 0., nan, nan]
+        expected['2m'] = [2., 0., nan, nan, nan, nan,
+                          1. / 2, 0., nan, nan, nan, nan]
+
+        assert_frame_equal(fp, expected)
+
     @parameterized.expand([(factor_data, 4, None, False, False,
                             [1, 2, 3, 4, 4, 3, 2, 1]),
                            (factor_data, 2, None, False, False,
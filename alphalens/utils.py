@@ -22,6 +22,9 @@ from IPython.display import display
 from pandas.tseries.offsets import CustomBusinessDay, Day, BusinessDay
 from scipy.stats import mode
 
+from . import kernels
+from . import profiling
+
 
 class NonMatchingTimezoneError(Exception):
     pass
@@ -82,6 +85,7 @@ def non_unique_bin_edges_error(func):
 
 
 @non_unique_bin_edges_error
+@profiling.profiled
 def quantize_factor(factor_data,
                     quantiles=5,
                     bins=None,
@@ -163,6 +167,18 @@ def quantize_factor(factor_data,
     if by_group:
         grouper.append('group')
 
+    if kernels.enabled() and quantiles is not None and not by_group \
+            and not zero_aware and factor_data['factor'].notnull().all():
+        labels, failed = kernels.grouped_qcut(factor_data['factor'].values,
+                                              grouper[0], quantiles)
+        if failed and not no_raise:
+            raise ValueError('Bin edges must be unique')
+        factor_quantile = pd.Series(labels, index=factor_data.index,
+                                    name='factor_quantile')
+        if not factor_quantile.isnull().any():
+            return factor_quantile.astype(np.int64)
+        return factor_quantile.dropna()
+
     factor_quantile = factor_data.groupby(grouper)['factor'] \
         .apply(quantile_calc, quantiles, bins, zero_aware, no_raise)
     factor_quantile.name = 'factor_quantile'
@@ -170,6 +186,7 @@ def quantize_factor(factor_data,
     return factor_quantile.dropna()
 
 
+@profiling.profiled
 def infer_trading_calendar(factor_idx, prices_idx):
     """
     Infer the trading calendar from factor and price information.
@@ -213,11 +230,15 @@ def infer_trading_calendar(factor_idx, prices_idx):
     return CustomBusinessDay(weekmask=traded_weekdays, holidays=holidays)
 
 
+@profiling.profiled
 def compute_forward_returns(factor,
                             prices,
                             periods=(1, 5, 10),
                             filter_zscore=None,
-                            cumulative_returns=True):
+                            cumulative_returns=True,
+                            intraday=False,
+                            cross_sessions=True,
+                            sparse=False):
     """
     Finds the N period forward returns (as percent change) for each asset
     provided.
@@ -246,6 +267,24 @@ def compute_forward_returns(factor,
         If True, forward returns columns will contain cumulative returns.
         Setting this to False is useful if you want to analyze how predictive
         a factor is for a single forward day.
+    intraday : bool, optional
+        If True, 'periods' are bar counts on the prices index (e.g. minute
+        bars) and forward returns are computed by integer offsets into it,
+        without inferring a daily trading calendar. Column names are the
+        period multiplied by the bar length (the most common spacing of bars
+        within a session), e.g. periods (1, 30, 390) on minute bars give
+        '1m', '30m' and '6h30m'.
+    cross_sessions : bool, optional
+        Only used in intraday mode. If False, forward returns that would
+        span more than one session (calendar day of the prices index) are
+        set to NaN.
+    sparse : bool, optional
+        If True, forward returns are computed only at the (date, asset)
+        points present in 'factor', by index lookups into the price array,
+        instead of over every date and asset. This is much cheaper for event
+        driven factors (earnings, news, ...) covering a small fraction of
+        the dates x assets grid. Note that 'filter_zscore' then uses the mean
+        and standard deviation of each asset's returns at those points only.
 
     Returns
     -------
@@ -257,6 +296,9 @@ def compute_forward_returns(factor,
         'date' index freq property (forward_returns.index.levels[0].freq)
         will be set to a trading calendar (pandas DateOffset) inferred
         from the input data (see infer_trading_calendar for more details).
+        In intraday mode the freq property is left unset and the bar count
+        of each column is stored in forward_returns.attrs['period_bars']
+        (see performance.factor_positions).
     """
 
     factor_dateindex = factor.index.levels[0]
@@ -266,7 +308,8 @@ def compute_forward_returns(factor,
                                        "the pandas methods tz_localize and "
                                        "tz_convert.")
 
-    freq = infer_trading_calendar(factor_dateindex, prices.index)
+    freq = None if intraday else \
+        infer_trading_calendar(factor_dateindex, prices.index)
 
     factor_dateindex = factor_dateindex.intersection(prices.index)
 
@@ -283,66 +326,169 @@ def compute_forward_returns(factor,
     raw_values_dict = {}
     column_list = []
 
+    if sparse or intraday:
+        # prices are forward filled the same way pct_change does
+        price_values = prices.ffill().values
+    if intraday:
+        factor_pos = prices.index.get_indexer(factor_dateindex)
+        sessions = None if cross_sessions else \
+            pd.factorize(prices.index.normalize())[0]
+        bar = infer_bar_length(prices.index)
+    else:
+        sessions = None
+
+    #
+    # locate each factor entry in the forward returns computed below (or, in
+    # sparse mode, in the price array): forward returns are only gathered at
+    # these points instead of being built for the whole dates x assets grid
+    #
+    factor_dates = factor.index.get_level_values(0)
+    date_pos = (prices.index if sparse else factor_dateindex).get_indexer(
+        factor_dates)
+    asset_pos = prices.columns.get_indexer(factor.index.get_level_values(1))
+    found = (date_pos >= 0) & (asset_pos >= 0)
+    date_pos = date_pos[found]
+    asset_pos = asset_pos[found]
+
     for period in sorted(periods):
-        if cumulative_returns:
-            returns = prices.pct_change(period)
+        if sparse:
+            values = _bar_offset_returns(price_values, date_pos, sessions,
+                                         period, cumulative_returns,
+                                         asset_pos)
+            if filter_zscore is not None:
+                grouped = pd.Series(values).groupby(asset_pos)
+                mask = abs(
+                    values - grouped.transform('mean').values
+                ) > (filter_zscore * grouped.transform('std').values)
+                values[mask] = np.nan
         else:
-            returns = prices.pct_change()
-
-        forward_returns = \
-            returns.shift(-period).reindex(factor_dateindex)
-
-        if filter_zscore is not None:
-            mask = abs(
-                forward_returns - forward_returns.mean()
-            ) > (filter_zscore * forward_returns.std())
-            forward_returns[mask] = np.nan
-
-        #
-        # Find the period length, which will be the column name. We'll test
-        # several entries in order to find out the most likely period length
-        # (in case the user passed inconsinstent data)
-        #
-        days_diffs = []
-        for i in range(30):
-            if i >= len(forward_returns.index):
-                break
-            p_idx = prices.index.get_loc(forward_returns.index[i])
-            if p_idx is None or p_idx < 0 or (
-                    p_idx + period) >= len(prices.index):
-                continue
-            start = prices.index[p_idx]
-            end = prices.index[p_idx + period]
-            period_len = diff_custom_calendar_timedeltas(start, end, freq)
-            days_diffs.append(period_len.components.days)
-
-        delta_days = period_len.components.days - mode(days_diffs).mode[0]
-        period_len -= pd.Timedelta(days=delta_days)
-        label = timedelta_to_string(period_len)
+            if intraday:
+                forward_returns = pd.DataFrame(
+                    _bar_offset_returns(price_values, factor_pos, sessions,
+                                        period, cumulative_returns),
+                    index=factor_dateindex,
+                    columns=prices.columns,
+                )
+            else:
+                if cumulative_returns:
+                    returns = prices.pct_change(period)
+                else:
+                    returns = prices.pct_change()
+
+                forward_returns = \
+                    returns.shift(-period).reindex(factor_dateindex)
+
+            if filter_zscore is not None:
+                mask = abs(
+                    forward_returns - forward_returns.mean()
+                ) > (filter_zscore * forward_returns.std())
+                forward_returns[mask] = np.nan
+
+            values = forward_returns.values[date_pos, asset_pos]
+
+        if intraday:
+            label = timedelta_to_string(bar * period)
+        else:
+            #
+            # Find the period length, which will be the column name. We'll
+            # test several entries in order to find out the most likely
+            # period length (in case the user passed inconsinstent data)
+            #
+            days_diffs = []
+            for i in range(30):
+                if i >= len(factor_dateindex):
+                    break
+                p_idx = prices.index.get_loc(factor_dateindex[i])
+                if p_idx is None or p_idx < 0 or (
+                        p_idx + period) >= len(prices.index):
+                    continue
+                start = prices.index[p_idx]
+                end = prices.index[p_idx + period]
+                period_len = diff_custom_calendar_timedeltas(start, end, freq)
+                days_diffs.append(period_len.components.days)
+
+            delta_days = period_len.components.days - mode(days_diffs).mode[0]
+            period_len -= pd.Timedelta(days=delta_days)
+            label = timedelta_to_string(period_len)
 
         column_list.append(label)
 
-        raw_values_dict[label] = np.concatenate(forward_returns.values)
+        raw_values_dict[label] = np.full(len(found), np.nan)
+        raw_values_dict[label][found] = values
 
-    df = pd.DataFrame.from_dict(raw_values_dict)
-    df.set_index(
-        pd.MultiIndex.from_product(
-            [factor_dateindex, prices.columns],
-            names=['date', 'asset']
-        ),
-        inplace=True
-    )
-    df = df.reindex(factor.index)
+    with profiling.stage('assemble', rows_in=len(date_pos)) as st:
+        df = pd.DataFrame(raw_values_dict, index=factor.index.copy())
+        st.rows_out = len(df)
 
     # now set the columns correctly
     df = df[column_list]
 
-    df.index.levels[0].freq = freq
+    if freq is not None:
+        df.index.levels[0].freq = freq
+    if intraday:
+        # bar count of each column, used by performance.factor_positions
+        df.attrs['period_bars'] = dict(zip(column_list, sorted(periods)))
     df.index.set_names(['date', 'asset'], inplace=True)
 
     return df
 
 
+def infer_bar_length(prices_idx):
+    """
+    Infer the bar length of intraday prices: the most common spacing between
+    consecutive timestamps of the same session (calendar day). Overnight and
+    weekend gaps are ignored.
+
+    Parameters
+    ----------
+    prices_idx : pd.DatetimeIndex
+        The prices datetimes
+
+    Returns
+    -------
+    bar : pd.Timedelta
+    """
+    stamps = prices_idx.asi8
+    sessions = prices_idx.normalize().asi8
+    diffs = np.diff(stamps)
+    intra = diffs[sessions[1:] == sessions[:-1]]
+    if len(intra) == 0:
+        intra = diffs
+    if len(intra) == 0:
+        raise ValueError("At least two price bars are required to infer "
+                         "the bar length")
+    return pd.Timedelta(int(mode(intra).mode[0]))
+
+
+def _bar_offset_returns(price_values, rows, sessions, period,
+                        cumulative_returns, columns=None):
+    """
+    Forward returns 'period' bars ahead of the rows 'rows' of the
+    (bars x assets) 'price_values' array. If 'columns' is given the returns
+    are computed only at the points (rows[i], columns[i]). Returns whose
+    end bar falls in a different session are discarded, unless 'sessions'
+    (session id of each bar) is None.
+    """
+    end = rows + period
+    valid = end < len(price_values)
+    end = np.where(valid, end, rows)
+    start = rows if cumulative_returns else np.maximum(end - 1, 0)
+    if sessions is not None:
+        valid &= sessions[end] == sessions[rows]
+
+    if columns is None:
+        end_prices = price_values[end]
+        start_prices = price_values[start]
+    else:
+        end_prices = price_values[end, columns]
+        start_prices = price_values[start, columns]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = end_prices / start_prices - 1
+    returns[~valid] = np.nan
+    return returns
+
+
 def backshift_returns_series(series, N):
     """Shift a multi-indexed series backwards by N observations in
     the first level.
@@ -450,6 +596,7 @@ def print_table(table, name=None, fmt=None):
         pd.set_option('display.float_format', prev_option)
 
 
+@profiling.profiled
 def get_clean_factor(factor,
                      forward_returns,
                      groupby=None,
@@ -590,41 +737,43 @@ def get_clean_factor(factor,
 
     initial_amount = float(len(factor.index))
 
-    factor_copy = factor.copy()
-    factor_copy.index = factor_copy.index.rename(['date', 'asset'])
-    factor_copy = factor_copy[np.isfinite(factor_copy)]
+    with profiling.stage('merge', rows_in=len(factor.index)) as st:
+        factor_copy = factor.copy()
+        factor_copy.index = factor_copy.index.rename(['date', 'asset'])
+        factor_copy = factor_copy[np.isfinite(factor_copy)]
 
-    merged_data = forward_returns.copy()
-    merged_data['factor'] = factor_copy
+        merged_data = forward_returns.copy()
+        merged_data['factor'] = factor_copy
 
-    if groupby is not None:
-        if isinstance(groupby, dict):
-            diff = set(factor_copy.index.get_level_values(
-                'asset')) - set(groupby.keys())
-            if len(diff) > 0:
-                raise KeyError(
-                    "Assets {} not in group mapping".format(
-                        list(diff)))
+        if groupby is not None:
+            if isinstance(groupby, dict):
+                diff = set(factor_copy.index.get_level_values(
+                    'asset')) - set(groupby.keys())
+                if len(diff) > 0:
+                    raise KeyError(
+                        "Assets {} not in group mapping".format(
+                            list(diff)))
 
-            ss = pd.Series(groupby)
-            groupby = pd.Series(index=factor_copy.index,
-                                data=ss[factor_copy.index.get_level_values(
-                                    'asset')].values)
+                ss = pd.Series(groupby)
+                groupby = pd.Series(index=factor_copy.index,
+                                    data=ss[factor_copy.index.get_level_values(
+                                        'asset')].values)
 
-        if groupby_labels is not None:
-            diff = set(groupby.values) - set(groupby_labels.keys())
-            if len(diff) > 0:
-                raise KeyError(
-                    "groups {} not in passed group names".format(
-                        list(diff)))
+            if groupby_labels is not None:
+                diff = set(groupby.values) - set(groupby_labels.keys())
+                if len(diff) > 0:
+                    raise KeyError(
+                        "groups {} not in passed group names".format(
+                            list(diff)))
 
-            sn = pd.Series(groupby_labels)
-            groupby = pd.Series(index=groupby.index,
-                                data=sn[groupby.values].values)
+                sn = pd.Series(groupby_labels)
+                groupby = pd.Series(index=groupby.index,
+                                    data=sn[groupby.values].values)
 
-        merged_data['group'] = groupby.astype('category')
+            merged_data['group'] = groupby.astype('category')
 
-    merged_data = merged_data.dropna()
+        merged_data = merged_data.dropna()
+        st.rows_out = len(merged_data.index)
 
     fwdret_amount = float(len(merged_data.index))
 
@@ -644,25 +793,28 @@ def get_clean_factor(factor,
 
     binning_amount = float(len(merged_data.index))
 
-    tot_loss = (initial_amount - binning_amount) / initial_amount
-    fwdret_loss = (initial_amount - fwdret_amount) / initial_amount
-    bin_loss = tot_loss - fwdret_loss
-
-    print("Dropped %.1f%% entries from factor data: %.1f%% in forward "
-          "returns computation and %.1f%% in binning phase "
-          "(set max_loss=0 to see potentially suppressed Exceptions)." %
-          (tot_loss * 100, fwdret_loss * 100, bin_loss * 100))
-
-    if tot_loss > max_loss:
-        message = ("max_loss (%.1f%%) exceeded %.1f%%, consider increasing it."
-                   % (max_loss * 100, tot_loss * 100))
-        raise MaxLossExceededError(message)
-    else:
-        print("max_loss is %.1f%%, not exceeded: OK!" % (max_loss * 100))
+    with profiling.stage('max_loss', rows_in=len(factor.index)) as st:
+        st.rows_out = len(merged_data.index)
+        tot_loss = (initial_amount - binning_amount) / initial_amount
+        fwdret_loss = (initial_amount - fwdret_amount) / initial_amount
+        bin_loss = tot_loss - fwdret_loss
+
+        print("Dropped %.1f%% entries from factor data: %.1f%% in forward "
+              "returns computation and %.1f%% in binning phase "
+              "(set max_loss=0 to see potentially suppressed Exceptions)." %
+              (tot_loss * 100, fwdret_loss * 100, bin_loss * 100))
+
+        if tot_loss > max_loss:
+            message = ("max_loss (%.1f%%) exceeded %.1f%%, consider "
+                       "increasing it." % (max_loss * 100, tot_loss * 100))
+            raise MaxLossExceededError(message)
+        else:
+            print("max_loss is %.1f%%, not exceeded: OK!" % (max_loss * 100))
 
     return merged_data
 
 
+@profiling.profiled
 def get_clean_factor_and_forward_returns(factor,
                                          prices,
                                          groupby=None,
@@ -674,7 +826,10 @@ def get_clean_factor_and_forward_returns(factor,
                                          groupby_labels=None,
                                          max_loss=0.35,
                                          zero_aware=False,
-                                         cumulative_returns=True):
+                                         cumulative_returns=True,
+                                         intraday=False,
+                                         cross_sessions=True,
+                                         sparse=False):
     """
     Formats the factor data, pricing data, and group mappings into a DataFrame
     that contains aligned MultiIndex indices of timestamp and asset. The
@@ -788,6 +943,17 @@ def get_clean_factor_and_forward_returns(factor,
         If True, forward returns columns will contain cumulative returns.
         Setting this to False is useful if you want to analyze how predictive
         a factor is for a single forward day.
+    intraday : bool, optional
+        If True, 'periods' are bar counts on the prices index and forward
+        returns are computed by integer bar offsets, which is what you want
+        for minute or other intraday bars (see compute_forward_returns).
+    cross_sessions : bool, optional
+        Only used in intraday mode. If False, forward returns spanning more
+        than one session are discarded.
+    sparse : bool, optional
+        If True, forward returns are only computed at the (date, asset)
+        points of 'factor'. Use this for event driven factors that cover a
+        small part of the dates x assets grid (see compute_forward_returns).
 
     Returns
     -------
@@ -801,7 +967,8 @@ def get_clean_factor_and_forward_returns(factor,
         - 'date' index freq property (merged_data.index.levels[0].freq) will be
           set to a trading calendar (pandas DateOffset) inferred from the input
           data (see infer_trading_calendar for more details). This is currently
-          used only in cumulative returns computation
+          used only in cumulative returns computation. It is left unset in
+          intraday mode
         ::
            -------------------------------------------------------------------
                       |       | 1D  | 5D  | 10D  |factor|group|factor_quantile
@@ -830,6 +997,9 @@ def get_clean_factor_and_forward_returns(factor,
         periods,
         filter_zscore,
         cumulative_returns,
+        intraday=intraday,
+        cross_sessions=cross_sessions,
+        sparse=sparse,
     )
 
     factor_data = get_clean_factor(factor, forward_returns, groupby=groupby,
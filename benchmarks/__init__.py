@@ -0,0 +1,15 @@
+"""
+Speed and memory benchmarks for alpha-lens.
+
+Run the analytics core suite with::
+
+    python -m benchmarks.bench_core --assets 100 500 --dates 252 \\
+        --output results.json
+
+and compare two runs with::
+
+    python -m benchmarks.bench_core --compare baseline.json results.json
+
+Data feed response decoding is benchmarked by ``benchmarks.bench_data``
+(same options, ``--bars`` instead of the panel sizes).
+"""
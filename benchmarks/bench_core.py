@@ -0,0 +1,166 @@
+"""
+Benchmarks for the alphalens analytics core.
+
+Every case runs on a synthetic panel (see benchmarks.synthetic) for each
+combination of the requested number of assets, dates, periods and groups.
+
+Usage:
+    python -m benchmarks.bench_core --assets 100 500 --dates 252 504 \\
+        --output results.json
+    python -m benchmarks.bench_core --compare baseline.json results.json
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple
+import argparse
+import contextlib
+import io
+import itertools
+import sys
+
+import matplotlib.pyplot as plt
+
+from alphalens import performance as perf
+from alphalens import tears
+from alphalens import utils
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    measure,
+    save_results,
+    compare,
+    format_results,
+    format_comparison,
+)
+from benchmarks.synthetic import make_panel
+
+
+def _cases(factor, prices, groups, periods) -> Dict[str, Callable[[], object]]:
+    """Benchmarked calls for one synthetic panel."""
+    # get_clean_factor prints its data loss summary
+    with contextlib.redirect_stdout(io.StringIO()):
+        factor_data = utils.get_clean_factor_and_forward_returns(
+            factor, prices, groupby=groups, periods=periods,
+            max_loss=1.0)
+    weights = perf.factor_weights(factor_data)
+    quantile_factor = factor_data["factor_quantile"]
+    period = utils.get_forward_returns_columns(factor_data.columns)[0]
+
+    def tear_sheet(func):
+        def run():
+            func(factor_data)
+            plt.close("all")
+        return run
+
+    return {
+        "get_clean_factor_and_forward_returns":
+            lambda: utils.get_clean_factor_and_forward_returns(
+                factor, prices, groupby=groups, periods=periods,
+                max_loss=1.0),
+        "factor_information_coefficient":
+            lambda: perf.factor_information_coefficient(factor_data),
+        "factor_information_coefficient_by_group":
+            lambda: perf.factor_information_coefficient(factor_data,
+                                                        by_group=True),
+        "mean_return_by_quantile":
+            lambda: perf.mean_return_by_quantile(factor_data, by_date=True),
+        "factor_returns":
+            lambda: perf.factor_returns(factor_data),
+        "quantile_turnover":
+            lambda: perf.quantile_turnover(quantile_factor, 1, 1),
+        "factor_rank_autocorrelation":
+            lambda: perf.factor_rank_autocorrelation(factor_data),
+        "positions":
+            lambda: perf.positions(weights, period),
+        "create_summary_tear_sheet":
+            tear_sheet(tears.create_summary_tear_sheet),
+        "create_returns_tear_sheet":
+            tear_sheet(tears.create_returns_tear_sheet),
+        "create_information_tear_sheet":
+            tear_sheet(tears.create_information_tear_sheet),
+        "create_turnover_tear_sheet":
+            tear_sheet(tears.create_turnover_tear_sheet),
+    }
+
+
+def run(
+    assets: Sequence[int],
+    dates: Sequence[int],
+    periods: Sequence[Tuple[int, ...]],
+    groups: Sequence[int],
+    select: Sequence[str] = (),
+    repeat: int = 3
+) -> List[BenchmarkResult]:
+    """
+    Run the suite over the cartesian product of panel parameters.
+
+    Args:
+        assets: Numbers of assets
+        dates: Numbers of factor dates
+        periods: Forward return period tuples
+        groups: Numbers of groups
+        select: Only run benchmarks whose name contains one of these
+        repeat: Timed repetitions per case
+
+    Returns:
+        List of BenchmarkResult
+    """
+    results = []
+
+    for n_assets, n_dates, period, n_groups in itertools.product(
+            assets, dates, periods, groups):
+        factor, prices, group_map = make_panel(
+            n_assets=n_assets, n_dates=n_dates, max_period=max(period),
+            n_groups=n_groups)
+        params = {"assets": n_assets, "dates": n_dates,
+                  "periods": "-".join(map(str, period)), "groups": n_groups}
+
+        for name, func in _cases(factor, prices, group_map, period).items():
+            if select and not any(s in name for s in select):
+                continue
+            # one broken case should not abort the rest of the suite
+            result = measure(name, func, params, repeat=repeat,
+                             catch_errors=True)
+            results.append(result)
+            print(format_results([result]).splitlines()[1], flush=True)
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--assets", type=int, nargs="+", default=[100])
+    parser.add_argument("--dates", type=int, nargs="+", default=[252])
+    parser.add_argument("--periods", nargs="+", default=["1,5,10"],
+                        help="Comma separated period sets, e.g. 1,5,10 1")
+    parser.add_argument("--groups", type=int, nargs="+", default=[10])
+    parser.add_argument("--select", nargs="*", default=[],
+                        help="Only run benchmarks matching these names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", nargs=2,
+                        metavar=("BASELINE", "CURRENT"),
+                        help="Compare two JSON result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        rows = compare(*args.compare)
+        print(format_comparison(rows))
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    periods = [tuple(int(p) for p in s.split(",")) for s in args.periods]
+
+    # tear sheets call plt.show(), keep them off screen
+    plt.switch_backend("Agg")
+
+    results = run(args.assets, args.dates, periods, args.groups,
+                  args.select, args.repeat)
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmarks for data feed response decoding.
+
+Compares the row-wise aggregates parsing the Polygon feed used to do (a
+dict and a pd.to_datetime call per bar, then a frame from the list of
+dicts) with the columnar decoder (NumPy columns, one vectorized timestamp
+conversion), and the JSON backends.
+
+Usage:
+    python -m benchmarks.bench_data --bars 10000 100000 --output results.json
+    python -m benchmarks.bench_data --compare baseline.json results.json
+"""
+
+from typing import Callable, Dict, List, Sequence
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+from alphalens.data import json_codec
+from alphalens.data.polygon_feed import PolygonDataFeed
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    measure,
+    save_results,
+    compare,
+    format_results,
+    format_comparison,
+)
+from benchmarks.synthetic import make_aggregates_response
+
+
+def _rowwise(body: bytes) -> pd.DataFrame:
+    """The former per-bar parsing path, kept as the baseline."""
+    response = json.loads(body)
+
+    data = []
+    for bar in response["results"]:
+        data.append({
+            "timestamp": pd.to_datetime(bar["t"], unit="ms"),
+            "open": bar["o"],
+            "high": bar["h"],
+            "low": bar["l"],
+            "close": bar["c"],
+            "volume": bar["v"]
+        })
+
+    return pd.DataFrame(data).set_index("timestamp")
+
+
+def _columnar(body: bytes) -> pd.DataFrame:
+    response = json_codec.loads(body)
+    columns = PolygonDataFeed._parse_aggregates(response["results"])
+    return PolygonDataFeed._assemble_bars({"AAPL": [columns]})
+
+
+def _cases(body: bytes) -> Dict[str, Callable[[], object]]:
+    """Benchmarked calls for one response body."""
+    cases = {
+        "parse_rowwise": lambda: _rowwise(body),
+        "parse_columnar": lambda: _columnar(body),
+        "decode_json": lambda: json.loads(body),
+    }
+    if json_codec.ORJSON_AVAILABLE:
+        cases["decode_orjson"] = lambda: json_codec.orjson.loads(body)
+    return cases
+
+
+def run(
+    bars: Sequence[int],
+    select: Sequence[str] = (),
+    repeat: int = 3
+) -> List[BenchmarkResult]:
+    """
+    Run the suite for each response size.
+
+    Args:
+        bars: Numbers of bars per response
+        select: Only run benchmarks whose name contains one of these
+        repeat: Timed repetitions per case
+
+    Returns:
+        List of BenchmarkResult
+    """
+    results = []
+
+    for n_bars in bars:
+        body = make_aggregates_response(n_bars)
+        params = {"bars": n_bars}
+
+        for name, func in _cases(body).items():
+            if select and not any(s in name for s in select):
+                continue
+            result = measure(name, func, params, repeat=repeat)
+            result.extra["bars_per_second"] = n_bars / result.best
+            results.append(result)
+            print(format_results([result]).splitlines()[1], flush=True)
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bars", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--select", nargs="*", default=[],
+                        help="Only run benchmarks matching these names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", nargs=2,
+                        metavar=("BASELINE", "CURRENT"),
+                        help="Compare two JSON result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        rows = compare(*args.compare)
+        print(format_comparison(rows))
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    results = run(args.bars, args.select, args.repeat)
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Benchmarks for option chain analytics.
+
+Compares the per-contract implied volatility loop OptionAsset used to run
+(scalar Newton-Raphson, re-pricing and re-computing Greeks each step) with
+the batched chain solver, and times vectorized pricing and Greeks and
+the volatility surface (full fit, one-quote refit, 100x100 grid lookup).
+
+Usage:
+    python -m benchmarks.bench_options --contracts 1000 10000 \
+        --output results.json
+    python -m benchmarks.bench_options --compare baseline.json results.json
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import sys
+from datetime import datetime
+
+import numpy as np
+from scipy.stats import norm
+
+from alphalens.assets.option_chain import OptionChain
+from alphalens.assets.vol_surface import VolatilitySurface
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    measure,
+    save_results,
+    compare,
+    format_results,
+    format_comparison,
+)
+from benchmarks.synthetic import make_option_chain
+
+NOW = datetime(2030, 1, 1)
+
+
+def _scalar_iv(
+    price: float,
+    S: float,
+    K: float,
+    T: float,
+    is_call: bool,
+    r: float = 0.02,
+    max_iterations: int = 100,
+    tolerance: float = 1e-5
+) -> Optional[float]:
+    """The former per-contract Newton loop, kept as the baseline."""
+    sigma = 0.3
+    for _ in range(max_iterations):
+        d1 = ((np.log(S / K) + (r + 0.5 * sigma ** 2) * T)
+              / (sigma * np.sqrt(T)))
+        d2 = d1 - sigma * np.sqrt(T)
+        if is_call:
+            value = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+        else:
+            value = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+
+        # calculate_greeks recomputed d1/d2 for vega
+        d1 = ((np.log(S / K) + (r + 0.5 * sigma ** 2) * T)
+              / (sigma * np.sqrt(T)))
+        vega = S * norm.pdf(d1) * np.sqrt(T) / 100
+
+        diff = value - price
+        if abs(diff) < tolerance:
+            return sigma
+        if vega > 0:
+            sigma = max(0.01, min(sigma - diff / (vega * 100), 5.0))
+        else:
+            break
+    return None
+
+
+def _cases(
+    chain: OptionChain,
+    prices: np.ndarray
+) -> Dict[str, Callable[[], object]]:
+    """Benchmarked calls for one chain."""
+    expiry = chain.time_to_expiry(NOW)
+    spot = chain.underlying_price
+
+    def scalar_loop():
+        return [_scalar_iv(p, spot, k, t, c)
+                for p, k, t, c in zip(prices, chain.strikes, expiry,
+                                      chain.is_call)]
+
+    surface = VolatilitySurface(chain, prices, now=NOW)
+    strikes = np.linspace(0.5, 1.5, 100) * spot
+    times = np.linspace(expiry.min(), expiry.max(), 100)
+
+    return {
+        "iv_scalar_loop": scalar_loop,
+        "iv_batched": lambda: chain.solve_implied_volatility(prices, now=NOW),
+        "price_vectorized": lambda: chain.price(now=NOW),
+        "greeks_vectorized": lambda: chain.greeks(now=NOW),
+        "surface_fit": lambda: VolatilitySurface(chain, prices, now=NOW),
+        "surface_refit_one_quote":
+            lambda: surface.update({chain.symbols[0]: prices[0]}),
+        "surface_lookup_grid":
+            lambda: surface.volatility(strikes[None, :], times[:, None]),
+    }
+
+
+def run(
+    contracts: Sequence[int],
+    select: Sequence[str] = (),
+    repeat: int = 3
+) -> List[BenchmarkResult]:
+    """
+    Run the suite for each chain size.
+
+    Args:
+        contracts: Numbers of contracts per chain
+        select: Only run benchmarks whose name contains one of these
+        repeat: Timed repetitions per case
+
+    Returns:
+        List of BenchmarkResult
+    """
+    results = []
+
+    for n_contracts in contracts:
+        chain = OptionChain.from_frame(make_option_chain(n_contracts))
+        prices = chain.price(now=NOW)
+        params = {"contracts": n_contracts}
+
+        for name, func in _cases(chain, prices).items():
+            if select and not any(s in name for s in select):
+                continue
+            result = measure(name, func, params, repeat=repeat)
+            result.extra["contracts_per_second"] = n_contracts / result.best
+            if name == "iv_batched":
+                _, converged = func()
+                result.extra["converged"] = float(converged.mean())
+            results.append(result)
+            print(format_results([result]).splitlines()[1], flush=True)
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, nargs="+",
+                        default=[1000, 10000])
+    parser.add_argument("--select", nargs="*", default=[],
+                        help="Only run benchmarks matching these names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", nargs=2,
+                        metavar=("BASELINE", "CURRENT"),
+                        help="Compare two JSON result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        rows = compare(*args.compare)
+        print(format_comparison(rows))
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    results = run(args.contracts, args.select, args.repeat)
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Timing, peak-memory measurement and JSON result storage for benchmarks.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+import contextlib
+import gc
+import io
+import json
+import platform
+import time
+import tracemalloc
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory of one benchmarked call."""
+    name: str
+    params: Dict[str, Any]
+    times: List[float]  # Wall time of each repetition, seconds
+    peak_memory: int  # Peak traced allocation of one call, bytes
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def best(self) -> float:
+        return min(self.times)
+
+    @property
+    def mean(self) -> float:
+        return sum(self.times) / len(self.times)
+
+    @property
+    def key(self) -> str:
+        """Identifier used to match results across runs."""
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update({"best": self.best, "mean": self.mean})
+        return data
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    params: Optional[Dict[str, Any]] = None,
+    repeat: int = 3,
+    quiet: bool = True,
+    catch_errors: bool = False
+) -> BenchmarkResult:
+    """
+    Time 'func' and record its peak memory.
+
+    The first call runs under tracemalloc to get the peak allocation (NumPy
+    and pandas buffers are traced); the timed repetitions run untraced so
+    tracing overhead does not distort the timings.
+
+    Args:
+        name: Benchmark name
+        func: Zero-argument callable to measure
+        params: Parameters describing the case (stored with the result)
+        repeat: Number of timed repetitions
+        quiet: Swallow anything the function prints
+        catch_errors: Return a failed result (NaN time, the error in
+            extra["error"]) instead of raising
+
+    Returns:
+        BenchmarkResult
+    """
+    if catch_errors:
+        try:
+            return measure(name, func, params, repeat, quiet)
+        except Exception as e:
+            return BenchmarkResult(name=name, params=dict(params or {}),
+                                   times=[float("nan")], peak_memory=0,
+                                   extra={"error": f"{type(e).__name__}: {e}"})
+
+    out = io.StringIO() if quiet else None
+
+    def call():
+        if out is None:
+            return func()
+        with contextlib.redirect_stdout(out):
+            return func()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+
+    return BenchmarkResult(name=name, params=dict(params or {}),
+                           times=times, peak_memory=peak)
+
+
+def environment() -> Dict[str, Any]:
+    """Versions and machine info stored alongside results."""
+    import numpy as np
+    import pandas as pd
+
+    env = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+    try:
+        import numba
+        env["numba"] = numba.__version__
+    except ImportError:
+        env["numba"] = None
+    return env
+
+
+def save_results(results: List[BenchmarkResult], path: str) -> None:
+    """Write results and environment info to a JSON file."""
+    with open(path, "w") as f:
+        json.dump({
+            "environment": environment(),
+            "results": [r.to_dict() for r in results],
+        }, f, indent=2, default=str)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Load a JSON results file, keyed by BenchmarkResult.key."""
+    with open(path) as f:
+        data = json.load(f)
+
+    results = {}
+    for r in data["results"]:
+        result = BenchmarkResult(name=r["name"], params=r["params"],
+                                 times=r["times"],
+                                 peak_memory=r["peak_memory"],
+                                 extra=r.get("extra", {}))
+        results[result.key] = r
+    return results
+
+
+def compare(
+    baseline_path: str,
+    current_path: str,
+    threshold: float = 0.10
+) -> List[Dict[str, Any]]:
+    """
+    Compare two result files.
+
+    Args:
+        baseline_path: Reference results
+        current_path: New results
+        threshold: Relative slowdown (or memory growth) flagged as regression
+
+    Returns:
+        One row per benchmark present in both files (cases that failed
+        in either run are left out)
+    """
+    baseline = load_results(baseline_path)
+    current = load_results(current_path)
+
+    rows = []
+    for key in sorted(set(baseline) & set(current)):
+        old, new = baseline[key], current[key]
+        if "error" in old.get("extra", {}) or "error" in new.get("extra", {}):
+            continue
+        time_ratio = new["best"] / old["best"] if old["best"] else float("nan")
+        mem_ratio = (new["peak_memory"] / old["peak_memory"]
+                     if old["peak_memory"] else float("nan"))
+        rows.append({
+            "benchmark": key,
+            "old_best": old["best"],
+            "new_best": new["best"],
+            "time_ratio": time_ratio,
+            "old_peak_memory": old["peak_memory"],
+            "new_peak_memory": new["peak_memory"],
+            "memory_ratio": mem_ratio,
+            "regression": (time_ratio > 1 + threshold
+                           or mem_ratio > 1 + threshold),
+        })
+    return rows
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Human readable table of results."""
+    lines = [f"{'benchmark':<70} {'best (s)':>10} {'mean (s)':>10} "
+             f"{'peak (MB)':>10}"]
+    for r in results:
+        if "error" in r.extra:
+            lines.append(f"{r.key:<70} FAILED {r.extra['error']}")
+            continue
+        lines.append(f"{r.key:<70} {r.best:>10.4f} {r.mean:>10.4f} "
+                     f"{r.peak_memory / 2 ** 20:>10.1f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Human readable table of a comparison."""
+    lines = [f"{'benchmark':<70} {'time x':>8} {'memory x':>9}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(f"{row['benchmark']:<70} {row['time_ratio']:>8.2f} "
+                     f"{row['memory_ratio']:>9.2f}{flag}")
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""
+Synthetic factor/price panels and data feed responses for benchmarking.
+"""
+
+from typing import Dict, Tuple
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def make_panel(
+    n_assets: int = 500,
+    n_dates: int = 252,
+    max_period: int = 10,
+    n_groups: int = 10,
+    freq: str = "B",
+    ic: float = 0.05,
+    seed: int = 0
+) -> Tuple[pd.Series, pd.DataFrame, Dict[str, int]]:
+    """
+    Build a random factor, the matching prices and a sector mapping.
+
+    The factor is mildly predictive of next-period returns (correlation
+    'ic'), so every alphalens statistic has non-trivial work to do.
+
+    Args:
+        n_assets: Number of assets
+        n_dates: Number of factor dates
+        max_period: Largest forward return period; prices extend this many
+            bars past the last factor date
+        n_groups: Number of groups in the returned mapping
+        freq: Date frequency ('B' for daily, 'T' for minute bars, ...)
+        ic: Correlation between factor and next-period returns
+        seed: Random seed
+
+    Returns:
+        factor: Series with MultiIndex (date, asset)
+        prices: DataFrame, dates as index, assets as columns
+        groups: dict asset -> group code
+    """
+    rs = np.random.RandomState(seed)
+
+    n_bars = n_dates + max_period + 1
+    dates = pd.date_range("2015-01-05", periods=n_bars, freq=freq)
+    assets = ["A%04d" % i for i in range(n_assets)]
+
+    signal = rs.randn(n_bars, n_assets)
+    noise = rs.randn(n_bars, n_assets)
+    returns = 0.01 * (ic * signal + np.sqrt(1 - ic ** 2) * noise)
+
+    # factor at bar t predicts the return from t to t + 1
+    rets = np.vstack([np.zeros((1, n_assets)), returns[:-1]])
+    prices = pd.DataFrame(100 * np.cumprod(1 + rets, axis=0),
+                          index=dates, columns=assets)
+
+    factor = pd.DataFrame(signal[:n_dates], index=dates[:n_dates],
+                          columns=assets).stack()
+    factor.index = factor.index.set_names(["date", "asset"])
+    factor.name = "factor"
+
+    groups = {asset: i % n_groups for i, asset in enumerate(assets)}
+
+    return factor, prices, groups
+
+
+def make_aggregates_response(n_bars: int = 100000, seed: int = 0) -> bytes:
+    """
+    Build the raw body of a Polygon aggregates response of minute bars.
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+
+    Returns:
+        JSON document as bytes
+    """
+    rs = np.random.RandomState(seed)
+
+    t = 1704205800000 + 60000 * np.arange(n_bars)
+    close = 100 * np.cumprod(1 + 0.001 * rs.randn(n_bars))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    high = np.maximum(open_, close) * (1 + 0.001 * rs.rand(n_bars))
+    low = np.minimum(open_, close) * (1 - 0.001 * rs.rand(n_bars))
+    volume = rs.randint(100, 100000, n_bars)
+
+    results = [
+        {"v": int(v), "vw": round(float((h + lo) / 2), 4),
+         "o": round(float(o), 4), "c": round(float(c), 4),
+         "h": round(float(h), 4), "l": round(float(lo), 4),
+         "t": int(ts), "n": int(v // 100)}
+        for ts, o, h, lo, c, v in zip(t, open_, high, low, close, volume)
+    ]
+
+    return json.dumps({
+        "ticker": "AAPL", "adjusted": True, "queryCount": n_bars,
+        "resultsCount": n_bars, "status": "OK", "results": results,
+    }).encode()
+
+
+def make_option_chain(
+    n_contracts: int = 10000,
+    underlying_price: float = 100.0,
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Build an options chain frame (get_options_chain layout) with a smile.
+
+    Strikes span 50%-150% of the underlying across 1-week to 2-year
+    expiries; implied volatilities follow a skewed smile in log-moneyness.
+
+    Args:
+        n_contracts: Number of contracts
+        underlying_price: Underlying price
+        seed: Random seed
+
+    Returns:
+        DataFrame with ticker, underlying, strike, expiry, type,
+        underlying_price and implied_volatility columns
+    """
+    rs = np.random.RandomState(seed)
+
+    strike = np.round(underlying_price * rs.uniform(0.5, 1.5, n_contracts), 1)
+    days = rs.randint(7, 730, n_contracts)
+    expiry = pd.Timestamp("2030-01-01") + pd.to_timedelta(days, unit="D")
+    kind = np.where(rs.rand(n_contracts) < 0.5, "call", "put")
+
+    moneyness = np.log(strike / underlying_price)
+    iv = 0.2 - 0.1 * moneyness + 0.3 * moneyness ** 2 + 0.1 / np.sqrt(days / 7)
+
+    return pd.DataFrame({
+        "ticker": [f"O:SYN{i:07d}" for i in range(n_contracts)],
+        "underlying": "SYN",
+        "strike": strike,
+        "expiry": expiry,
+        "type": kind,
+        "underlying_price": underlying_price,
+        "implied_volatility": iv,
+    })
@@ -33,6 +33,11 @@ agents_reqs = [
     'alpaca-py>=0.8.0',
 ]
 
+# Optional JIT-compiled kernels for the analytics core
+numba_reqs = [
+    'numba>=0.49.0',
+]
+
 extra_reqs = {
     'test': [
         "pytest>=7.0.0",
@@ -40,7 +45,8 @@ extra_reqs = {
         "flake8>=6.0.0",
     ],
     'agents': agents_reqs,
-    'all': agents_reqs,
+    'numba': numba_reqs,
+    'all': agents_reqs + numba_reqs,
 }
 
 if __name__ == "__main__":
@@ -9,14 +9,29 @@ Run with:
 """
 
 import pytest
+import asyncio
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from alphalens.data.unified_data_manager import UnifiedDataManager
 from alphalens.data.alpaca_feed import AlpacaDataFeed
 from alphalens.data.yahoo_feed import YahooDataFeed
+from alphalens.data.async_base import AIOHTTP_AVAILABLE
+from alphalens.data.bar_store import BarStore
+from alphalens.data.fetch_planner import plan_fetches
+from alphalens.data.memory_cache import MemoryCache, sizeof
+from alphalens.data.single_flight import AsyncSingleFlight, PriceBatcher, SingleFlight
+from alphalens.data.rate_limit import (
+    TokenBucket,
+    FileTokenBucket,
+    FCNTL_AVAILABLE,
+    backoff_delay,
+    get_rate_limiter,
+)
 
 # Check for API keys
 ALPACA_KEY = os.getenv("ALPACA_API_KEY")
@@ -174,6 +189,49 @@ class TestPolygonDataFeed:
         assert not df.empty
         assert "close" in df.columns
 
+    def test_polygon_concurrent_historical_data(self, polygon_feed):
+        """Test concurrent multi-symbol fetch matches sequential fetch."""
+        polygon_feed.connect()
+
+        end = datetime.now()
+        start = end - timedelta(days=10)
+        symbols = ["AAPL", "MSFT", "SPY"]
+
+        concurrent = polygon_feed.get_historical_data(
+            symbols=symbols, start=start, end=end, max_workers=3
+        )
+        sequential = polygon_feed.get_historical_data(
+            symbols=symbols, start=start, end=end, max_workers=1
+        )
+
+        assert set(concurrent.index.get_level_values("symbol")) == set(symbols)
+        pd.testing.assert_frame_equal(concurrent, sequential)
+
+    @pytest.mark.skipif(not AIOHTTP_AVAILABLE, reason="aiohttp not installed")
+    def test_polygon_async_feed(self, polygon_feed):
+        """Test the async feed returns the same bars as the sync feed."""
+        from alphalens.data.polygon_async import AsyncPolygonDataFeed
+
+        polygon_feed.connect()
+
+        end = datetime.now()
+        start = end - timedelta(days=10)
+        symbols = ["AAPL", "MSFT"]
+
+        async def fetch():
+            async with AsyncPolygonDataFeed(POLYGON_KEY) as feed:
+                return await asyncio.gather(
+                    feed.get_historical_data(symbols, start, end),
+                    feed.get_news("AAPL", limit=3),
+                )
+
+        bars, news = asyncio.run(fetch())
+
+        pd.testing.assert_frame_equal(
+            bars, polygon_feed.get_historical_data(symbols, start, end)
+        )
+        assert isinstance(news, list)
+
     def test_polygon_options_chain(self, polygon_feed):
         """Test fetching options chain."""
         polygon_feed.connect()
@@ -206,6 +264,1181 @@ class TestPolygonDataFeed:
         assert elapsed >= 0
 
 
+class TestRateLimiter:
+    """Test the shared token bucket (no API key required)."""
+
+    def test_burst_then_wait(self):
+        """Burst capacity is served at once, then calls are spaced."""
+        bucket = TokenBucket(calls_per_minute=600, capacity=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+        stats = bucket.get_stats()
+        assert stats["calls"] == 4
+        assert stats["waits"] == 2
+        assert stats["max_wait"] == pytest.approx(0.2, abs=0.02)
+
+    def test_penalize_and_headers(self):
+        """Throttling and exhausted server budgets hold every caller."""
+        bucket = TokenBucket(calls_per_minute=6000)
+
+        bucket.penalize(0.5)
+        assert bucket.reserve() >= 0.5
+        assert bucket.get_stats()["throttled"] == 1
+
+        bucket = TokenBucket(calls_per_minute=6000)
+        bucket.update_from_headers({"X-RateLimit-Remaining": "1"})
+        assert bucket.reserve() == 0
+        assert bucket.reserve() > 0
+
+    def test_backoff_delay(self):
+        """Retry-After wins over exponential backoff."""
+        assert 3 <= backoff_delay(0, {"Retry-After": "3"}) <= 4
+        assert 0 <= backoff_delay(2) <= 4
+        assert backoff_delay(10, cap=5) <= 5
+
+    def test_shared_registry(self):
+        """Limiters with the same name are shared."""
+        first = get_rate_limiter("test:shared", 100)
+        assert get_rate_limiter("test:shared", 5) is first
+
+    @pytest.mark.skipif(not FCNTL_AVAILABLE, reason="fcntl not available")
+    def test_file_bucket_shared(self, tmp_path):
+        """Buckets on the same state file share their tokens."""
+        path = str(tmp_path / "polygon.bucket")
+        first = FileTokenBucket(path, calls_per_minute=60, capacity=2)
+        second = FileTokenBucket(path, calls_per_minute=60, capacity=2)
+
+        assert first.reserve() == 0
+        assert second.reserve() == 0
+        assert first.reserve() > 0.5
+
+        first.close()
+        second.close()
+
+
+class _RecordingFeed:
+    """Offline feed returning one bar per business day, recording requests."""
+
+    connected = True
+
+    def __init__(self):
+        self.requests = []
+
+    def get_historical_data(self, symbols, start, end, timeframe="1Day"):
+        self.requests.append((tuple(symbols), start.date(), end.date()))
+        index = pd.MultiIndex.from_product(
+            [pd.bdate_range(start, end), symbols], names=["timestamp", "symbol"])
+        return pd.DataFrame({"close": np.arange(len(index), dtype=float)}, index=index)
+
+    def get_grouped_daily(self, days, symbols=None):
+        self.requests.append(("grouped", days[0]))
+        index = pd.MultiIndex.from_product(
+            [pd.DatetimeIndex(days), symbols], names=["timestamp", "symbol"])
+        return pd.DataFrame({"close": -1.0}, index=index)
+
+
+class TestBarStore:
+    """Test the columnar bar store (no API key required)."""
+
+    def test_write_read_coverage(self, tmp_path):
+        """Bars round-trip and coverage tracks the written ranges."""
+        store = BarStore(str(tmp_path))
+        bars = _RecordingFeed().get_historical_data(
+            ["AAPL", "X:BTCUSD"], datetime(2023, 12, 1), datetime(2024, 1, 31))
+
+        store.write(bars, "1Day", date(2023, 12, 1), date(2024, 1, 31))
+
+        stored = store.read(["AAPL", "X:BTCUSD"], datetime(2023, 12, 1), datetime(2024, 1, 31), "1Day")
+        pd.testing.assert_frame_equal(stored, bars.sort_index())
+        assert store.missing("AAPL", date(2023, 11, 1), date(2024, 2, 29), "1Day") == [
+            (date(2023, 11, 1), date(2023, 11, 30)),
+            (date(2024, 2, 1), date(2024, 2, 29)),
+        ]
+        assert store.get_stats()["partitions"] == 4
+
+    def test_manager_fetches_only_gaps(self, tmp_path):
+        """Overlapping requests fetch only the uncovered ranges."""
+        manager = UnifiedDataManager(cache_dir=str(tmp_path))
+        feed = manager.sources["polygon"] = _RecordingFeed()
+
+        manager.get_historical_data(["SPY"], datetime(2024, 1, 1), datetime(2024, 1, 31))
+        df = manager.get_historical_data(["SPY"], datetime(2024, 1, 15), datetime(2024, 2, 29))
+
+        assert feed.requests == [
+            (("SPY",), date(2024, 1, 1), date(2024, 1, 31)),
+            (("SPY",), date(2024, 2, 1), date(2024, 2, 29)),
+        ]
+        assert df.index.get_level_values("timestamp").min() == pd.Timestamp("2024-01-15")
+        assert len(df) == len(pd.bdate_range("2024-01-15", "2024-02-29"))
+
+        manager.get_historical_data(["SPY"], datetime(2024, 1, 10), datetime(2024, 2, 10))
+        assert len(feed.requests) == 2
+        assert manager.get_cache_stats()["cache_hits"] == 1
+
+    def test_exclusive_end_feeds_include_last_day(self, tmp_path):
+        """Feeds with an exclusive end are asked for the next midnight."""
+        class ExclusiveEndFeed(_RecordingFeed):
+            def get_historical_data(self, symbols, start, end, timeframe="1Day"):
+                return super().get_historical_data(symbols, start, end - timedelta(days=1), timeframe)
+
+        for run in (lambda m, *args: m.get_historical_data(*args),
+                    lambda m, *args: asyncio.run(m.async_get_historical_data(*args))):
+            manager = UnifiedDataManager(cache_dir=str(tmp_path / str(id(run))))
+            manager.sources["polygon"] = None
+            feed = manager.sources["yahoo"] = ExclusiveEndFeed()
+
+            df = run(manager, ["SPY"], datetime(2024, 6, 3), datetime(2024, 6, 7))
+
+            assert feed.requests == [(("SPY",), date(2024, 6, 3), date(2024, 6, 7))]
+            assert df.index.get_level_values("timestamp").max() == pd.Timestamp("2024-06-07")
+            run(manager, ["SPY"], datetime(2024, 6, 3), datetime(2024, 6, 7))
+            assert len(feed.requests) == 1
+
+    def test_failed_windows_stay_uncovered(self, tmp_path):
+        """A failed window or page is not marked covered and is fetched again."""
+        from alphalens.data.polygon_feed import PolygonDataFeed
+
+        class FlakyFeed(PolygonDataFeed):
+            def _make_request(self, url, params=None):
+                self.calls.append(url)
+                if url.startswith("page2:"):
+                    return None if self.fail else {"results": [{"t": 1704412800000, "o": 2, "h": 2,
+                                                                "l": 2, "c": 2, "v": 2}]}
+                day = url.split("/")[-2]
+                if day in self.fail_windows:
+                    return None
+                t = int(pd.Timestamp(day).value // 10 ** 6)
+                return {"results": [{"t": t, "o": 1, "h": 1, "l": 1, "c": 1, "v": 1}],
+                        "next_url": f"page2:{url}"}
+
+        feed = FlakyFeed(api_key="test", tier="free", max_workers=1)
+        feed.connected, feed.calls, feed.fail = True, [], True
+        window = PolygonDataFeed.window_days("1Min")
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 1) + timedelta(days=2 * window - 1)
+        feed.fail_windows = {(start + timedelta(days=window)).strftime("%Y-%m-%d")}
+
+        bars = feed.get_historical_data(["SPY"], start, end, "1Min")
+        assert [w[1:] for w in bars.attrs["failed_windows"]] == [
+            (start, start + timedelta(days=window - 1)),  # second page failed
+            (start + timedelta(days=window), end),
+        ]
+        store = BarStore(str(tmp_path / "store"))
+        store.write(bars, "1Min", start, end, failed=bars.attrs["failed_windows"])
+        assert store.missing("SPY", start, end, "1Min") == [(start.date(), end.date())]
+
+        # manager: the request whose second page failed is planned again
+        feed.fail_windows = set()
+        manager = UnifiedDataManager(cache_dir=str(tmp_path / "manager"))
+        manager.sources["polygon"] = feed
+        manager.get_historical_data(["SPY"], datetime(2024, 1, 1), datetime(2024, 1, 5))
+        manager.memory_cache.clear()
+        feed.fail, feed.calls = False, []
+        df = manager.get_historical_data(["SPY"], datetime(2024, 1, 1), datetime(2024, 1, 5))
+        assert len(feed.calls) == 2 and len(df) == 2
+        manager.memory_cache.clear()
+        manager.get_historical_data(["SPY"], datetime(2024, 1, 1), datetime(2024, 1, 5))
+        assert len(feed.calls) == 2
+
+
+class TestFetchPlanner:
+    """Test the historical fetch planner (no API key required)."""
+
+    def test_coalesce_and_group(self):
+        """Gaps within a window share a span; equal spans share a request."""
+        gaps = {
+            symbol: [(date(2024, 1, 1), date(2024, 1, 5)), (date(2024, 3, 1), date(2024, 3, 5))]
+            for symbol in ("A", "B", "C")
+        }
+
+        plan = plan_fetches(gaps)
+        assert [(r.symbols, r.start, r.end) for r in plan] == [
+            (["A", "B", "C"], date(2024, 1, 1), date(2024, 3, 5))]
+
+        plan = plan_fetches(gaps, window_days=30, symbols_per_request=2)
+        assert len(plan) == 4
+        assert plan[0].symbols == ["A", "B"] and plan[0].end == date(2024, 1, 5)
+
+    def test_grouped_daily(self):
+        """Shared recent days go to grouped requests, long histories do not."""
+        gaps = {f"S{i}": [(date(2024, 7, 1), date(2024, 7, 3))] for i in range(50)}
+        gaps["IPO"] = [(date(2020, 1, 1), date(2024, 7, 3))]
+
+        plan = plan_fetches(gaps, symbols_per_request=1, grouped_daily=True)
+
+        grouped = [r for r in plan if r.grouped]
+        assert [r.start for r in grouped] == [date(2024, 7, 1), date(2024, 7, 2), date(2024, 7, 3)]
+        assert all(len(r.symbols) == 50 for r in grouped)
+        assert [(r.symbols, r.grouped) for r in plan if not r.grouped] == [(["IPO"], False)]
+
+    def test_manager_extension_uses_grouped_daily(self, tmp_path):
+        """Extending a stored universe by a day takes one grouped request."""
+        manager = UnifiedDataManager(cache_dir=str(tmp_path))
+        feed = manager.sources["polygon"] = _RecordingFeed()
+        symbols = [f"S{i}" for i in range(20)]
+
+        manager.get_historical_data(symbols, datetime(2024, 5, 1), datetime(2024, 6, 28))
+        feed.requests.clear()
+        df = manager.get_historical_data(symbols, datetime(2024, 5, 1), datetime(2024, 7, 1))
+
+        assert feed.requests == [("grouped", date(2024, 7, 1))]
+        assert (df.xs(pd.Timestamp("2024-07-01"), level="timestamp")["close"] == -1).all()
+
+    def test_manager_marks_holiday_covered(self, tmp_path):
+        """An empty grouped response is a holiday, requested only once."""
+        class HolidayFeed(_RecordingFeed):
+            def get_grouped_daily(self, days, symbols=None):
+                if days[0] == date(2024, 7, 4):
+                    self.requests.append(("grouped", days[0]))
+                    return pd.DataFrame()
+                return super().get_grouped_daily(days, symbols)
+
+        manager = UnifiedDataManager(cache_dir=str(tmp_path))
+        feed = manager.sources["polygon"] = HolidayFeed()
+        symbols = [f"S{i}" for i in range(20)]
+
+        manager.get_historical_data(symbols, datetime(2024, 5, 1), datetime(2024, 7, 3))
+        feed.requests.clear()
+        manager.get_historical_data(symbols, datetime(2024, 5, 1), datetime(2024, 7, 5))
+        assert sorted(feed.requests) == [("grouped", date(2024, 7, 4)), ("grouped", date(2024, 7, 5))]
+
+        feed.requests.clear()
+        df = manager.get_historical_data(symbols, datetime(2024, 5, 1), datetime(2024, 7, 5))
+        assert feed.requests == []
+        assert pd.Timestamp("2024-07-04") not in df.index.get_level_values("timestamp")
+        assert all(manager.bar_store.missing(s, date(2024, 7, 4), date(2024, 7, 4), "1Day") == []
+                   for s in symbols)
+
+    def test_manager_empty_grouped_today_fetches_per_symbol(self, tmp_path):
+        """Today's empty grouped response may be unpublished, not a holiday."""
+        from alphalens.data.fetch_planner import FetchRequest
+
+        class UnpublishedFeed(_RecordingFeed):
+            def get_grouped_daily(self, days, symbols=None):
+                self.requests.append(("grouped", days[0]))
+                return pd.DataFrame()
+
+        manager = UnifiedDataManager(cache_dir=str(tmp_path))
+        feed = manager.sources["polygon"] = UnpublishedFeed()
+        today = date.today()
+
+        manager._fetch_grouped(FetchRequest(["A", "B"], today, today, grouped=True), "polygon")
+
+        assert feed.requests == [("grouped", today), (("A", "B"), today, today)]
+        assert manager.bar_store.missing("A", today, today, "1Day") == [(today, today)]
+
+
+class TestMemoryCache:
+    """Test the in-memory cache tier (no API key required)."""
+
+    def test_lru_eviction_by_bytes(self):
+        """The least recently used entries go when the budget is exceeded."""
+        frame = pd.DataFrame({"x": np.zeros(1000)})
+        cache = MemoryCache(max_bytes=int(2.5 * sizeof(frame)))
+
+        cache.put("a", frame, ttl=60)
+        cache.put("b", frame.copy(), ttl=60)
+        assert cache.get("a").equals(frame)
+        cache.put("c", frame.copy(), ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a").equals(frame)
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= stats["max_bytes"]
+
+    def test_results_are_copies(self):
+        """Mutating a cached or returned frame does not change the cached one."""
+        cache = MemoryCache()
+        frame = pd.DataFrame({"x": [1.0, 2.0]})
+        cache.put("a", frame, ttl=60)
+        frame.loc[1, "x"] = -1.0
+
+        first = cache.get("a")
+        first["y"] = 0.0
+        first.loc[0, "x"] = -1.0
+
+        assert cache.get("a").to_dict("list") == {"x": [1.0, 2.0]}
+
+    def test_ttl(self):
+        """Entries expire after their own TTL; zero TTL is not cached."""
+        cache = MemoryCache()
+        cache.put("short", pd.Series([1.0]), ttl=0.05)
+        cache.put("long", pd.Series([2.0]), ttl=60)
+        assert not cache.put("quote", pd.Series([3.0]), ttl=0)
+
+        time.sleep(0.1)
+        assert cache.get("short") is None
+        assert cache.get("long") is not None
+        assert cache.get("quote") is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_manager_tiers(self, tmp_path):
+        """Repeated requests are served from memory, then from disk."""
+        manager = UnifiedDataManager(cache_dir=str(tmp_path))
+        feed = manager.sources["polygon"] = _RecordingFeed()
+
+        first = manager.get_historical_data(["SPY"], datetime(2024, 1, 1), datetime(2024, 1, 31))
+        first["close"] = 0.0  # callers get their own copy
+        second = manager.get_historical_data(["SPY"], datetime(2024, 1, 1), datetime(2024, 1, 31))
+        assert second["close"].iloc[-1] == 22.0
+
+        manager.memory_cache.clear()
+        manager.get_historical_data(["SPY"], datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+        stats = manager.get_cache_stats()
+        assert len(feed.requests) == 1
+        assert stats["memory"]["hits"] == 0 and stats["memory"]["misses"] == 1
+        assert stats["disk"]["hits"] == 1
+        assert stats["cache_hits"] == 2
+
+
+class TestCoalescing:
+    """Test request coalescing (no API key required)."""
+
+    def test_single_flight(self):
+        """Concurrent identical calls share one call and its result."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: flight.do("key", fetch), range(8)))
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.get_stats() == {"calls": 1, "coalesced": 7}
+
+    def test_single_flight_copies_frames(self):
+        """Each coalesced caller gets its own copy of a frame result."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        flight = SingleFlight()
+
+        def fetch():
+            time.sleep(0.1)
+            return pd.DataFrame({"close": [1.0, 2.0]})
+
+        def call(_):
+            frame = flight.do("key", fetch)
+            frame["close"] *= 2  # must not affect the other callers
+            return frame
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(call, range(4)))
+
+        assert flight.get_stats()["coalesced"] == 3
+        assert all(result["close"].tolist() == [2.0, 4.0] for result in results)
+
+        async def run():
+            flight = AsyncSingleFlight()
+
+            async def fetch():
+                await asyncio.sleep(0.05)
+                return pd.DataFrame({"close": [1.0]})
+
+            frames = await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)))
+            return flight, frames
+
+        flight, frames = asyncio.run(run())
+        assert flight.get_stats()["coalesced"] == 2
+        assert len({id(frame) for frame in frames}) == 3
+
+    def test_price_batcher(self):
+        """Concurrent price calls within the window make one request."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        requests = []
+
+        def fetch(symbols):
+            requests.append(symbols)
+            return pd.Series({symbol: float(len(symbol)) for symbol in symbols})
+
+        batcher = PriceBatcher(fetch, window=0.05)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(batcher.get, [["A"], ["BB"], ["A", "CCC"], ["DDDD"]]))
+
+        assert requests == [["A", "BB", "CCC", "DDDD"]]
+        assert results[2].to_dict() == {"A": 1.0, "CCC": 3.0}
+
+    def test_async_manager_batching(self, tmp_path):
+        """Concurrent async price calls are batched across callers."""
+        manager = UnifiedDataManager(cache_dir=str(tmp_path), price_batch_window=0.05)
+        requests = []
+
+        class PriceFeed:
+            def get_latest_prices(self, symbols):
+                requests.append(symbols)
+                return pd.Series(1.0, index=symbols)
+
+        manager.sources["alpaca"] = PriceFeed()
+
+        async def run():
+            return await asyncio.gather(*(
+                manager.async_get_latest_prices([symbol]) for symbol in ("A", "B", "C")))
+
+        results = asyncio.run(run())
+        assert requests == [["A", "B", "C"]]
+        assert [list(result.index) for result in results] == [["A"], ["B"], ["C"]]
+
+
+class TestSnapshots:
+    """Test bulk snapshot parsing and routing (no API key required)."""
+
+    @pytest.fixture
+    def offline_feed(self):
+        """Polygon feed answering requests from canned snapshots."""
+        from alphalens.data.polygon_feed import PolygonDataFeed
+
+        class OfflineFeed(PolygonDataFeed):
+            def _make_request(self, url, params=None):
+                self.calls.append(url)
+                if "/v2/snapshot/" in url:
+                    return {"tickers": [
+                        {"ticker": symbol, "lastTrade": {"p": 10.0}, "day": {"c": 9.0}}
+                        for symbol in params["tickers"].split(",") if symbol != "ZZZ"
+                    ]}
+                if "/v2/last/trade/" in url:
+                    return {"results": {"p": 1.0}}
+                return None
+
+        feed = OfflineFeed(api_key="test", tier="free")
+        feed.calls = []
+        yield feed
+        feed.disconnect()
+
+    def test_parse_ticker_snapshots(self):
+        """Missing fields become NaN; price falls back to the minute bar."""
+        from alphalens.data.polygon_feed import PolygonDataFeed
+
+        frame = PolygonDataFeed._parse_ticker_snapshots([
+            {"ticker": "AAPL", "lastTrade": {"p": 190.5},
+             "lastQuote": {"p": 190.4, "P": 190.6}, "prevDay": {"c": 188.0}},
+            {"ticker": "MSFT", "min": {"c": 410.0}, "day": {"c": 405.0, "v": 1e6}},
+        ])
+
+        assert frame.loc["AAPL", "price"] == 190.5
+        assert frame.loc["AAPL", "ask"] == 190.6
+        assert frame.loc["MSFT", "price"] == 410.0
+        assert np.isnan(frame.loc["AAPL", "volume"])
+
+    def test_parse_option_snapshots(self):
+        """Chain and universal snapshots parse into the same columns."""
+        from alphalens.data.polygon_feed import PolygonDataFeed
+
+        details = {"strike_price": 150, "expiration_date": "2024-03-15",
+                   "contract_type": "call", "shares_per_contract": 100}
+        frame = PolygonDataFeed._parse_option_snapshots([
+            {"details": dict(details, ticker="O:AAPL240315C00150000"),
+             "day": {"volume": 12}, "greeks": {"delta": 0.6},
+             "implied_volatility": 0.25, "last_quote": {"bid": 1.0, "ask": 1.2},
+             "underlying_asset": {"ticker": "AAPL", "price": 152.0}},
+            {"ticker": "O:AAPL240315P00150000", "session": {"volume": 7},
+             "details": dict(details, contract_type="put")},
+        ])
+
+        assert list(frame["ticker"]) == ["O:AAPL240315C00150000", "O:AAPL240315P00150000"]
+        assert list(frame["volume"]) == [12, 7]
+        assert frame["expiry"].iloc[0] == pd.Timestamp("2024-03-15")
+        assert frame["delta"].iloc[0] == 0.6
+        assert np.isnan(frame["delta"].iloc[1])
+
+    def test_latest_prices_from_snapshots(self, offline_feed):
+        """Prices come from batched snapshots; absent tickers fall back."""
+        symbols = [f"S{i}" for i in range(600)] + ["ZZZ"]
+
+        prices = offline_feed.get_latest_prices(symbols)
+
+        snapshot_calls = [url for url in offline_feed.calls if "/v2/snapshot/" in url]
+        assert len(snapshot_calls) == 3
+        assert offline_feed.calls[3:] == [f"{offline_feed.base_url}/v2/last/trade/ZZZ"]
+        assert list(prices.index) == symbols
+        assert prices["S0"] == 10.0 and prices["ZZZ"] == 1.0
+
+    def test_options_chain_prefers_snapshot(self, tmp_path):
+        """The manager falls back to the contracts reference without snapshots."""
+        manager = UnifiedDataManager(cache_dir=str(tmp_path), enable_caching=False)
+        calls = []
+
+        class OptionsFeed:
+            def get_options_snapshot(self, *args):
+                calls.append("snapshot")
+                return pd.DataFrame()
+
+            def get_options_chain(self, *args):
+                calls.append("chain")
+                return pd.DataFrame({"ticker": ["O:X"]})
+
+        manager.sources["polygon"] = OptionsFeed()
+
+        assert len(manager.get_options_chain("X")) == 1
+        assert calls == ["snapshot", "chain"]
+
+
+class TestOptionChain:
+    """Test the columnar options chain (no API key required)."""
+
+    @pytest.fixture
+    def chain(self):
+        from alphalens.assets.option_chain import OptionChain
+        from alphalens.data.polygon_feed import PolygonDataFeed
+
+        items = []
+        for expiry in ("2030-01-18", "2030-02-15"):
+            for strike in (90.0, 100.0, 110.0):
+                for kind in ("call", "put"):
+                    ticker = f"O:SPX{expiry[2:4]}{expiry[5:7]}{expiry[8:]}{kind[0].upper()}{int(strike * 1000):08d}"
+                    items.append({"details": {"ticker": ticker, "strike_price": strike,
+                                              "expiration_date": expiry, "contract_type": kind},
+                                  "last_quote": {"bid": strike / 100, "ask": strike / 100 + 0.2},
+                                  "implied_volatility": 0.2,
+                                  "underlying_asset": {"ticker": "SPX", "price": 100.0}})
+        items[0]["last_quote"] = {}
+        items[0]["last_trade"] = {"price": 5.0}
+        return OptionChain.from_frame(PolygonDataFeed._parse_option_snapshots(items))
+
+    def test_columns_and_filters(self, chain):
+        """Snapshot frames load into arrays; filters select without building contracts."""
+        from alphalens.data.polygon_feed import PolygonDataFeed
+
+        assert len(chain) == 12 and chain.underlying == "SPX" and chain.underlying_price == 100.0
+        assert chain.is_call.sum() == 6
+        assert chain.mid[:2].tolist() == [5.0, 1.0]
+        assert list(chain.expirations()) == [pd.Timestamp("2030-01-18"), pd.Timestamp("2030-02-15")]
+
+        calls = chain.filter(expiry="2030-02-15", option_type="call", min_strike=95)
+        assert calls.strikes.tolist() == [100.0, 110.0]
+        assert chain._contracts == {} and len(chain.take([])) == 0
+
+        ttm = chain.time_to_expiry(datetime(2030, 1, 18))
+        assert ttm[0] == 0.0 and ttm[-1] == pytest.approx(28 / 365)
+
+        contracts = PolygonDataFeed._parse_options_contracts([
+            {"ticker": "O:X", "underlying_ticker": "X", "strike_price": 5,
+             "expiration_date": "2030-01-18", "contract_type": "put"}])
+        assert contracts["shares_per_contract"].tolist() == [100]
+
+    def test_contracts_on_demand(self, chain):
+        """OptionAsset objects are created once, on first access."""
+        from alphalens.assets.option import OptionAsset, OptionType
+
+        asset = chain.contract(chain.symbols[3])
+        assert isinstance(asset, OptionAsset)
+        assert asset.option_type == OptionType.PUT and asset.strike == 100.0
+        assert asset.get_current_price() == pytest.approx(1.1)
+        assert asset.metadata["implied_volatility"] == 0.2
+        assert chain.contract(3) is asset
+        assert list(chain._contracts) == [3]
+        wide = chain.strikes == 110.0
+        assert [c.symbol for c in chain.contracts(wide)] == list(chain.symbols[wide])
+
+        frame = chain.to_frame()
+        assert frame["type"].tolist()[:2] == ["call", "put"]
+
+
+class TestAggregateDecoding:
+    """Test columnar aggregates decoding (no API key required)."""
+
+    def test_json_codec(self):
+        """Both backends decode raw bodies to the same document."""
+        import json
+        from alphalens.data import json_codec
+
+        body = json.dumps({"results": [{"t": 1704205800000, "c": 1.5}]}).encode()
+        assert json_codec.loads(body) == json.loads(body)
+
+    def test_crypto_data_follows_pages(self):
+        """Crypto bars are parsed columnar across result pages."""
+        from alphalens.data.polygon_feed import PolygonDataFeed
+
+        pages = {
+            None: {"results": [{"t": 1704067200000, "o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": 10}],
+                   "next_url": "page2"},
+            "page2": {"results": [{"t": 1704153600000, "o": 2, "h": 3, "l": 1.5, "c": 2.5, "v": 20}]},
+        }
+
+        class OfflineFeed(PolygonDataFeed):
+            def _make_request(self, url, params=None):
+                return pages["page2" if url == "page2" else None]
+
+        feed = OfflineFeed(api_key="test", tier="free")
+        df = feed.get_crypto_data("BTC", "USD", datetime(2024, 1, 1), datetime(2024, 1, 2))
+        feed.disconnect()
+
+        assert list(df.index) == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02")]
+        assert list(df["close"]) == [1.5, 2.5]
+
+
+class TestStreamPipeline:
+    """Test the streaming message pipeline (no API key required)."""
+
+    def test_per_symbol_ordering(self):
+        """Messages of a symbol are handled in order across workers."""
+        import json
+        import threading
+        from alphalens.data.stream_pipeline import MessagePipeline
+
+        seen = {}
+        lock = threading.Lock()
+
+        def handle(msg):
+            time.sleep(0.001)
+            with lock:
+                seen.setdefault(msg["sym"], []).append(msg["i"])
+
+        pipeline = MessagePipeline(handle, workers=4, batch_size=7)
+        pipeline.start()
+        for i in range(50):
+            pipeline.put(json.dumps([{"ev": "T", "sym": sym, "i": i} for sym in "ABCDEF"]))
+        pipeline.stop()
+
+        assert all(order == list(range(50)) for order in seen.values())
+        stats = pipeline.get_stats()
+        assert stats["messages_processed"] == 300
+        assert stats["queue_depth"] == 0
+
+    def test_backpressure_policies(self):
+        """Conflation keeps the latest quote; drop_oldest counts drops."""
+        import json
+        from alphalens.data.stream_pipeline import MessagePipeline
+
+        handled = []
+        conflating = MessagePipeline(handled.append, workers=1, policy="conflate")
+        conflating._dispatching = True  # queue without workers
+        conflating.put_messages(
+            [{"ev": "Q", "sym": "A", "bp": bp} for bp in (1, 2, 3)] + [{"ev": "T", "sym": "A", "p": 1}])
+        assert [msg.get("bp") for msg in conflating._lanes[0].items.values()] == [3, None]
+        assert conflating.get_stats()["messages_conflated"] == 2
+
+        # a newer quote never overtakes a trade of the symbol queued before it
+        ordered = MessagePipeline(handled.append, workers=1, policy="conflate")
+        ordered._dispatching = True
+        ordered.put_messages([{"ev": "Q", "sym": "A", "t": 1}, {"ev": "T", "sym": "A", "t": 2},
+                              {"ev": "Q", "sym": "A", "t": 3}])
+        assert [(msg["ev"], msg["t"]) for msg in ordered._lanes[0].items.values()] == [("T", 2), ("Q", 3)]
+
+        dropping = MessagePipeline(handled.append, buffer_size=2, policy="drop_oldest")
+        for i in range(5):
+            dropping.put(json.dumps({"ev": "T", "sym": "A", "i": i}))
+        stats = dropping.get_stats()
+        assert stats["frames_dropped"] == 3
+        assert stats["max_frame_depth"] == 2
+
+    def test_websocket_client_pipeline_mode(self):
+        """Callbacks run off the socket thread in pipeline mode."""
+        import json
+        import threading
+        from alphalens.data.polygon_websocket import PolygonWebSocketClient, WEBSOCKET_AVAILABLE
+
+        if not WEBSOCKET_AVAILABLE:
+            pytest.skip("websocket-client not installed")
+
+        client = PolygonWebSocketClient("test", pipeline=True, workers=2)
+        threads = []
+        client.subscriptions["T:AAPL"] = [lambda msg: threads.append(threading.current_thread())]
+
+        client.pipeline.start()
+        client._on_message(None, json.dumps([{"ev": "T", "sym": "AAPL", "p": 1.0}] * 3))
+        client.pipeline.stop()
+
+        assert len(threads) == 3
+        assert threading.current_thread() not in threads
+        assert client.get_stats()["pipeline"]["messages_processed"] == 3
+
+
+class TestBarAggregator:
+    """Test the streaming bar aggregator (no API key required)."""
+
+    def test_ring_window(self):
+        """Windows across the ring wrap are contiguous views in bar order."""
+        from alphalens.data.bar_aggregator import BarAggregator
+
+        bars = BarAggregator(["A", "B"], interval=60, capacity=4)
+        for minute in range(10):
+            bars.on_message({"ev": "T", "sym": "A", "p": 100.0 + minute, "s": 10, "t": minute * 60000})
+            bars.on_message({"ev": "T", "sym": "A", "p": 102.0 + minute, "s": 30, "t": minute * 60000 + 5})
+            bars.on_message({"ev": "AM", "sym": "B", "o": 1, "h": 2, "l": 0.5, "c": 1.5,
+                             "v": 100, "vw": 1.2, "s": minute * 60000})
+
+        closes = bars.window("close")
+        assert np.shares_memory(closes, bars._data["close"])
+        assert list(closes[:, 0]) == [108.0, 109.0, 110.0, 111.0]
+        assert list(bars.window("vwap", 2)[:, 0]) == [109.5, 110.5]
+        assert list(bars.window("low", 1)[0]) == [109.0, 0.5]
+        assert list(bars.timestamps(1)) == [pd.Timestamp("1970-01-01 00:09", tz="UTC")]
+
+        panel = bars.panel("close", 3)
+        assert list(panel.columns) == ["A", "B"]
+        assert panel["B"].tolist() == [1.5, 1.5, 1.5]
+
+    def test_gaps_and_late_messages(self):
+        """Skipped intervals are empty bars; messages older than the ring are dropped."""
+        from alphalens.data.bar_aggregator import BarAggregator
+
+        bars = BarAggregator(["A"], interval=60, capacity=3)
+        bars.update_trade("A", 10.0, 1, 0)
+        bars.update_trade("A", 11.0, 1, 2 * 60000)
+        bars.update_trade("A", 9.0, 1, 60000 + 1)  # late, still held
+        bars.update_trade("A", 12.0, 1, 4 * 60000)
+        bars.update_trade("A", 8.0, 1, 0)  # older than the ring
+        bars.update_trade("Z", 1.0, 1, 4 * 60000)
+
+        assert np.isnan(bars.window("close")[1, 0])
+        assert list(bars.window("volume")[:, 0]) == [1.0, 0.0, 1.0]
+        assert bars.get_stats()["late"] == 1
+        assert bars.get_stats()["ignored"] == 1
+
+
+class TestQuoteBook:
+    """Test the live quote book (no API key required)."""
+
+    def test_consistent_reads_while_writing(self):
+        """Readers see whole updates while a writer streams quotes."""
+        import threading
+        from alphalens.data.quote_book import QuoteBook
+
+        book = QuoteBook(capacity=2)
+        symbols = [f"S{i}" for i in range(50)]
+        done = threading.Event()
+
+        def write():
+            for n in range(200):
+                for symbol in symbols:
+                    book.update_quote(symbol, float(n), float(n) + 2)
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            snapshot = book.snapshot()
+            assert ((snapshot["ask"] - snapshot["bid"]) == 2).all()
+        writer.join()
+
+        assert len(book) == 50
+        assert book.snapshot(["S0"])["mid"].iloc[0] == 200.0
+
+    def test_manager_serves_fresh_quotes(self, tmp_path):
+        """Fresh book prices skip REST; stale and unknown symbols are fetched."""
+        from alphalens.data.quote_book import QuoteBook
+
+        book = QuoteBook()
+        book.on_message({"ev": "Q", "sym": "A", "bp": 9.0, "ap": 11.0})
+        book.on_bar({"symbol": "B", "close": 5.0})
+        book.update_trade("C", 7.0, updated=time.time() - 60)
+
+        manager = UnifiedDataManager(cache_dir=str(tmp_path), quote_book=book, quote_max_age=5)
+        requests = []
+
+        class PriceFeed:
+            def get_latest_prices(self, symbols):
+                requests.append(symbols)
+                return pd.Series(1.0, index=symbols)
+
+        manager.sources["alpaca"] = PriceFeed()
+
+        assert manager.get_latest_prices(["A", "B"]).to_dict() == {"A": 10.0, "B": 5.0}
+        assert manager.get_latest_prices(["A", "C", "D"]).to_dict() == {"A": 10.0, "C": 1.0, "D": 1.0}
+        assert requests == [["C", "D"]]
+        assert manager.get_cache_stats()["quote_book"]["served"] == 3
+
+    def test_stale_quote_behind_fresh_trade(self):
+        """A fresh trade does not make an old quote's mid look fresh."""
+        from alphalens.data.quote_book import QuoteBook
+
+        book = QuoteBook()
+        book.update_quote("A", 100.0, 100.2, updated=time.time() - 3600)
+        book.update_trade("A", 150.0)
+        book.update_quote("B", 9.0, 11.0)
+        book.update_trade("B", 12.0, updated=time.time() - 3600)
+
+        assert book.get_latest_prices(["A", "B"], max_age=2).to_dict() == {"A": 150.0, "B": 10.0}
+        assert book.snapshot(["A"])["price"].iloc[0] == pytest.approx(100.1)
+
+    def test_aggregates_stamped_by_end_time(self):
+        """Old and backfilled aggregates do not look fresh."""
+        from alphalens.data.quote_book import QuoteBook
+
+        book = QuoteBook()
+        now_ms = int(time.time() * 1000)
+        book.on_message({"ev": "AM", "sym": "A", "c": 5.0, "e": now_ms})
+        book.on_message({"ev": "AM", "sym": "B", "c": 6.0, "e": now_ms - 600000})
+        book.on_message({"ev": "AM", "sym": "A", "c": 4.0, "e": now_ms - 300000, "backfill": True})
+        book.on_message({"ev": "AM", "sym": "C", "c": 7.0, "e": now_ms, "backfill": True})
+
+        assert book.get_latest_prices(["A", "B", "C"], max_age=2).to_dict() == {"A": 5.0}
+        assert "C" not in book.snapshot().index
+
+
+class _WebSocketStandIn:
+    """Local WebSocket server speaking Polygon's auth/subscribe protocol."""
+
+    GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+    def __init__(self):
+        import socket
+        import threading
+
+        self.server = socket.socket()
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        self.url = f"ws://127.0.0.1:{self.server.getsockname()[1]}"
+        self.received = []
+        self.connections = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        import threading
+
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _recv(self, conn, n):
+        data = b""
+        while len(data) < n:
+            chunk = conn.recv(n - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def _handle(self, conn):
+        import base64
+        import hashlib
+        import json
+        import re
+        import struct
+
+        try:
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += conn.recv(4096)
+            key = re.search(rb"Sec-WebSocket-Key: (\S+)", request, re.I).group(1)
+            accept = base64.b64encode(hashlib.sha1(key + self.GUID).digest())
+            conn.sendall(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            self.connections.append(conn)
+            self.send(conn, [{"ev": "status", "status": "connected"}])
+
+            while True:
+                header = self._recv(conn, 2)
+                if header is None:
+                    return
+                if header[0] & 0x0F == 8:
+                    conn.sendall(b"\x88\x00")  # close handshake
+                    return
+                length = header[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack(">H", self._recv(conn, 2))[0]
+                elif length == 127:
+                    length = struct.unpack(">Q", self._recv(conn, 8))[0]
+                mask = self._recv(conn, 4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._recv(conn, length)))
+
+                msg = json.loads(payload)
+                self.received.append(msg)
+                if msg["action"] == "auth":
+                    self.send(conn, [{"ev": "status", "status": "auth_success"}])
+        except OSError:
+            return
+
+    def send(self, conn, messages):
+        import json
+        import struct
+
+        data = json.dumps(messages).encode()
+        if len(data) < 126:
+            header = bytes([0x81, len(data)])
+        else:
+            header = bytes([0x81, 126]) + struct.pack(">H", len(data))
+        conn.sendall(header + data)
+
+    def drop(self):
+        """Cut every connection without a close handshake."""
+        import socket
+
+        for conn in self.connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        self.connections = []
+
+    def close(self):
+        self.server.close()
+        self.drop()
+
+
+class TestWebSocketSession:
+    """Test reconnect, resubscribe and backfill against a local server."""
+
+    def test_reconnect_resubscribe_backfill(self):
+        """A dropped session comes back subscribed, with the missed minutes backfilled."""
+        from alphalens.data.polygon_websocket import PolygonWebSocketClient, WEBSOCKET_AVAILABLE
+
+        if not WEBSOCKET_AVAILABLE:
+            pytest.skip("websocket-client not installed")
+
+        class RestFeed:
+            def get_historical_data(self, symbols, start, end, timeframe="1Day"):
+                minutes = pd.date_range(end=pd.Timestamp.utcnow().floor("min").tz_localize(None),
+                                        periods=10, freq="min")
+                index = pd.MultiIndex.from_product([minutes, symbols], names=["timestamp", "symbol"])
+                return pd.DataFrame({"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5,
+                                     "volume": 100.0}, index=index)
+
+        server = _WebSocketStandIn()
+        client = PolygonWebSocketClient("test", url=server.url, rest_feed=RestFeed(),
+                                        ping_interval=0, max_backoff=0.5)
+        backfilled = []
+        client.register_handler("AM", backfilled.append)
+
+        try:
+            assert client.connect()
+            client.subscribe_trades(["AAPL", "MSFT"], lambda msg: None)
+
+            # the last message arrived five minutes before the drop
+            lost = time.time() - 300
+            client.last_message_time = lost
+            server.drop()
+
+            deadline = time.time() + 10
+            while time.time() < deadline and not (client.authenticated and backfilled):
+                time.sleep(0.05)
+            time.sleep(0.1)
+        finally:
+            client.disconnect()
+            server.close()
+
+        subscribes = [msg["params"] for msg in server.received if msg["action"] == "subscribe"]
+        assert subscribes == ["T.AAPL,T.MSFT", "T.AAPL,T.MSFT"]
+        assert sum(msg["action"] == "auth" for msg in server.received) == 2
+        assert client.get_stats()["reconnects"] == 1
+
+        starts = [msg["s"] for msg in backfilled]
+        assert len(backfilled) >= 8 and all(msg["backfill"] for msg in backfilled)
+        assert all(start % 60000 == 0 and lost * 1000 < start < time.time() * 1000 - 60000
+                   for start in starts)
+
+
+class TestAlpacaStreaming:
+    """Test non-blocking Alpaca real-time bars (SDK required, no API key)."""
+
+    def test_subscribe_realtime_runs_in_background(self):
+        """subscribe_realtime returns at once; bars reach callbacks; unsubscribe stops."""
+        pytest.importorskip("alpaca")
+        import threading
+        from types import SimpleNamespace
+
+        class Stream:
+            def __init__(self):
+                self.handler = None
+                self.symbols = []
+                self.stopped = threading.Event()
+
+            def subscribe_bars(self, handler, *symbols):
+                self.handler = handler
+                self.symbols.extend(symbols)
+
+            def unsubscribe_bars(self, *symbols):
+                self.symbols = [s for s in self.symbols if s not in symbols]
+
+            def run(self):
+                async def serve():
+                    for symbol in list(self.symbols):
+                        await self.handler(SimpleNamespace(
+                            symbol=symbol, timestamp=pd.Timestamp.utcnow() - pd.Timedelta("1min"),
+                            open=1.0, high=2.0, low=0.5, close=1.5, volume=100))
+                    while not self.stopped.is_set():
+                        await asyncio.sleep(0.01)
+                asyncio.run(serve())
+
+            def stop(self):
+                self.stopped.set()
+
+        feed = AlpacaDataFeed("key", "secret")
+        feed.connected = True
+        feed._create_stream_client = Stream
+        feed.stream_client = stream = Stream()
+        bars = []
+
+        feed.subscribe_realtime(["AAPL", "MSFT"], bars.append)
+        deadline = time.time() + 5
+        while len(bars) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        feed.unsubscribe_realtime(["MSFT"])
+        assert stream.symbols == ["AAPL"]
+        feed.unsubscribe_realtime()
+
+        assert sorted(bar["symbol"] for bar in bars) == ["AAPL", "MSFT"]
+        assert stream.stopped.is_set()
+        stats = feed.get_stream_stats()
+        assert not stats["streaming"]
+        assert stats["received"] == stats["delivered"] == 2
+        assert stats["dropped"] == 0
+
+    def test_blocking_backpressure_keeps_loop_running(self):
+        """A full "block" queue does not stall the stream's event loop."""
+        pytest.importorskip("alpaca")
+        from types import SimpleNamespace
+
+        feed = AlpacaDataFeed("key", "secret", stream_buffer_size=1, stream_backpressure="block")
+        feed.stream_pipeline._dispatching = True  # queue without workers
+        bar = SimpleNamespace(symbol="AAPL", timestamp=pd.Timestamp.utcnow(),
+                              open=1.0, high=1.0, low=1.0, close=1.0, volume=1)
+
+        async def run():
+            await feed._handle_bar(bar)
+            blocked = asyncio.ensure_future(feed._handle_bar(bar))
+            ticks = 0
+            while ticks < 10:
+                await asyncio.sleep(0.01)
+                ticks += 1
+            assert not blocked.done()
+            feed.stream_pipeline._dispatching = False  # releases the producer
+            await blocked
+            return ticks
+
+        assert asyncio.run(run()) == 10
+
+
+class TestMarketReplay:
+    """Test offline replay of recorded market data (no API key required)."""
+
+    def test_store_and_log_replay(self, tmp_path):
+        """Stored bars and a captured log merge by time and reach live-style callbacks."""
+        import json
+        from alphalens.data.bar_aggregator import BarAggregator
+        from alphalens.data.replay import MarketReplay
+
+        store = BarStore(str(tmp_path / "bars"))
+        minutes = pd.date_range("2024-01-02 14:30", periods=5, freq="min")
+        index = pd.MultiIndex.from_product([minutes, ["AAPL", "MSFT"]], names=["timestamp", "symbol"])
+        store.write(pd.DataFrame({"open": 1.0, "high": 2.0, "low": 0.5, "close": np.arange(10.0),
+                                  "volume": 100.0}, index=index), "1Min", "2024-01-02", "2024-01-02")
+
+        t0 = int(minutes[0].value // 10**6)
+        log = tmp_path / "ws.log"
+        log.write_text(
+            json.dumps([{"ev": "status", "status": "auth_success"}]) + "\n"
+            + json.dumps([{"ev": "T", "sym": "AAPL", "p": 5.0, "s": 10, "t": t0 + 90000},
+                          {"ev": "Q", "sym": "AAPL", "bp": 4.9, "ap": 5.1, "t": t0 + 90001}]) + "\n"
+        )
+
+        replay = MarketReplay(speed=None)
+        replay.add_bar_store(store, ["AAPL", "MSFT"], "2024-01-02", "2024-01-02", "1Min")
+        replay.add_log(str(log))
+
+        seen, alpaca_bars = [], []
+        aggregator = BarAggregator(["AAPL", "MSFT"])
+        replay.register_handler("AM", aggregator.on_message)
+        replay.subscribe("T", ["AAPL"], seen.append)
+        replay.subscribe("Q", ["AAPL"], seen.append)
+        replay.subscribe_realtime(["MSFT"], alpaca_bars.append)
+        stats = replay.run()
+
+        assert stats["messages_emitted"] == stats["messages_delivered"] == 12
+        assert aggregator.window("close")[:, 1].tolist() == [1.0, 3.0, 5.0, 7.0, 9.0]
+        assert [bar["close"] for bar in alpaca_bars] == [1.0, 3.0, 5.0, 7.0, 9.0]
+        assert alpaca_bars[0]["timestamp"] == pd.Timestamp("2024-01-02 14:30", tz="UTC")
+        assert [msg["ev"] for msg in seen] == ["T", "Q"]
+        assert stats["latency_ms"]["p99"] >= stats["latency_ms"]["p50"] >= 0
+
+    def test_paced_replay_through_pipeline(self):
+        """Replay keeps the recorded pace scaled by 'speed' and drains the pipeline."""
+        from alphalens.data.replay import MarketReplay
+
+        messages = [{"ev": "T", "sym": f"S{i % 4}", "p": 1.0, "s": 1, "t": i * 10} for i in range(51)]
+        replay = MarketReplay(speed=2.0, pipeline=True, workers=2)
+        replay.add_messages(messages)
+        received = []
+        replay.register_handler("T", received.append)
+
+        stats = replay.run()
+
+        # 500 ms of recorded time at 2x
+        assert stats["elapsed_seconds"] >= 0.24
+        assert len(received) == stats["messages_delivered"] == 51
+        assert stats["pipeline"]["messages_dropped"] == 0
+
+
+class TestStreamRecorder:
+    """Test the stream recorder and its reader (no API key required)."""
+
+    def test_record_rotate_and_read_back(self, tmp_path):
+        """Frames are written in blocks across rotated files and read back by symbol and time."""
+        import json
+        from alphalens.data.recorder import RecordingReader, StreamRecorder
+
+        recorder = StreamRecorder(str(tmp_path), block_size=50, max_file_bytes=2000, flush_interval=0.01)
+        recorder.start()
+        for i in range(300):
+            frame = [{"ev": "T", "sym": f"S{i % 3}", "p": 100.0 + i, "s": 1, "t": 1000 * i, "c": [12, 37]}]
+            if i == 0:
+                frame.insert(0, {"ev": "status", "status": "connected"})
+            recorder.put(json.dumps(frame))
+        recorder.record({"ev": "Q", "sym": "S9", "bp": 1.0, "ap": 1.1, "t": 400000})
+        recorder.stop()
+
+        stats = recorder.get_stats()
+        assert stats["messages_written"] == 301 and stats["frames_dropped"] == 0
+        assert stats["files"] > 1 and stats["compression_ratio"] > 1
+        assert all(os.path.exists(path + ".idx") for path in recorder.files)
+
+        reader = RecordingReader(str(tmp_path))
+        assert reader.symbols() == ["S0", "S1", "S2", "S9"]
+
+        messages = list(reader.read(["S1"], start=100000, end=199999))
+        assert [msg["t"] for msg in messages] == list(range(100000, 200000, 3000))
+        assert messages[0] == {"ev": "T", "sym": "S1", "p": 200.0, "s": 1, "t": 100000, "c": [12, 37]}
+        assert len(list(reader.read())) == 301
+
+        # without its index a file is scanned
+        os.remove(recorder.files[0] + ".idx")
+        frame = RecordingReader(str(tmp_path)).to_frame(["S9"])
+        assert frame[["time", "symbol", "event"]].values.tolist() == [[400000, "S9", "Q"]]
+
+    def test_attach_to_websocket_client(self, tmp_path):
+        """An attached recorder captures raw frames from the socket thread; replay reads them."""
+        from alphalens.data.polygon_websocket import PolygonWebSocketClient, WEBSOCKET_AVAILABLE
+        from alphalens.data.recorder import StreamRecorder
+        from alphalens.data.replay import MarketReplay
+
+        if not WEBSOCKET_AVAILABLE:
+            pytest.skip("websocket-client not installed")
+
+        client = PolygonWebSocketClient("test")
+        recorder = StreamRecorder(str(tmp_path))
+        recorder.attach(client)
+        recorder.start()
+        client._on_message(None, '[{"ev":"T","sym":"AAPL","p":1.5,"s":10,"t":1}]')
+        recorder.stop()
+        assert client.frame_listeners == []
+
+        replay = MarketReplay(speed=None)
+        replay.add_recording(str(tmp_path))
+        trades = []
+        replay.register_handler("T", trades.append)
+        replay.run()
+        assert trades == [{"ev": "T", "sym": "AAPL", "p": 1.5, "s": 10, "t": 1}]
+
+
 class TestUnifiedDataManager:
     """Test UnifiedDataManager."""
 